@@ -5,9 +5,9 @@ from django.http import JsonResponse
 from django.core.mail import send_mail
 from django.conf import settings
 from django.core import signing
-from django.core.cache import cache
 
 
+from core.cache import load_singleton
 from core.models import LoginPageConfig
 from .models import PasswordResetRequest
 
@@ -16,14 +16,9 @@ from .models import PasswordResetRequest
 # ------------------------------------------------------------------
 User = get_user_model()
 
-CACHE_KEY = "login_page_config"
-
 def get_login_config():
-    config = cache.get(CACHE_KEY)
-    if not config:
-        config = LoginPageConfig.objects.first()
-        cache.set(CACHE_KEY, config, timeout=60 * 10)  # 10 minutes
-    return config
+    """The LoginPageConfig row or None; cached (misses included) until one is saved."""
+    return load_singleton(LoginPageConfig)
 
 # ------------------------------------------------------------------
 # Root redirect
@@ -1,6 +1,6 @@
 # core/admin.py
 from django.contrib import admin
-from .models import LoginPageConfig
+from .models import CodeSequence, Job, LoginPageConfig, MaintenanceRun
 
 
 @admin.register(LoginPageConfig)
@@ -14,4 +14,24 @@ class LoginPageConfigAdmin(admin.ModelAdmin):
 
     def has_add_permission(self, request):
         # Allow only ONE row
-        return not LoginPageConfig.objects.exists()
\ No newline at end of file
+        return not LoginPageConfig.objects.exists()
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("kind", "object_id", "status", "attempts", "run_after", "updated_at")
+    list_filter = ("kind", "status")
+    readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(MaintenanceRun)
+class MaintenanceRunAdmin(admin.ModelAdmin):
+    list_display = ("task", "started_at", "finished_at", "rows_touched")
+    list_filter = ("task",)
+    readonly_fields = ("task", "started_at", "finished_at", "rows_touched", "error")
+
+
+@admin.register(CodeSequence)
+class CodeSequenceAdmin(admin.ModelAdmin):
+    list_display = ("name", "prefix", "width", "last_value")
+    readonly_fields = ("name",)
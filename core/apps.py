@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from .cache import register_singleton
+        from .models import LoginPageConfig
+        from .search import ensure_search_backend
+
+        post_migrate.connect(ensure_search_backend, sender=self)
+        register_singleton(LoginPageConfig)
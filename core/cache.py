@@ -0,0 +1,158 @@
+"""
+Namespaced caching on the shared cache backend.
+
+Keys live in namespaces ("notifications", "singleton:<model>", ...) whose
+current version is itself a cache entry. Bumping the version makes every
+key of the namespace unreachable in every process at once, without
+knowing or deleting the keys; stale entries simply expire. Models are
+tied to namespaces with `invalidate_on_change`, which bumps on save and
+delete.
+
+`read_through` adds negative caching and stampede protection on top, and
+`register_singleton` / `load_singleton` use it for site-wide config
+models that hold (at most) one row.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+
+DEFAULT_TIMEOUT = 60 * 10
+
+# Stored in place of None so a missing row is a cache hit, not a miss.
+MISSING = "core.cache:missing"
+
+# An entry past its fresh time is still served for this long while one
+# process (the lock holder) refills it.
+STALE_GRACE = 60
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 2
+LOCK_POLL = 0.05
+
+# model -> fresh timeout of its singleton entry
+SINGLETONS = {}
+
+# Versions must outlive the entries they guard.
+VERSION_TIMEOUT = None
+
+
+def version_key(namespace):
+    return f"ns:{namespace}"
+
+
+def namespace_version(namespace):
+    """Current version of a namespace, starting one if there is none."""
+    key = version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # A clock-based start never reuses a version that was evicted.
+        cache.add(key, time.time_ns() // 1000, VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump(namespace):
+    """Invalidate every key of a namespace."""
+    key = version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns() // 1000
+        cache.set(key, version, VERSION_TIMEOUT)
+        return version
+
+
+def bump_on_commit(namespace):
+    """Bump once the current transaction commits, so readers never re-cache old rows."""
+    transaction.on_commit(lambda: bump(namespace))
+
+
+def namespaced_key(namespace, key):
+    return f"{namespace}:{namespace_version(namespace)}:{key}"
+
+
+def cache_get(namespace, key, default=None):
+    return cache.get(namespaced_key(namespace, key), default)
+
+
+def cache_set(namespace, key, value, timeout=DEFAULT_TIMEOUT):
+    cache.set(namespaced_key(namespace, key), value, timeout)
+
+
+def cache_delete(namespace, key):
+    cache.delete(namespaced_key(namespace, key))
+
+
+def cached(namespace, key, compute, timeout=DEFAULT_TIMEOUT):
+    """`compute()` cached under `key` in `namespace`."""
+    return cache.get_or_set(namespaced_key(namespace, key), compute, timeout)
+
+
+def read_through(namespace, key, compute, timeout=DEFAULT_TIMEOUT):
+    """
+    `compute()` cached under `key`, including a None result. When the entry
+    goes stale only the process that takes the refill lock recomputes; the
+    others keep serving the stale value, or on a cold cache wait briefly
+    for the lock holder before computing themselves.
+    """
+    full_key = namespaced_key(namespace, key)
+    lock_key = f"{full_key}:lock"
+
+    entry = cache.get(full_key)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() < fresh_until:
+            return None if value == MISSING else value
+
+    acquired = cache.add(lock_key, 1, LOCK_TIMEOUT)
+    if not acquired:
+        if entry is not None:
+            return None if entry[0] == MISSING else entry[0]
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL)
+            entry = cache.get(full_key)
+            if entry is not None:
+                return None if entry[0] == MISSING else entry[0]
+
+    try:
+        value = compute()
+        cached_value = MISSING if value is None else value
+        cache.set(full_key, (cached_value, time.time() + timeout), timeout + STALE_GRACE)
+    finally:
+        # A caller that timed out waiting must not release the holder's lock.
+        if acquired:
+            cache.delete(lock_key)
+    return value
+
+
+def invalidate_on_change(namespace, *models):
+    """Bump `namespace` after any save or delete of `models`."""
+    def invalidate(sender, raw=False, **kwargs):
+        if not raw:
+            bump_on_commit(namespace)
+
+    for model in models:
+        label = model._meta.label_lower
+        post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=f"cache-{namespace}-save-{label}")
+        post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=f"cache-{namespace}-delete-{label}")
+
+
+def register_singleton(model, timeout=DEFAULT_TIMEOUT):
+    """Cache `model`'s single row for load_singleton; call from AppConfig.ready()."""
+    SINGLETONS[model] = timeout
+    invalidate_on_change(singleton_namespace(model), model)
+
+
+def singleton_namespace(model):
+    return f"singleton:{model._meta.label_lower}"
+
+
+def load_singleton(model):
+    """The first row of a registered singleton model, or None when there is none."""
+    return read_through(
+        singleton_namespace(model), "instance", model.objects.order_by("pk").first, SINGLETONS[model],
+    )
+
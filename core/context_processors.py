@@ -1,34 +1,11 @@
-from leads.models import Lead
-from django.utils import timezone
+from .notifications import NotificationFeed
+
 
 def notifications(request):
+    """
+    The current user's notification feed. It is lazy: nothing is loaded
+    until a template iterates it or reads its counts.
+    """
     if request.user.is_authenticated:
-        today = timezone.localdate()  # current date
-
-        # Example notifications:
-        # 1. New leads created today
-        new_leads = Lead.objects.filter(status=Lead.STATUS_NEW, created_at__date=today)
-
-        # 2. Leads needing follow-up today
-        followup_leads = Lead.objects.filter(status=Lead.STATUS_FOLLOW, followup_date=today)
-
-        notifications_list = []
-
-        for lead in new_leads:
-            notifications_list.append({
-                "title": "New Lead Added",
-                "details": f"{lead.name} ({lead.project_code})"
-            })
-
-        for lead in followup_leads:
-            notifications_list.append({
-                "title": "Lead Follow-Up",
-                "details": f"{lead.name} ({lead.project_code})"
-            })
-
-    else:
-        notifications_list = []
-
-    return {
-        "notifications": notifications_list
-    }
+        return {"notifications": NotificationFeed(request.user)}
+    return {"notifications": []}
@@ -0,0 +1,106 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# kind -> (handler(object_id), on_failure(object_id, error) or None)
+HANDLERS = {}
+
+RETRY_BASE_DELAY = 30  # seconds, doubled per attempt
+
+
+def job_handler(kind, on_failure=None):
+    """
+    Register `func(object_id)` as the handler for a job kind. Handlers must be
+    idempotent: a job can run again after a crash or a retry.
+    """
+    def decorator(func):
+        HANDLERS[kind] = (func, on_failure)
+        return func
+    return decorator
+
+
+def enqueue(kind, object_id, max_attempts=3):
+    """
+    Queue a job unless an active one already exists for (kind, object_id).
+    Returns True when a new job was created.
+    """
+    try:
+        with transaction.atomic():
+            Job.objects.create(kind=kind, object_id=object_id, max_attempts=max_attempts)
+    except IntegrityError:
+        return False
+    return True
+
+
+def claim_jobs(limit, kinds=None):
+    """
+    Atomically move up to `limit` due jobs to running. Each claim is a
+    conditional UPDATE, so concurrent workers never run the same job.
+    """
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.STATUS_PENDING, run_after__lte=now)
+    if kinds:
+        due = due.filter(kind__in=kinds)
+
+    claimed = []
+    for job_id in due.order_by("run_after", "id").values_list("id", flat=True)[:limit]:
+        updated = Job.objects.filter(pk=job_id, status=Job.STATUS_PENDING).update(
+            status=Job.STATUS_RUNNING, locked_at=now, attempts=F("attempts") + 1,
+        )
+        if updated:
+            claimed.append(job_id)
+    return claimed
+
+
+def requeue_stale_jobs(lock_timeout):
+    """Return jobs left running by a crashed worker to the queue."""
+    cutoff = timezone.now() - timedelta(seconds=lock_timeout)
+    return Job.objects.filter(status=Job.STATUS_RUNNING, locked_at__lt=cutoff).update(
+        status=Job.STATUS_PENDING, locked_at=None,
+    )
+
+
+def run_job(job_id):
+    """
+    Execute one claimed job and record the outcome. Safe to call inside a
+    worker process. Returns the final job status.
+    """
+    close_old_connections()
+    job = Job.objects.get(pk=job_id)
+    handler, on_failure = HANDLERS.get(job.kind, (None, None))
+
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind '{job.kind}'")
+        handler(job.object_id)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Job %s failed (attempt %s/%s)", job, job.attempts, job.max_attempts)
+
+        if job.attempts < job.max_attempts:
+            delay = RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+            job.status = Job.STATUS_PENDING
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+        else:
+            job.status = Job.STATUS_FAILED
+            if on_failure:
+                on_failure(job.object_id, error)
+
+        job.error = error
+        job.locked_at = None
+        job.save(update_fields=["status", "run_after", "error", "locked_at", "updated_at"])
+        return job.status
+
+    job.status = Job.STATUS_DONE
+    job.error = ""
+    job.locked_at = None
+    job.save(update_fields=["status", "error", "locked_at", "updated_at"])
+    return job.status
@@ -0,0 +1,92 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import MaintenanceRun
+
+logger = logging.getLogger(__name__)
+
+# name -> (func(batch_size) -> rows touched, default interval in seconds)
+TASKS = {}
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def maintenance_task(name, interval):
+    """
+    Register `func(batch_size)` as a periodic sweep run every `interval`
+    seconds (override per name in settings.MAINTENANCE_INTERVALS). Sweeps
+    must be idempotent and return the number of rows they changed.
+    """
+    def decorator(func):
+        TASKS[name] = (func, interval)
+        return func
+    return decorator
+
+
+def task_interval(name):
+    _, interval = TASKS[name]
+    return getattr(settings, "MAINTENANCE_INTERVALS", {}).get(name, interval)
+
+
+def batched(queryset, batch_size, apply):
+    """
+    Call `apply(rows)` on consecutive pk-ordered slices of at most
+    `batch_size` rows of `queryset`, so each write transaction stays short.
+    `apply` returns how many rows it changed. Returns the total.
+
+    Each slice keeps the queryset's filters, so rows that stopped matching
+    since their ids were read are left alone. On failure the rows changed
+    by earlier (committed) slices are attached to the exception as
+    `rows_touched`.
+    """
+    touched = 0
+    last_pk = None
+    try:
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            ids = list(page.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return touched
+            touched += apply(queryset.filter(pk__in=ids))
+            if len(ids) < batch_size:
+                return touched
+            last_pk = ids[-1]
+    except Exception as exc:
+        exc.rows_touched = getattr(exc, "rows_touched", 0) + touched
+        raise
+
+
+def next_runs(names=None):
+    """{name: datetime the task is next due} based on its last recorded run."""
+    names = list(names or TASKS)
+    last_runs = dict(
+        MaintenanceRun.objects.filter(task__in=names)
+        .values("task")
+        .annotate(last=Max("started_at"))
+        .values_list("task", "last")
+    )
+    now = timezone.now()
+    return {
+        name: last_runs[name] + timedelta(seconds=task_interval(name)) if name in last_runs else now
+        for name in names
+    }
+
+
+def run_task(name, batch_size=DEFAULT_BATCH_SIZE):
+    """Run one sweep and record it as a MaintenanceRun. Returns the run."""
+    func, _ = TASKS[name]
+    run = MaintenanceRun.objects.create(task=name)
+    try:
+        run.rows_touched = func(batch_size)
+    except Exception as exc:
+        logger.exception("Maintenance task %s failed", name)
+        run.rows_touched = getattr(exc, "rows_touched", 0)
+        run.error = traceback.format_exc()
+    run.finished_at = timezone.now()
+    run.save(update_fields=["rows_touched", "error", "finished_at"])
+    return run
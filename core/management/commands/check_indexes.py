@@ -0,0 +1,106 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router
+
+from core.search import FTS_TABLE
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify that every index and unique constraint declared by the models "
+        "(and the search index structures) exists in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database", action="append", dest="databases",
+            help="Database alias to check (repeatable; default: every migrated database).",
+        )
+
+    def handle(self, *args, **options):
+        aliases = options["databases"] or [
+            alias for alias, config in connections.settings.items()
+            if not config.get("TEST", {}).get("MIRROR") and router.allow_migrate(alias, "core")
+        ]
+
+        missing = []
+        for alias in aliases:
+            problems = self.check_database(connections[alias])
+            missing.extend(f"[{alias}] {problem}" for problem in problems)
+            if not problems:
+                self.stdout.write(self.style.SUCCESS(f"[{alias}] all indexes present ({connections[alias].vendor})."))
+
+        if missing:
+            for problem in missing:
+                self.stderr.write(problem)
+            raise CommandError(f"{len(missing)} index(es) missing.")
+
+    def check_database(self, connection):
+        problems = []
+        with connection.cursor() as cursor:
+            tables = set(connection.introspection.table_names(cursor))
+            for model in self.models(connection):
+                table = model._meta.db_table
+                if table not in tables:
+                    problems.append(f"{table}: table missing")
+                    continue
+                found = connection.introspection.get_constraints(cursor, table).values()
+                problems.extend(f"{table}: {name}" for name in self.missing_indexes(model, found))
+
+            problems.extend(self.missing_search_structures(connection, cursor, tables))
+        return problems
+
+    def models(self, connection):
+        for model in apps.get_models(include_auto_created=True):
+            meta = model._meta
+            if meta.managed and not meta.proxy and not meta.swapped and router.allow_migrate_model(connection.alias, model):
+                yield model
+
+    def missing_indexes(self, model, found):
+        meta = model._meta
+        indexed = [(tuple(c["columns"]), c["unique"]) for c in found if c["index"] or c["unique"]]
+
+        def covered(columns, unique=False):
+            return any(
+                cols[:len(columns)] == tuple(columns) and (is_unique or not unique)
+                for cols, is_unique in indexed
+            )
+
+        expected = []
+        for field in meta.local_fields:
+            if field.primary_key or not field.column:
+                continue
+            if field.unique:
+                expected.append((field.column, [field.column], True))
+            elif field.db_index:
+                expected.append((field.column, [field.column], False))
+
+        for index in meta.indexes:
+            columns = [meta.get_field(name.lstrip("-")).column for name in index.fields]
+            expected.append((index.name, columns, False))
+
+        for constraint in meta.constraints:
+            if getattr(constraint, "fields", None):
+                columns = [meta.get_field(name).column for name in constraint.fields]
+                expected.append((constraint.name, columns, True))
+
+        for fields in meta.unique_together:
+            columns = [meta.get_field(name).column for name in fields]
+            expected.append((", ".join(columns), columns, True))
+
+        return [
+            f"{'unique ' if unique else ''}index {label} ({', '.join(columns)})"
+            for label, columns, unique in expected
+            if not covered(columns, unique)
+        ]
+
+    def missing_search_structures(self, connection, cursor, tables):
+        if "core_searchdocument" not in tables:
+            return []
+        if connection.vendor == "sqlite" and FTS_TABLE not in tables:
+            return [f"{FTS_TABLE}: FTS5 table missing (run migrate to create it)"]
+        if connection.vendor == "postgresql":
+            constraints = connection.introspection.get_constraints(cursor, "core_searchdocument")
+            if "core_searchdocument_body_trgm" not in constraints:
+                return ["core_searchdocument: trigram index core_searchdocument_body_trgm missing"]
+        return []
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.search import INDEXES, reindex
+
+
+class Command(BaseCommand):
+    help = "Rebuild search documents for every registered kind (or the given ones)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kinds", nargs="*", help="Only rebuild these kinds (default: all).")
+
+    def handle(self, *args, **options):
+        kinds = options["kinds"] or sorted(INDEXES)
+        unknown = set(kinds) - set(INDEXES)
+        if unknown:
+            raise CommandError(f"Unknown search kind(s): {', '.join(sorted(unknown))}")
+
+        for kind in kinds:
+            count = reindex(kind)
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} {kind} document(s)."))
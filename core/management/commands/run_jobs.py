@@ -0,0 +1,60 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.jobs import claim_jobs, requeue_stale_jobs, run_job
+
+
+def init_worker():
+    # Each worker process needs its own database connections.
+    django.setup()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (photo ingest, PDF rendering, ...) across a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--batch", type=int, default=0, help="Jobs claimed per round (default: 4 x workers).")
+        parser.add_argument("--kind", action="append", dest="kinds", help="Only run this job kind (repeatable).")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--lock-timeout", type=int, default=15 * 60, help="Requeue running jobs older than this (seconds).")
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit.")
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        batch = options["batch"] or workers * 4
+
+        requeued = requeue_stale_jobs(options["lock_timeout"])
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s).")
+
+        # Don't let forked workers inherit the parent's open connections.
+        connections.close_all()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            self.stdout.write(f"Job worker started with {workers} process(es).")
+            try:
+                while True:
+                    job_ids = claim_jobs(batch, options["kinds"])
+                    if not job_ids:
+                        if options["once"]:
+                            break
+                        requeue_stale_jobs(options["lock_timeout"])
+                        time.sleep(options["poll_interval"])
+                        continue
+
+                    started = time.monotonic()
+                    statuses = list(pool.map(run_job, job_ids))
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(
+                        f"Ran {len(job_ids)} job(s) in {elapsed:.1f}s: "
+                        f"{statuses.count('done')} done, {len(statuses) - statuses.count('done')} retry/failed."
+                    )
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping job worker.")
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.maintenance import DEFAULT_BATCH_SIZE, TASKS, next_runs, run_task
+
+
+class Command(BaseCommand):
+    help = "Run periodic maintenance sweeps (lead expiry, selection expiry, ...) on their own schedule."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--task", action="append", dest="tasks", help="Only run this task (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows changed per transaction.")
+        parser.add_argument("--poll-interval", type=float, default=60.0, help="Longest sleep between schedule checks (seconds).")
+        parser.add_argument("--once", action="store_true", help="Run every selected task once, whether due or not, and exit.")
+
+    def handle(self, *args, **options):
+        names = options["tasks"] or sorted(TASKS)
+        unknown = set(names) - set(TASKS)
+        if unknown:
+            raise CommandError(f"Unknown maintenance task(s): {', '.join(sorted(unknown))}")
+
+        if options["once"]:
+            for name in names:
+                self.report(run_task(name, options["batch_size"]))
+            return
+
+        self.stdout.write(f"Maintenance runner started for: {', '.join(names)}")
+        try:
+            while True:
+                now = timezone.now()
+                schedule = next_runs(names)
+                for name, due in schedule.items():
+                    if due <= now:
+                        self.report(run_task(name, options["batch_size"]))
+
+                schedule = next_runs(names)
+                wait = (min(schedule.values()) - timezone.now()).total_seconds()
+                time.sleep(min(max(wait, 1.0), options["poll_interval"]))
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping maintenance runner.")
+
+    def report(self, run):
+        elapsed = (run.finished_at - run.started_at).total_seconds()
+        if run.error:
+            self.stderr.write(f"{run.task} failed after {elapsed:.1f}s (see MaintenanceRun #{run.pk}).")
+        else:
+            self.stdout.write(f"{run.task}: {run.rows_touched} row(s) in {elapsed:.1f}s.")
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_maintenance_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('prefix', models.CharField(blank=True, max_length=10)),
+                ('width', models.PositiveSmallIntegerField(default=0, help_text='Zero-pad numbers to at least this many digits.')),
+                ('last_value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:46
+
+from django.db import migrations, models
+
+
+# Frozen copies of the registered search fields (leads/projects signals).
+SEARCH_INDEXES = {
+    'lead': ('leads', 'Lead', ('name', 'phone', 'email', 'event_type', 'event_place', 'status', 'project_code')),
+    'project': ('projects', 'Project', ('code', 'client_name', 'event_type')),
+}
+
+
+def backfill_documents(apps, schema_editor):
+    SearchDocument = apps.get_model('core', 'SearchDocument')
+
+    for kind, (app_label, model_name, fields) in SEARCH_INDEXES.items():
+        model = apps.get_model(app_label, model_name)
+        SearchDocument.objects.bulk_create([
+            SearchDocument(
+                kind=kind,
+                object_id=row[0],
+                body='\n'.join(str(value) for value in row[1:] if value not in (None, '')),
+            )
+            for row in model.objects.values_list('pk', *fields).iterator()
+        ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_code_sequence'),
+        ('leads', '0008_seed_project_code_sequence'),
+        ('projects', '0005_photo_processing_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('body', models.TextField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 class LoginPageConfig(models.Model):
     welcome_text = models.CharField(max_length=255)
@@ -8,11 +10,120 @@ class LoginPageConfig(models.Model):
 
     def __str__(self):
         return "Login Page Config"
-    
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from django.core.cache import cache
-
-@receiver(post_save, sender=LoginPageConfig)
-def clear_login_config_cache(sender, **kwargs):
-    cache.delete("login_page_config")
\ No newline at end of file
+
+
+class Job(models.Model):
+    """
+    Local background job queue row. Handlers are registered per `kind` in
+    core.jobs and executed by `manage.py run_jobs`.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+    kind = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='core_job_status_run_after'),
+        ]
+        constraints = [
+            # Idempotent enqueue: one active job per (kind, object).
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='unique_active_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}#{self.object_id} ({self.status})"
+
+
+class MaintenanceRun(models.Model):
+    """
+    One execution of a periodic maintenance task registered in
+    core.maintenance and scheduled by `manage.py run_maintenance`.
+    """
+    task = models.CharField(max_length=50)
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    rows_touched = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['task', '-started_at'], name='core_maint_task_started'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} @ {self.started_at:%Y-%m-%d %H:%M} ({self.rows_touched} rows)"
+
+
+class CodeSequence(models.Model):
+    """
+    Named counter for human-readable codes such as lead project codes.
+    Values are handed out atomically by core.sequences.next_code.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    prefix = models.CharField(max_length=10, blank=True)
+    width = models.PositiveSmallIntegerField(default=0, help_text="Zero-pad numbers to at least this many digits.")
+    last_value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} ({self.prefix}{self.last_value:0{self.width}d})"
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one registered object (see core.search). The
+    database-specific full-text index is built on top of this table.
+    """
+    kind = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    body = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}#{self.object_id}"
+
+
+class NotificationRead(models.Model):
+    """A user has read one notification (see core.notifications for keys)."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notification_reads')
+    day = models.DateField()
+    key = models.CharField(max_length=64)
+    read_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Also the (user, day) index used to load a day's read state.
+            models.UniqueConstraint(fields=['user', 'day', 'key'], name='unique_notification_read'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} read {self.key}"
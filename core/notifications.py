@@ -0,0 +1,126 @@
+"""
+Daily notification feed.
+
+The feed is the same for every user on a given day (new leads created
+today, leads due for follow-up today), so it is computed with one query
+and cached per day in the "notifications" namespace, which Lead signals
+bump. Read state is kept per user in NotificationRead and cached per
+user and day. Templates get a
+lazy NotificationFeed, so pages that never show the feed never load it.
+"""
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .cache import bump_on_commit, cache_delete, cached
+from .models import NotificationRead
+
+
+NAMESPACE = "notifications"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+KIND_TITLES = {
+    "new_lead": "New Lead Added",
+    "follow_up": "Lead Follow-Up",
+}
+
+
+def feed_cache_key(day):
+    return f"feed:{day.isoformat()}"
+
+
+def read_cache_key(user_id, day):
+    return f"read:{day.isoformat()}:{user_id}"
+
+
+def notification_key(kind, lead_id, day):
+    """Stable id of one notification, used to record read state."""
+    return f"{kind}:{lead_id}:{day.isoformat()}"
+
+
+# ------------------------
+# Building and caching
+# ------------------------
+def build_notifications(day):
+    from leads.models import Lead
+
+    leads = Lead.objects.filter(
+        Q(status=Lead.STATUS_NEW, created_at__date=day)
+        | Q(status=Lead.STATUS_FOLLOW, followup_date=day)
+    ).order_by("id").values("id", "name", "project_code", "status")
+
+    items = {"new_lead": [], "follow_up": []}
+    for lead in leads:
+        kind = "new_lead" if lead["status"] == Lead.STATUS_NEW else "follow_up"
+        items[kind].append({
+            "key": notification_key(kind, lead["id"], day),
+            "kind": kind,
+            "title": KIND_TITLES[kind],
+            "details": f"{lead['name']} ({lead['project_code']})",
+            "lead_id": lead["id"],
+        })
+    return items["new_lead"] + items["follow_up"]
+
+
+def daily_notifications(day=None):
+    day = day or timezone.localdate()
+    return cached(NAMESPACE, feed_cache_key(day), lambda: build_notifications(day), CACHE_TIMEOUT)
+
+
+def read_keys(user_id, day=None):
+    day = day or timezone.localdate()
+    return cached(
+        NAMESPACE, read_cache_key(user_id, day),
+        lambda: set(NotificationRead.objects.filter(user_id=user_id, day=day).values_list("key", flat=True)),
+        CACHE_TIMEOUT,
+    )
+
+
+def invalidate_notifications():
+    """Drop every cached feed once the current transaction commits."""
+    bump_on_commit(NAMESPACE)
+
+
+# ------------------------
+# Read state
+# ------------------------
+def mark_read(user, keys=None, day=None):
+    """
+    Mark the given notification keys (default: the whole feed of `day`)
+    read for `user`. Unknown keys are ignored. Returns the number marked.
+    """
+    day = day or timezone.localdate()
+    known = {item["key"] for item in daily_notifications(day)}
+    keys = known if keys is None else known & set(keys)
+
+    NotificationRead.objects.bulk_create(
+        [NotificationRead(user=user, day=day, key=key) for key in keys], ignore_conflicts=True,
+    )
+    cache_delete(NAMESPACE, read_cache_key(user.pk, day))
+    return len(keys)
+
+
+class NotificationFeed:
+    """A user's feed for one day, loaded on first use."""
+
+    def __init__(self, user, day=None):
+        self.user = user
+        self.day = day or timezone.localdate()
+
+    @cached_property
+    def items(self):
+        read = read_keys(self.user.pk, self.day)
+        return [dict(item, read=item["key"] in read) for item in daily_notifications(self.day)]
+
+    @cached_property
+    def unread_count(self):
+        return sum(not item["read"] for item in self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
@@ -0,0 +1,53 @@
+"""
+Read-replica routing.
+
+Writes and migrations always go to "default". Reads go to the "replica"
+database only inside views wrapped with `reads_from_replica` (read-heavy
+pages that tolerate replication lag), and only when a replica is
+configured; everywhere else they stay on the primary.
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+
+REPLICA = "replica"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def reads_from_replica(view_func):
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            response = view_func(request, *args, **kwargs)
+            # Render lazy responses while reads are still routed.
+            if hasattr(response, "render") and callable(response.render):
+                response = response.render()
+            return response
+        finally:
+            _replica_reads.reset(token)
+    return _wrapped_view
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and replica_configured():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
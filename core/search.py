@@ -0,0 +1,218 @@
+"""
+Shared full-text search over registered models.
+
+Each registered object has one SearchDocument row holding its searchable
+text, kept in sync by post_save / post_delete receivers. Matching runs on
+the database's own index:
+
+- SQLite: an FTS5 trigram table mirrors SearchDocument through triggers,
+  so substring queries use the index and results are ranked with bm25.
+- PostgreSQL: a pg_trgm GIN index on SearchDocument.body serves the
+  icontains lookups and results are ranked by trigram word similarity.
+
+Both structures are created by `ensure_search_backend` after migrate.
+"""
+from functools import lru_cache
+
+from django.db import connection
+from django.db.models import Case, IntegerField, When
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+
+from .models import SearchDocument
+
+
+# kind -> (model, indexed field names)
+INDEXES = {}
+
+FTS_TABLE = "core_searchdocument_fts"
+
+# The FTS5 trigram tokenizer cannot match terms shorter than this.
+MIN_FTS_TERM_LENGTH = 3
+
+RANKED_LIMIT = 50
+
+
+# ------------------------
+# Registration and syncing
+# ------------------------
+def register(kind, model, fields):
+    """Index `fields` of `model` under `kind` and keep it in sync on save/delete."""
+    fields = tuple(fields)
+    INDEXES[kind] = (model, fields)
+
+    def index_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw or (update_fields and not set(update_fields) & set(fields)):
+            return
+        index_object(kind, instance)
+
+    def unindex_deleted(sender, instance, **kwargs):
+        SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+    post_save.connect(index_saved, sender=model, weak=False, dispatch_uid=f"search-index-{kind}")
+    post_delete.connect(unindex_deleted, sender=model, weak=False, dispatch_uid=f"search-unindex-{kind}")
+
+
+def document_body(values):
+    return "\n".join(str(value) for value in values if value not in (None, ""))
+
+
+def index_object(kind, instance):
+    """Upsert one document; does not write when the text is unchanged."""
+    _, fields = INDEXES[kind]
+    body = document_body(getattr(instance, field) for field in fields)
+
+    documents = SearchDocument.objects.filter(kind=kind, object_id=instance.pk)
+    if documents.filter(body=body).exists():
+        return
+    if not documents.update(body=body):
+        SearchDocument.objects.create(kind=kind, object_id=instance.pk, body=body)
+
+
+def reindex(kind, queryset=None, batch_size=500):
+    """
+    Rebuild documents for `queryset` (default: every row of the model) from
+    .values_list() rows. Use after bulk updates that bypass signals.
+    Returns the number of documents written.
+    """
+    model, fields = INDEXES[kind]
+    queryset = model.objects.all() if queryset is None else queryset
+
+    written = 0
+    batch = []
+    for row in queryset.order_by("pk").values_list("pk", *fields).iterator(chunk_size=batch_size):
+        batch.append(SearchDocument(kind=kind, object_id=row[0], body=document_body(row[1:])))
+        if len(batch) == batch_size:
+            written += _replace_documents(kind, batch)
+            batch = []
+    if batch:
+        written += _replace_documents(kind, batch)
+    return written
+
+
+def _replace_documents(kind, documents):
+    SearchDocument.objects.filter(kind=kind, object_id__in=[doc.object_id for doc in documents]).delete()
+    SearchDocument.objects.bulk_create(documents)
+    return len(documents)
+
+
+# ------------------------
+# Backend setup
+# ------------------------
+SQLITE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    "body, content='core_searchdocument', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON core_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON core_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.id, old.body); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON core_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.id, old.body); "
+    f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body); END",
+    # Index documents that existed before the FTS table.
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+
+POSTGRES_TRGM_SQL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS core_searchdocument_body_trgm "
+    "ON core_searchdocument USING gin (body gin_trgm_ops)",
+)
+
+
+def ensure_search_backend(using="default", **kwargs):
+    """post_migrate hook: create the vendor-specific index structures."""
+    from django.db import connections
+
+    db = connections[using]
+    if "core_searchdocument" not in db.introspection.table_names():
+        return
+
+    with db.cursor() as cursor:
+        if db.vendor == "sqlite" and FTS_TABLE not in db.introspection.table_names():
+            for statement in SQLITE_FTS_SQL:
+                cursor.execute(statement)
+        elif db.vendor == "postgresql":
+            for statement in POSTGRES_TRGM_SQL:
+                cursor.execute(statement)
+    fts_available.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def fts_available():
+    return connection.vendor == "sqlite" and FTS_TABLE in connection.introspection.table_names()
+
+
+# ------------------------
+# Querying
+# ------------------------
+def search_terms(query):
+    return [term for term in (query or "").replace('"', " ").split() if term]
+
+
+def _uses_fts(terms):
+    return fts_available() and all(len(term) >= MIN_FTS_TERM_LENGTH for term in terms)
+
+
+def _fts_sql(select, order=""):
+    return (
+        f"SELECT {select} FROM {FTS_TABLE} "
+        f"JOIN core_searchdocument d ON d.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s AND d.kind = %s {order}"
+    )
+
+
+def _fts_query(terms):
+    # Every term must appear; each is quoted so FTS5 syntax is not parsed.
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _matching_documents(kind, terms):
+    documents = SearchDocument.objects.filter(kind=kind)
+    for term in terms:
+        documents = documents.filter(body__icontains=term)
+    return documents
+
+
+def search_filter(queryset, kind, query):
+    """
+    Restrict `queryset` to objects whose document contains every term of
+    `query` (case-insensitive substrings). Ordering is left to the caller.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+
+    if _uses_fts(terms):
+        matches = RawSQL(_fts_sql("d.object_id"), (_fts_query(terms), kind))
+    else:
+        matches = _matching_documents(kind, terms).values("object_id")
+    return queryset.filter(pk__in=matches)
+
+
+def ranked_ids(kind, query, limit=RANKED_LIMIT):
+    """Ids of the best `limit` matches for `query`, best first."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    if _uses_fts(terms):
+        with connection.cursor() as cursor:
+            cursor.execute(_fts_sql("d.object_id", "ORDER BY rank LIMIT %s"), (_fts_query(terms), kind, limit))
+            return [row[0] for row in cursor.fetchall()]
+
+    documents = _matching_documents(kind, terms)
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        documents = documents.annotate(rank=TrigramWordSimilarity(query, "body")).order_by("-rank", "-object_id")
+    else:
+        documents = documents.order_by("-object_id")
+    return list(documents.values_list("object_id", flat=True)[:limit])
+
+
+def search(queryset, kind, query, limit=RANKED_LIMIT):
+    """`queryset` limited to the best matches for `query`, ordered by rank."""
+    ids = ranked_ids(kind, query, limit)
+    ranking = Case(*[When(pk=pk, then=position) for position, pk in enumerate(ids)], output_field=IntegerField())
+    return queryset.filter(pk__in=ids).order_by(ranking) if ids else queryset.none()
@@ -0,0 +1,30 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import CodeSequence
+
+
+def next_value(name, prefix="", width=0):
+    """
+    Atomically advance the named sequence and return (prefix, width, value).
+    `prefix` and `width` only apply when the sequence does not exist yet.
+
+    The increment is a single UPDATE, so the row stays locked until the
+    transaction commits and concurrent callers queue up behind it instead of
+    reading the same value.
+    """
+    with transaction.atomic():
+        sequences = CodeSequence.objects.filter(name=name)
+        if not sequences.update(last_value=F("last_value") + 1):
+            try:
+                with transaction.atomic():
+                    CodeSequence.objects.create(name=name, prefix=prefix, width=width, last_value=1)
+            except IntegrityError:
+                sequences.update(last_value=F("last_value") + 1)
+        return sequences.select_for_update().values_list("prefix", "width", "last_value").get()
+
+
+def next_code(name, prefix="", width=0):
+    """Next formatted code of a sequence, e.g. "AK007" or "AK1000"."""
+    prefix, width, value = next_value(name, prefix, width)
+    return f"{prefix}{value:0{width}d}"
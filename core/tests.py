@@ -1,3 +1,277 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from leads.models import Lead
+from accounts.views import get_login_config
+from .cache import bump, cache_get, cache_set, namespaced_key, read_through
+from .jobs import HANDLERS, RETRY_BASE_DELAY, claim_jobs, enqueue, job_handler, requeue_stale_jobs, run_job
+from .models import Job, LoginPageConfig
+from .routers import REPLICA, ReplicaRouter, reads_from_replica
+from .notifications import NotificationFeed
+
+
+class NotificationFeedTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="owner", password="pw")
+        self.client.force_login(self.user)
+        Lead.objects.create(name="Fresh", status=Lead.STATUS_NEW)
+        Lead.objects.create(
+            name="Due", status=Lead.STATUS_FOLLOW, followup_date=timezone.localdate(),
+        )
+        Lead.objects.create(
+            name="Later", status=Lead.STATUS_FOLLOW, followup_date=timezone.localdate() + timedelta(days=1),
+        )
+
+    def test_feed_is_lazy_and_cached(self):
+        with self.assertNumQueries(0):
+            feed = NotificationFeed(self.user)
+
+        self.assertEqual([item["details"].split(" ")[0] for item in feed], ["Fresh", "Due"])
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationFeed(self.user).unread_count, 2)
+
+    def test_lead_changes_refresh_feed(self):
+        self.assertEqual(len(NotificationFeed(self.user)), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.create(name="Another", status=Lead.STATUS_NEW)
+        self.assertEqual(len(NotificationFeed(self.user)), 3)
+
+    def test_mark_read(self):
+        feed = NotificationFeed(self.user)
+        first = feed.items[0]["key"]
+
+        response = self.client.post(
+            reverse("core:mark_notifications_read"), {"keys": [first, "bogus"]}, content_type="application/json",
+        )
+        self.assertEqual(response.json(), {"success": True, "marked": 1, "unread": 1})
+
+        data = self.client.get(reverse("core:notification_feed")).json()
+        self.assertEqual([item["read"] for item in data["notifications"]], [True, False])
+
+        self.client.post(reverse("core:mark_notifications_read"), {}, content_type="application/json")
+        self.assertEqual(NotificationFeed(self.user).unread_count, 0)
+
+
+class CacheNamespaceTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_runs_against_a_private_cache(self):
+        self.assertIsInstance(caches["default"], LocMemCache)
+
+    def test_bump_hides_every_key_of_the_namespace(self):
+        cache_set("things", "a", 1)
+        cache_set("other", "a", 2)
+        bump("things")
+        self.assertIsNone(cache_get("things", "a"))
+        self.assertEqual(cache_get("other", "a"), 2)
+
+    def test_login_config_follows_saves(self):
+        config = LoginPageConfig.objects.create(welcome_text="Hello")
+        self.assertEqual(get_login_config().welcome_text, "Hello")
+
+        config.welcome_text = "Welcome back"
+        with self.captureOnCommitCallbacks(execute=True):
+            config.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_login_config().welcome_text, "Welcome back")
+        with self.assertNumQueries(0):
+            get_login_config()
+
+    def test_missing_login_config_is_cached(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_login_config())
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_login_config())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            LoginPageConfig.objects.create(welcome_text="Hi")
+        self.assertEqual(get_login_config().welcome_text, "Hi")
+
+    def test_stale_entry_is_refilled_by_one_process(self):
+        calls = []
+        read_through("things", "a", lambda: calls.append(1) or "old", timeout=-1)
+
+        # Another process holds the refill lock: serve the stale value.
+        key = namespaced_key("things", "a")
+        cache.add(f"{key}:lock", 1)
+        self.assertEqual(read_through("things", "a", lambda: calls.append(1) or "new"), "old")
+        self.assertEqual(len(calls), 1)
+
+        cache.delete(f"{key}:lock")
+        self.assertEqual(read_through("things", "a", lambda: calls.append(1) or "new"), "new")
+
+    def test_waiter_that_times_out_keeps_the_holders_lock(self):
+        # Another process holds the lock on a cold key and never fills it.
+        lock_key = f"{namespaced_key('things', 'cold')}:lock"
+        cache.add(lock_key, 1)
+
+        with mock.patch("core.cache.LOCK_WAIT", 0):
+            self.assertEqual(read_through("things", "cold", lambda: "mine"), "mine")
+        self.assertEqual(cache.get(lock_key), 1)
+
+
+class DatabaseProfileTests(TestCase):
+
+    def test_all_declared_indexes_exist(self):
+        out = StringIO()
+        call_command("check_indexes", stdout=out)
+        self.assertIn("all indexes present", out.getvalue())
+
+    def test_replica_reads_only_inside_marked_views(self):
+        router = ReplicaRouter()
+        seen = []
+        view = reads_from_replica(lambda request: seen.append(router.db_for_read(Lead)))
+
+        with mock.patch("core.routers.replica_configured", return_value=True):
+            view(None)
+            self.assertEqual(seen, [REPLICA])
+            self.assertIsNone(router.db_for_read(Lead))
+            self.assertEqual(router.db_for_write(Lead), "default")
+
+        view(None)
+        self.assertEqual(seen, [REPLICA, None])
+
+
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        self.failures = []
+        self.calls = []
+        # run_job recycles the worker's connection, which would close the test transaction.
+        patcher = mock.patch("core.jobs.close_old_connections")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(HANDLERS.pop, "test_flaky", None)
+        self.addCleanup(HANDLERS.pop, "test_ok", None)
+
+        @job_handler("test_flaky", on_failure=lambda object_id, error: self.failures.append((object_id, error)))
+        def flaky(object_id):
+            self.calls.append(object_id)
+            raise RuntimeError("boom")
+
+        @job_handler("test_ok")
+        def ok(object_id):
+            self.calls.append(object_id)
+
+    def make_due(self, job):
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+    def test_enqueue_is_idempotent_while_active(self):
+        self.assertTrue(enqueue("test_ok", 7))
+        self.assertFalse(enqueue("test_ok", 7))
+        self.assertTrue(enqueue("test_ok", 8))
+        self.assertEqual(Job.objects.filter(kind="test_ok", object_id=7).count(), 1)
+
+        [job_id] = claim_jobs(1, ["test_ok"])
+        self.assertFalse(enqueue("test_ok", Job.objects.get(pk=job_id).object_id))
+        self.assertEqual(run_job(job_id), Job.STATUS_DONE)
+
+        # Finished jobs no longer block a new one.
+        self.assertTrue(enqueue("test_ok", 7))
+
+    def test_claimed_jobs_are_not_claimed_again(self):
+        for object_id in range(3):
+            enqueue("test_ok", object_id)
+
+        first = claim_jobs(2)
+        second = claim_jobs(10)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(claim_jobs(10), [])
+        self.assertEqual(Job.objects.filter(status=Job.STATUS_RUNNING, attempts=1).count(), 3)
+
+    def test_retries_back_off_until_max_attempts(self):
+        enqueue("test_flaky", 42, max_attempts=3)
+        job = Job.objects.get(kind="test_flaky")
+
+        for attempt in (1, 2):
+            before = timezone.now()
+            [job_id] = claim_jobs(1)
+            with self.assertLogs("core.jobs", "WARNING") as logs:
+                self.assertEqual(run_job(job_id), Job.STATUS_PENDING)
+            self.assertIn(f"failed (attempt {attempt}/3)", logs.output[0])
+            job.refresh_from_db()
+            self.assertEqual(job.attempts, attempt)
+            delay = RETRY_BASE_DELAY * 2 ** (attempt - 1)
+            self.assertGreaterEqual(job.run_after, before + timedelta(seconds=delay))
+            self.assertIn("boom", job.error)
+            # Not due yet: nothing to claim until the backoff passes.
+            self.assertEqual(claim_jobs(1), [])
+            self.make_due(job)
+
+        [job_id] = claim_jobs(1)
+        with self.assertLogs("core.jobs", "WARNING") as logs:
+            self.assertEqual(run_job(job_id), Job.STATUS_FAILED)
+        self.assertIn("failed (attempt 3/3)", logs.output[0])
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(self.calls, [42, 42, 42])
+        self.assertEqual(claim_jobs(1), [])
+
+    def test_on_failure_runs_once_after_the_last_attempt(self):
+        enqueue("test_flaky", 5, max_attempts=1)
+        [job_id] = claim_jobs(1)
+        with self.assertLogs("core.jobs", "WARNING") as logs:
+            run_job(job_id)
+        self.assertIn("failed (attempt 1/1)", logs.output[0])
+        self.assertEqual(len(self.failures), 1)
+        object_id, error = self.failures[0]
+        self.assertEqual(object_id, 5)
+        self.assertIn("RuntimeError: boom", error)
+
+    def test_unknown_kind_fails_and_stale_jobs_are_requeued(self):
+        enqueue("test_missing", 1, max_attempts=1)
+        [job_id] = claim_jobs(1)
+        with self.assertLogs("core.jobs", "WARNING") as logs:
+            self.assertEqual(run_job(job_id), Job.STATUS_FAILED)
+        self.assertIn("test_missing#1", logs.output[0])
+        self.assertIn("No handler registered", Job.objects.get(pk=job_id).error)
+
+        enqueue("test_ok", 2)
+        [job_id] = claim_jobs(1)
+        Job.objects.filter(pk=job_id).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(60), 1)
+        self.assertEqual(claim_jobs(1), [job_id])
+
+
+class JobClaimConcurrencyTests(TransactionTestCase):
+
+    def test_concurrent_workers_never_share_a_job(self):
+        for object_id in range(20):
+            enqueue("test_ok", object_id)
+
+        def worker(_):
+            try:
+                claimed = []
+                while True:
+                    batch = claim_jobs(3)
+                    if not batch:
+                        return claimed
+                    claimed.extend(batch)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            batches = list(pool.map(worker, range(4)))
+
+        claimed = [job_id for batch in batches for job_id in batch]
+        self.assertEqual(len(claimed), 20)
+        self.assertEqual(len(set(claimed)), 20)
+        self.assertFalse(Job.objects.exclude(attempts=1).exists())
 
-# Create your tests here.
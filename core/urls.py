@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = "core"
+
+urlpatterns = [
+    path("notifications/", views.notification_feed, name="notification_feed"),
+    path("notifications/read/", views.mark_notifications_read, name="mark_notifications_read"),
+]
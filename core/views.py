@@ -0,0 +1,30 @@
+import json
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+from .notifications import NotificationFeed, mark_read
+
+
+@login_required
+def notification_feed(request):
+    feed = NotificationFeed(request.user)
+    return JsonResponse({"success": True, "unread": feed.unread_count, "notifications": feed.items})
+
+
+@login_required
+@require_POST
+def mark_notifications_read(request):
+    """Mark ?keys (a JSON list) read, or the whole feed when omitted."""
+    try:
+        data = json.loads(request.body or "{}")
+    except json.JSONDecodeError:
+        return JsonResponse({"success": False, "error": "Invalid JSON"}, status=400)
+
+    keys = data.get("keys")
+    if keys is not None and not isinstance(keys, list):
+        return JsonResponse({"success": False, "error": "keys must be a list"}, status=400)
+
+    marked = mark_read(request.user, keys)
+    return JsonResponse({"success": True, "marked": marked, "unread": NotificationFeed(request.user).unread_count})
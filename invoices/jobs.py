@@ -0,0 +1,12 @@
+from core.jobs import job_handler
+
+from .models import Invoice
+from .pdf import ensure_invoice_pdf
+
+
+@job_handler("invoice_pdf")
+def render_invoice(invoice_id):
+    """Pre-render the cached PDF after an invoice changes."""
+    invoice = Invoice.objects.select_related("project__lead").filter(pk=invoice_id).first()
+    if invoice is not None:
+        ensure_invoice_pdf(invoice)
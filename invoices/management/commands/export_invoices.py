@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.text import get_valid_filename
+
+from invoices.models import Invoice
+from invoices.pdf import invoice_content_hash, render_invoice_pdf, write_atomic
+
+MANIFEST_NAME = "manifest.json"
+
+# Per-process WeasyPrint state, reused for every invoice the worker renders.
+_worker = {}
+
+
+def init_worker():
+    django.setup()
+    connections.close_all()
+
+    from weasyprint.text.fonts import FontConfiguration
+    _worker["font_config"] = FontConfiguration()
+    _worker["cache"] = {}
+
+
+def render_to_file(invoice_id, path):
+    started = time.monotonic()
+    invoice = Invoice.objects.select_related("project__lead").get(pk=invoice_id)
+    pdf = render_invoice_pdf(
+        invoice, font_config=_worker["font_config"], cache=_worker["cache"]
+    )
+    write_atomic(Path(path), pdf)
+    return invoice_id, len(pdf), time.monotonic() - started
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = "Render invoice PDFs in parallel into a directory (or zip) with a manifest."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Output directory; re-running resumes from its manifest.")
+        parser.add_argument("--from", dest="date_from", type=parse_date, help="Created on or after (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="date_to", type=parse_date, help="Created on or before (YYYY-MM-DD).")
+        parser.add_argument("--status", choices=[key for key, _ in Invoice.STATUS_CHOICES])
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--zip", action="store_true", help="Also pack the directory into <output>.zip.")
+        parser.add_argument("--no-resume", action="store_true", help="Re-render invoices already in the manifest.")
+
+    def handle(self, *args, **options):
+        output = Path(options["output"])
+        output.mkdir(parents=True, exist_ok=True)
+        manifest_path = output / MANIFEST_NAME
+
+        manifest = {}
+        if manifest_path.exists() and not options["no_resume"]:
+            manifest = json.loads(manifest_path.read_text())
+
+        invoices = Invoice.objects.select_related("project__lead").order_by("id")
+        if options["date_from"]:
+            invoices = invoices.filter(created_at__date__gte=options["date_from"])
+        if options["date_to"]:
+            invoices = invoices.filter(created_at__date__lte=options["date_to"])
+        if options["status"]:
+            invoices = invoices.filter(status=options["status"])
+
+        # The manifest only ever lists files that finished rendering.
+        todo = []
+        pending = {}
+        for invoice in invoices.iterator():
+            digest = invoice_content_hash(invoice)
+            entry = manifest.get(str(invoice.id))
+            if entry and entry["sha256"] == digest and (output / entry["file"]).exists():
+                continue
+
+            manifest.pop(str(invoice.id), None)
+            # The pk keeps names unique: "INV/1" and "INV 1" sanitize alike.
+            filename = get_valid_filename(f"{invoice.pk}-{invoice.invoice_number}.pdf")
+            pending[str(invoice.id)] = {
+                "invoice_number": invoice.invoice_number,
+                "status": invoice.status,
+                "total": str(invoice.total),
+                "created_at": invoice.created_at.isoformat(),
+                "file": filename,
+                "sha256": digest,
+            }
+            todo.append((invoice.id, output / filename))
+
+        skipped = invoices.count() - len(todo)
+        self.stdout.write(f"{len(todo)} invoice(s) to render, {skipped} already exported.")
+
+        rendered = failed = 0
+        started = time.monotonic()
+        if todo:
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=max(1, options["workers"]), initializer=init_worker) as pool:
+                futures = {pool.submit(render_to_file, invoice_id, str(path)): invoice_id for invoice_id, path in todo}
+                for future in as_completed(futures):
+                    invoice_id = futures[future]
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"Invoice {invoice_id}: {exc}")
+                        continue
+
+                    rendered += 1
+                    manifest[str(invoice_id)] = pending[str(invoice_id)]
+                    if rendered % 50 == 0:
+                        write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
+                        rate = rendered / (time.monotonic() - started)
+                        self.stdout.write(f"  {rendered}/{len(todo)} ({rate:.1f} invoices/s)")
+
+        write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
+
+        elapsed = time.monotonic() - started
+        rate = rendered / elapsed if elapsed and rendered else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {rendered} invoice(s) in {elapsed:.1f}s ({rate:.1f} invoices/s), "
+            f"{skipped} skipped, {failed} failed."
+        ))
+
+        if options["zip"]:
+            archive = shutil.make_archive(str(output), "zip", root_dir=output)
+            self.stdout.write(f"Wrote {archive}")
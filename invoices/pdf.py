@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import get_template, render_to_string
+
+PDF_TEMPLATE = "invoice_pdf.html"
+
+
+def cache_dir():
+    return Path(getattr(settings, "INVOICE_PDF_CACHE_DIR", Path(settings.BASE_DIR) / "cache" / "invoices"))
+
+
+@lru_cache(maxsize=1)
+def template_fingerprint():
+    return hashlib.sha256(get_template(PDF_TEMPLATE).template.source.encode()).hexdigest()
+
+
+def invoice_content_hash(invoice):
+    """
+    Hash of everything the PDF shows: the invoice row, the project/lead
+    fields printed on it and the template source.
+    """
+    project = invoice.project
+    lead = project.lead
+    payload = {
+        "invoice": {
+            field.attname: str(getattr(invoice, field.attname))
+            for field in invoice._meta.concrete_fields
+        },
+        "client_name": project.client_name,
+        "event_type": project.event_type,
+        "email": lead.email,
+        "phone": lead.phone,
+        "template": template_fingerprint(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def cached_pdf_path(invoice_id, digest):
+    return cache_dir() / f"{invoice_id}-{digest[:20]}.pdf"
+
+
+def render_invoice_pdf(invoice, **write_options):
+    from weasyprint import HTML
+
+    html_string = render_to_string(PDF_TEMPLATE, {"invoice": invoice})
+    return HTML(string=html_string).write_pdf(**write_options)
+
+
+def write_atomic(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+def discard_cached_pdfs(invoice_id, keep=None):
+    for path in cache_dir().glob(f"{invoice_id}-*.pdf"):
+        if path != keep:
+            path.unlink(missing_ok=True)
+
+
+def ensure_invoice_pdf(invoice, digest=None):
+    """
+    Return the path of an up-to-date cached PDF, rendering it only when the
+    content hash has no file yet.
+    """
+    digest = digest or invoice_content_hash(invoice)
+    path = cached_pdf_path(invoice.id, digest)
+    if not path.exists():
+        write_atomic(path, render_invoice_pdf(invoice))
+        discard_cached_pdfs(invoice.id, keep=path)
+    return path
+
+
+def open_invoice_pdf(invoice, digest=None):
+    """
+    Open the up-to-date cached PDF for reading. A concurrent regenerate or
+    discard can remove the file between ensuring and opening it, so that
+    case ensures it once more; an open handle survives later deletes.
+    """
+    digest = digest or invoice_content_hash(invoice)
+    try:
+        return open(ensure_invoice_pdf(invoice, digest), "rb")
+    except FileNotFoundError:
+        return open(ensure_invoice_pdf(invoice, digest), "rb")
@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.jobs import enqueue
+from leads.revenue import invoice_state, previous_invoice_state, record_invoice_change
+from .models import Invoice
+from .pdf import discard_cached_pdfs
+
+
+@receiver(pre_save, sender=Invoice)
+def remember_invoice_revenue(sender, instance, raw=False, **kwargs):
+    instance._revenue_previous = None if raw else previous_invoice_state(instance)
+
+
+@receiver(post_save, sender=Invoice)
+def update_invoice_revenue(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_invoice_change(getattr(instance, "_revenue_previous", None), invoice_state(instance))
+
+
+@receiver(post_save, sender=Invoice)
+def queue_invoice_pdf(sender, instance, **kwargs):
+    """
+    Regenerate the cached PDF in the background whenever the invoice changes.
+    """
+    transaction.on_commit(lambda: enqueue("invoice_pdf", instance.pk))
+
+
+@receiver(post_delete, sender=Invoice)
+def delete_invoice_pdfs(sender, instance, **kwargs):
+    discard_cached_pdfs(instance.pk)
+
+
+@receiver(post_delete, sender=Invoice)
+def release_invoice_revenue(sender, instance, **kwargs):
+    record_invoice_change(invoice_state(instance), None)
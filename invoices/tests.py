@@ -1,3 +1,147 @@
-from django.test import TestCase
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+
+from leads.models import Lead
+from . import pdf
+from .models import Invoice
+from .pdf import cache_dir, discard_cached_pdfs, ensure_invoice_pdf, open_invoice_pdf
+from .views import download_invoice
+
+
+class InvoicePdfCacheTests(TestCase):
+
+    def setUp(self):
+        self.enterContext(override_settings(INVOICE_PDF_CACHE_DIR=self.enterContext(tempfile.TemporaryDirectory())))
+        # WeasyPrint is slow and optional here; the cache logic only needs bytes.
+        self.render = self.enterContext(mock.patch(
+            "invoices.pdf.render_invoice_pdf", side_effect=lambda invoice: b"%PDF " + invoice.invoice_number.encode(),
+        ))
+
+        lead = Lead.objects.create(name="Wedding", event_type="Wedding", amount=1000, status=Lead.STATUS_ACCEPTED)
+        self.invoice = Invoice.objects.create(
+            project=lead.project, invoice_number="INV-P1", subtotal=600, total=600,
+        )
+
+    def download(self, **headers):
+        # invoices.urls is not mounted, so call the view directly.
+        request = RequestFactory().get("/", headers=headers)
+        response = download_invoice(request, self.invoice.pk)
+        if response.status_code == 200:
+            # response.close() would fire request_finished and drop the test connection.
+            self.addCleanup(response.file_to_stream.close)
+        return response
+
+    def test_cached_pdf_is_not_rendered_again(self):
+        first = self.download()
+        second = self.download()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.getvalue(), b"%PDF INV-P1")
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.download()["ETag"]
+        response = self.download(**{"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_edit_invalidates_cached_pdf(self):
+        old_etag = self.download()["ETag"]
+        self.invoice.invoice_number = "INV-P2"
+        self.invoice.save()
+
+        response = self.download(**{"If-None-Match": old_etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], old_etag)
+        self.assertEqual(response.getvalue(), b"%PDF INV-P2")
+        self.assertEqual(self.render.call_count, 2)
+        self.assertEqual(len(list(cache_dir().glob(f"{self.invoice.pk}-*.pdf"))), 1)
+
+    def test_open_survives_a_concurrent_discard(self):
+        def ensure_then_discard(invoice, digest=None):
+            path = ensure_invoice_pdf(invoice, digest)
+            if ensure.call_count == 1:
+                discard_cached_pdfs(invoice.pk)
+            return path
+
+        with mock.patch.object(pdf, "ensure_invoice_pdf", side_effect=ensure_then_discard) as ensure:
+            with open_invoice_pdf(self.invoice) as handle:
+                self.assertEqual(handle.read(), b"%PDF INV-P1")
+        self.assertEqual(ensure.call_count, 2)
+
+
+def render_stub(invoice_id, path):
+    Path(path).write_bytes(b"%PDF " + str(invoice_id).encode())
+    return invoice_id, 6, 0.0
+
+
+class ExportInvoicesCommandTests(TestCase):
+
+    def setUp(self):
+        self.output = Path(self.enterContext(tempfile.TemporaryDirectory())) / "export"
+        # Render in-process: worker processes cannot see the test transaction
+        # and WeasyPrint is optional here.
+        command = "invoices.management.commands.export_invoices"
+        self.enterContext(mock.patch(f"{command}.ProcessPoolExecutor", ThreadPoolExecutor))
+        self.enterContext(mock.patch(f"{command}.init_worker"))
+        self.enterContext(mock.patch(f"{command}.connections"))
+        self.render = self.enterContext(mock.patch(f"{command}.render_to_file", side_effect=render_stub))
+
+        lead = Lead.objects.create(name="Export", event_type="Wedding", amount=1000, status=Lead.STATUS_ACCEPTED)
+        self.slash = self.add_invoice(lead.project, "INV/1", datetime(2026, 1, 10, tzinfo=timezone.utc))
+        self.space = self.add_invoice(lead.project, "INV 1", datetime(2026, 2, 10, tzinfo=timezone.utc), status="paid")
+
+    def add_invoice(self, project, number, created_at, status="pending"):
+        return Invoice.objects.create(
+            project=project, invoice_number=number, subtotal=100, total=100, status=status, created_at=created_at,
+        )
+
+    def export(self, *args):
+        call_command("export_invoices", str(self.output), *args, stdout=StringIO(), stderr=StringIO())
+        return json.loads((self.output / "manifest.json").read_text())
+
+    def test_manifest_lists_every_rendered_file(self):
+        manifest = self.export()
+
+        self.assertEqual(set(manifest), {str(self.slash.pk), str(self.space.pk)})
+        entry = manifest[str(self.space.pk)]
+        self.assertEqual(entry["invoice_number"], "INV 1")
+        self.assertEqual((entry["status"], entry["total"]), ("paid", "100.00"))
+        self.assertEqual(len(entry["sha256"]), 64)
+
+        # Numbers that sanitize to the same name still get their own file.
+        files = {entry["file"] for entry in manifest.values()}
+        self.assertEqual(len(files), 2)
+        for entry in manifest.values():
+            self.assertTrue((self.output / entry["file"]).exists())
+
+    def test_filters(self):
+        self.assertEqual(set(self.export("--status", "paid")), {str(self.space.pk)})
+        self.assertEqual(set(self.export("--no-resume", "--to", "2026-01-31")), {str(self.slash.pk)})
+        self.assertEqual(set(self.export("--no-resume", "--from", "2026-02-01")), {str(self.space.pk)})
+
+    def test_resume_skips_exported_invoices(self):
+        self.export()
+        self.assertEqual(self.render.call_count, 2)
+
+        self.export()
+        self.assertEqual(self.render.call_count, 2)
+
+        # Edited invoices and missing files are rendered again.
+        self.slash.notes = "Updated"
+        self.slash.save()
+        manifest = self.export()
+        self.assertEqual(self.render.call_count, 3)
+
+        (self.output / manifest[str(self.space.pk)]["file"]).unlink()
+        self.export()
+        self.assertEqual(self.render.call_args.args[0], self.space.pk)
+        self.assertEqual(self.render.call_count, 4)
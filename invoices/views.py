@@ -1,21 +1,27 @@
-from django.http import HttpResponse
-from django.template.loader import render_to_string
-from weasyprint import HTML
+from django.http import FileResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
 from .models import Invoice
+from .pdf import invoice_content_hash, open_invoice_pdf
 
 def download_invoice(request, invoice_id):
-    invoice = get_object_or_404(Invoice, id=invoice_id)
+    invoice = get_object_or_404(Invoice.objects.select_related("project__lead"), id=invoice_id)
 
-    html_string = render_to_string(
-        "invoice_pdf.html",
-        {"invoice": invoice}
-    )
+    # Cached PDFs are keyed by a hash of their content, which doubles as ETag
+    digest = invoice_content_hash(invoice)
+    etag = f'"{digest}"'
 
-    html = HTML(string=html_string)
-    pdf = html.write_pdf()
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
 
-    response = HttpResponse(pdf, content_type="application/pdf")
-    response['Content-Disposition'] = f'attachment; filename="{invoice.invoice_number}.pdf"'
+    response = FileResponse(
+        open_invoice_pdf(invoice, digest),
+        as_attachment=True,
+        filename=f"{invoice.invoice_number}.pdf",
+        content_type="application/pdf",
+    )
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
 
     return response
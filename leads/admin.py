@@ -1,7 +1,8 @@
 from django import forms
 from django.contrib import admin, messages
 from django.utils.safestring import mark_safe
-from .models import Lead
+from .conflicts import find_conflicts
+from .models import Lead, RevenueRollup
 
 class LeadAdminForm(forms.ModelForm):
     class Meta:
@@ -18,13 +19,14 @@ class LeadAdminForm(forms.ModelForm):
         event_start_date = cleaned_data.get('event_start_date')
 
         if status == Lead.STATUS_ACCEPTED and event_start_date:
-            # Find other accepted events on the same date
-            qs = Lead.objects.filter(
-                status=Lead.STATUS_ACCEPTED,
-                event_start_date=event_start_date
+            # Find other accepted events overlapping this booking
+            qs = find_conflicts(
+                event_start_date,
+                cleaned_data.get('event_start_session'),
+                cleaned_data.get('event_end_date'),
+                cleaned_data.get('event_end_session'),
+                exclude_id=self.instance.pk,
             )
-            if self.instance.pk:
-                qs = qs.exclude(pk=self.instance.pk)
 
             if qs.exists():
                 # Highlight the field in red
@@ -61,3 +63,10 @@ class LeadAdmin(admin.ModelAdmin):
                 kwargs2['request'] = request
                 return form(*args, **kwargs2)
         return FormWithRequest
+
+
+@admin.register(RevenueRollup)
+class RevenueRollupAdmin(admin.ModelAdmin):
+    list_display = ('month', 'status', 'event_type', 'lead_count', 'quoted', 'accepted', 'lost', 'invoiced', 'paid')
+    list_filter = ('status', 'event_type')
+    date_hierarchy = 'month'
@@ -5,4 +5,4 @@ class LeadsConfig(AppConfig):
     name = 'leads'
 
     def ready(self):
-        from . import signals
+        from . import maintenance, signals
@@ -0,0 +1,98 @@
+"""
+Booking conflict detection on half-day intervals.
+
+Every lead with an event start date occupies the inclusive range of
+half-day slots [start_slot, end_slot], stored on the row and indexed
+together with status. Two bookings conflict when their ranges overlap.
+"""
+import heapq
+from datetime import date
+
+from .models import Lead
+
+
+SESSION_OFFSETS = {Lead.SESSION_MORNING: 0, Lead.SESSION_EVENING: 1}
+SESSIONS = {offset: session for session, offset in SESSION_OFFSETS.items()}
+
+# Only confirmed bookings block the calendar.
+BLOCKING_STATUSES = (Lead.STATUS_ACCEPTED,)
+
+
+def to_slot(day, session):
+    return day.toordinal() * 2 + SESSION_OFFSETS.get(session, 0)
+
+
+def from_slot(slot):
+    """Slot -> (date, session)."""
+    return date.fromordinal(slot // 2), SESSIONS[slot % 2]
+
+
+def booking_slots(start_date, start_session, end_date=None, end_session=None):
+    """
+    Inclusive (first, last) slots of a booking, or None without a start
+    date. A missing or earlier end date means the start half-day only.
+    """
+    if not start_date:
+        return None
+    first = to_slot(start_date, start_session)
+    last = to_slot(end_date, end_session) if end_date else first
+    return first, max(first, last)
+
+
+def lead_slots(lead):
+    return booking_slots(
+        lead.event_start_date, lead.event_start_session,
+        lead.event_end_date, lead.event_end_session,
+    )
+
+
+def overlapping(first, last, statuses=BLOCKING_STATUSES):
+    """
+    Leads whose interval overlaps [first, last]. Served by the
+    (status, end_slot, start_slot) index: end_slot >= first skips history.
+    """
+    return Lead.objects.filter(status__in=statuses, end_slot__gte=first, start_slot__lte=last)
+
+
+def find_conflicts(start_date, start_session, end_date=None, end_session=None, exclude_id=None):
+    """Blocking leads overlapping the given booking (empty without a start date)."""
+    slots = booking_slots(start_date, start_session, end_date, end_session)
+    if slots is None:
+        return Lead.objects.none()
+
+    conflicts = overlapping(*slots)
+    if exclude_id:
+        conflicts = conflicts.exclude(pk=exclude_id)
+    return conflicts.order_by("start_slot", "id")
+
+
+def lead_conflicts(lead):
+    return find_conflicts(
+        lead.event_start_date, lead.event_start_session,
+        lead.event_end_date, lead.event_end_session,
+        exclude_id=lead.pk,
+    )
+
+
+def conflicts_in_range(start, end, statuses=BLOCKING_STATUSES):
+    """
+    Every pair of overlapping bookings that touch [start, end] (dates,
+    inclusive), found with one indexed query and a sweep over start slots.
+    Returns [(booking, booking, first_shared_slot, last_shared_slot)] where
+    bookings are {"id", "name", "start_slot", "end_slot"} dicts.
+    """
+    bookings = (
+        overlapping(to_slot(start, Lead.SESSION_MORNING), to_slot(end, Lead.SESSION_EVENING), statuses)
+        .order_by("start_slot", "id")
+        .values("id", "name", "start_slot", "end_slot")
+    )
+
+    pairs = []
+    active = []  # heap of (end_slot, id, booking) still open at the sweep line
+    for booking in bookings:
+        while active and active[0][0] < booking["start_slot"]:
+            heapq.heappop(active)
+        for end_slot, _, other in active:
+            pairs.append((other, booking, booking["start_slot"], min(end_slot, booking["end_slot"])))
+        heapq.heappush(active, (booking["end_slot"], booking["id"], booking))
+    return pairs
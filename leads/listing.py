@@ -0,0 +1,149 @@
+import base64
+import json
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, DecimalField, F, Q, Value
+from django.db.models.functions import Coalesce
+
+from core.search import search_filter
+from .models import Lead
+
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Fields a client may request with ?fields=. id and status are always sent.
+LIST_FIELDS = (
+    "id", "name", "phone", "email", "event_place", "event_type",
+    "amount", "advance_amount", "remaining_amount",
+    "followup_date", "event_start_date", "event_start_session",
+    "event_end_date", "event_end_session", "status", "project_code",
+)
+REQUIRED_FIELDS = ("id", "status")
+MONEY_FIELDS = ("amount", "advance_amount", "remaining_amount")
+
+# ?sort= values (prefix with "-" for descending). Nullable dates sort as the
+# earliest possible date so every row has a comparable keyset value.
+SORT_FIELDS = ("id", "name", "amount", "created_at", "event_start_date", "followup_date")
+NULL_SORT_VALUES = {"event_start_date": date.min, "followup_date": date.min}
+DEFAULT_SORT = "-id"
+
+
+# ------------------------
+# Request parsing
+# ------------------------
+def parse_fields(value):
+    if not value:
+        return LIST_FIELDS
+    requested = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = set(requested) - set(LIST_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return tuple(dict.fromkeys([*REQUIRED_FIELDS, *requested]))
+
+
+def parse_sort(value):
+    value = value or DEFAULT_SORT
+    if value.lstrip("-") not in SORT_FIELDS:
+        raise ValueError(f"Unknown sort '{value}'")
+    return value.lstrip("-"), value.startswith("-")
+
+
+def parse_limit(value):
+    return max(1, min(int(value or PAGE_SIZE), MAX_PAGE_SIZE))
+
+
+def encode_cursor(value, pk):
+    raw = json.dumps([value.isoformat() if isinstance(value, date) else str(value), pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, field):
+    """Opaque ?cursor= -> (sort value, id) typed like the sort field."""
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return Lead._meta.get_field(field).to_python(value), int(pk)
+    except (ValueError, TypeError, ValidationError):
+        raise ValueError("Invalid cursor")
+
+
+# ------------------------
+# Query building
+# ------------------------
+def filter_leads(params):
+    """
+    Apply ?q= search and ?min_amount / max_amount / start_date / end_date
+    filters (dates match event_start_date). Raises ValueError on bad input.
+    """
+    leads = search_filter(Lead.objects.all(), "lead", params.get("q", ""))
+
+    if params.get("min_amount"):
+        leads = leads.filter(amount__gte=float(params["min_amount"]))
+    if params.get("max_amount"):
+        leads = leads.filter(amount__lte=float(params["max_amount"]))
+    if params.get("start_date"):
+        leads = leads.filter(event_start_date__gte=date.fromisoformat(params["start_date"]))
+    if params.get("end_date"):
+        leads = leads.filter(event_start_date__lte=date.fromisoformat(params["end_date"]))
+    return leads
+
+
+def sort_expression(field):
+    if field in NULL_SORT_VALUES:
+        return Coalesce(field, Value(NULL_SORT_VALUES[field]))
+    return F(field)
+
+
+def status_page(leads, status, fields, sort, limit, cursor=None):
+    """
+    One keyset page of a status column, built from .values() rows.
+    Returns {"results": [...], "next_cursor": str or None}.
+    """
+    field, descending = sort
+    leads = leads.filter(status=status).annotate(sort_key=sort_expression(field))
+
+    if cursor:
+        value, pk = decode_cursor(cursor, field)
+        op = "lt" if descending else "gt"
+        leads = leads.filter(
+            Q(**{f"sort_key__{op}": value}) | Q(sort_key=value, **{f"id__{op}": pk})
+        )
+
+    columns = [name for name in fields if name != "remaining_amount"]
+    if "remaining_amount" in fields:
+        leads = leads.annotate(remaining_amount=F("amount") - Coalesce(
+            "advance_amount", Value(0), output_field=DecimalField(max_digits=10, decimal_places=2)
+        ))
+        columns.append("remaining_amount")
+
+    ordering = ["-sort_key", "-id"] if descending else ["sort_key", "id"]
+    rows = list(leads.order_by(*ordering).values("sort_key", *columns)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "results": [serialize_row(row, fields) for row in rows],
+        "next_cursor": encode_cursor(rows[-1]["sort_key"], rows[-1]["id"]) if has_more else None,
+    }
+
+
+def serialize_row(row, fields):
+    data = {}
+    for name in fields:
+        value = row[name]
+        if name in MONEY_FIELDS:
+            data[name] = float(value or 0)
+        elif isinstance(value, date):
+            data[name] = value.isoformat()
+        else:
+            data[name] = "" if value is None else value
+    return data
+
+
+def status_counts(leads):
+    """{status: matching lead count} for every column, in one grouped query."""
+    counts = dict.fromkeys((key for key, _ in Lead.STATUS_CHOICES), 0)
+    for row in leads.order_by().values("status").annotate(total=Count("id")):
+        counts[row["status"]] = row["total"]
+    return counts
@@ -0,0 +1,15 @@
+from datetime import date
+
+from core.maintenance import batched, maintenance_task
+from .models import Lead
+from .revenue import move_leads_to_status
+
+
+@maintenance_task("expire_past_leads", interval=60 * 60)
+def expire_past_leads(batch_size):
+    """Move NEW / FOLLOW leads whose event is over to LOST."""
+    stale = Lead.objects.filter(
+        status__in=[Lead.STATUS_NEW, Lead.STATUS_FOLLOW],
+        event_end_date__lt=date.today(),
+    )
+    return batched(stale, batch_size, lambda leads: move_leads_to_status(leads, Lead.STATUS_LOST))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from leads.revenue import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recount the revenue rollup table from leads and invoices."
+
+    def handle(self, *args, **options):
+        count = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} revenue rollup row(s)."))
@@ -0,0 +1,74 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:39
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+MEASURES = ('lead_count', 'quoted', 'accepted', 'lost', 'invoiced', 'paid')
+
+
+def backfill_rollups(apps, schema_editor):
+    Lead = apps.get_model('leads', 'Lead')
+    Invoice = apps.get_model('invoices', 'Invoice')
+    RevenueRollup = apps.get_model('leads', 'RevenueRollup')
+
+    def bucket(created_at, status, event_type):
+        if timezone.is_aware(created_at):
+            created_at = timezone.localtime(created_at)
+        return created_at.date().replace(day=1), status, event_type or ''
+
+    rollups = {}
+    for created_at, status, event_type, amount in Lead.objects.values_list(
+        'created_at', 'status', 'event_type', 'amount'
+    ).iterator():
+        row = rollups.setdefault(bucket(created_at, status, event_type), dict.fromkeys(MEASURES, 0))
+        row['lead_count'] += 1
+        row['quoted'] += amount
+        if status == 'ACCEPTED':
+            row['accepted'] += amount
+        elif status == 'LOST':
+            row['lost'] += amount
+
+    for created_at, status, event_type, total, paid in Invoice.objects.values_list(
+        'project__lead__created_at', 'project__lead__status', 'project__lead__event_type',
+        'total', 'paid_amount',
+    ).iterator():
+        row = rollups.setdefault(bucket(created_at, status, event_type), dict.fromkeys(MEASURES, 0))
+        row['invoiced'] += total
+        row['paid'] += paid
+
+    RevenueRollup.objects.bulk_create([
+        RevenueRollup(month=month, status=status, event_type=event_type, **values)
+        for (month, status, event_type), values in rollups.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0006_lead_project_code'),
+        ('invoices', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('status', models.CharField(choices=[('NEW', 'New'), ('FOLLOW', 'Follow'), ('ACCEPTED', 'Accepted'), ('LOST', 'Lost')], max_length=10)),
+                ('event_type', models.CharField(blank=True, default='', max_length=100)),
+                ('lead_count', models.IntegerField(default=0)),
+                ('quoted', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('accepted', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('lost', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('invoiced', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'ordering': ['month', 'status', 'event_type'],
+                'constraints': [models.UniqueConstraint(fields=('month', 'status', 'event_type'), name='unique_revenue_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
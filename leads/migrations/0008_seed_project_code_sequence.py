@@ -0,0 +1,38 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:05
+
+from django.db import migrations
+
+
+# Frozen copies of leads.models.PROJECT_CODE_*.
+SEQUENCE = 'project_code'
+PREFIX = 'AK'
+WIDTH = 3
+
+
+def seed_sequence(apps, schema_editor):
+    """Start the sequence after the highest numeric code already issued."""
+    Lead = apps.get_model('leads', 'Lead')
+    CodeSequence = apps.get_model('core', 'CodeSequence')
+
+    last_value = 0
+    for code in Lead.objects.filter(project_code__startswith=PREFIX).values_list('project_code', flat=True):
+        number = code[len(PREFIX):]
+        if number.isdigit():
+            last_value = max(last_value, int(number))
+
+    CodeSequence.objects.update_or_create(
+        name=SEQUENCE,
+        defaults={'prefix': PREFIX, 'width': WIDTH, 'last_value': last_value},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0007_revenue_rollup'),
+        ('core', '0004_code_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_sequence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:48
+
+from django.db import migrations, models
+
+
+def backfill_slots(apps, schema_editor):
+    """Frozen copy of leads.conflicts.booking_slots."""
+    Lead = apps.get_model('leads', 'Lead')
+
+    def to_slot(day, session):
+        return day.toordinal() * 2 + (1 if session == 'EVE' else 0)
+
+    leads = []
+    for lead in Lead.objects.exclude(event_start_date=None).only(
+        'event_start_date', 'event_start_session', 'event_end_date', 'event_end_session'
+    ).iterator():
+        lead.start_slot = to_slot(lead.event_start_date, lead.event_start_session)
+        lead.end_slot = lead.start_slot
+        if lead.event_end_date:
+            lead.end_slot = max(lead.start_slot, to_slot(lead.event_end_date, lead.event_end_session))
+        leads.append(lead)
+
+    Lead.objects.bulk_update(leads, ['start_slot', 'end_slot'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0008_seed_project_code_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='end_slot',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='start_slot',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['status', 'end_slot', 'start_slot'], name='leads_booking_interval'),
+        ),
+        migrations.RunPython(backfill_slots, migrations.RunPython.noop),
+    ]
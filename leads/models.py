@@ -1,6 +1,15 @@
 from django.db import models
 from django.utils import timezone
 
+from core.sequences import next_code
+
+
+# Defaults for the project code sequence; once it exists, prefix and width
+# are edited on its CodeSequence row.
+PROJECT_CODE_SEQUENCE = 'project_code'
+PROJECT_CODE_PREFIX = 'AK'
+PROJECT_CODE_WIDTH = 3
+
 
 class Lead(models.Model):
     project_code = models.CharField(max_length=10, unique=True, null=True, blank=True)
@@ -48,26 +57,61 @@ class Lead(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_NEW)
     created_at = models.DateTimeField(default=timezone.now)
 
+    # Booked half-day interval, derived from the event dates (see leads.conflicts)
+    start_slot = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    end_slot = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
+    SLOT_SOURCE_FIELDS = ('event_start_date', 'event_start_session', 'event_end_date', 'event_end_session')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'end_slot', 'start_slot'], name='leads_booking_interval'),
+        ]
+
     def __str__(self):
         return self.name
 
     def save(self, *args, **kwargs):
         if not self.project_code:
-            last_code = (
-                Lead.objects
-                .exclude(project_code__isnull=True)
-                .order_by('-project_code')
-                .values_list('project_code', flat=True)
-                .first()
+            self.project_code = next_code(
+                PROJECT_CODE_SEQUENCE, prefix=PROJECT_CODE_PREFIX, width=PROJECT_CODE_WIDTH,
             )
 
-            if last_code and last_code.startswith("AK"):
-                last_number = int(last_code[2:])
-                new_number = last_number + 1
-            else:
-                new_number = 1
+        from .conflicts import lead_slots
 
-            self.project_code = f"AK{new_number:03d}"
+        self.start_slot, self.end_slot = lead_slots(self) or (None, None)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.SLOT_SOURCE_FIELDS):
+            kwargs['update_fields'] = {*update_fields, 'start_slot', 'end_slot'}
 
         super().save(*args, **kwargs)
 
+
+
+class RevenueRollup(models.Model):
+    """
+    Precomputed revenue per (month, lead status, event type).
+
+    Maintained incrementally by leads.revenue from Lead and Invoice signals;
+    `manage.py rebuild_revenue_rollups` recounts it from scratch. Invoice
+    amounts are filed under the bucket of the invoiced project's lead.
+    """
+    month = models.DateField()
+    status = models.CharField(max_length=10, choices=Lead.STATUS_CHOICES)
+    event_type = models.CharField(max_length=100, blank=True, default='')
+
+    lead_count = models.IntegerField(default=0)
+    quoted = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    accepted = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    lost = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    invoiced = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ['month', 'status', 'event_type']
+        constraints = [
+            models.UniqueConstraint(fields=['month', 'status', 'event_type'], name='unique_revenue_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.status} {self.event_type or '-'}"
@@ -0,0 +1,272 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from core.notifications import invalidate_notifications
+from core.search import reindex
+from invoices.models import Invoice
+from .models import Lead, RevenueRollup
+
+
+# Measures stored on every RevenueRollup row.
+MEASURES = ("lead_count", "quoted", "accepted", "lost", "invoiced", "paid")
+
+# ?group= value -> RevenueRollup field.
+REPORT_GROUPS = ("month", "status", "event_type")
+
+LEAD_STATE_FIELDS = ("created_at", "status", "event_type", "amount")
+
+ZERO = Decimal("0")
+
+
+# ------------------------
+# Buckets and contributions
+# ------------------------
+def month_of(value):
+    """First day of the (local) month `value` falls in."""
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date().replace(day=1)
+
+
+def lead_bucket(state):
+    """(month, status, event_type) for a lead state dict."""
+    return month_of(state["created_at"]), state["status"], state["event_type"] or ""
+
+
+def lead_state(lead):
+    return {field: getattr(lead, field) for field in LEAD_STATE_FIELDS}
+
+
+def lead_contribution(state, invoiced=ZERO, paid=ZERO):
+    amount = Decimal(state["amount"] or 0)
+    return {
+        "lead_count": 1,
+        "quoted": amount,
+        "accepted": amount if state["status"] == Lead.STATUS_ACCEPTED else ZERO,
+        "lost": amount if state["status"] == Lead.STATUS_LOST else ZERO,
+        "invoiced": invoiced,
+        "paid": paid,
+    }
+
+
+def invoice_totals(lead_id):
+    """(invoiced, paid) over every invoice of the lead's project."""
+    totals = Invoice.objects.filter(project__lead_id=lead_id).aggregate(
+        invoiced=Sum("total"), paid=Sum("paid_amount"),
+    )
+    return totals["invoiced"] or ZERO, totals["paid"] or ZERO
+
+
+def _add(deltas, bucket, values, sign):
+    bucket_deltas = deltas.setdefault(bucket, dict.fromkeys(MEASURES, 0))
+    for measure, value in values.items():
+        bucket_deltas[measure] += sign * value
+
+
+# ------------------------
+# Incremental updates
+# ------------------------
+def apply_deltas(deltas):
+    """
+    Add {bucket: {measure: delta}} to the rollup rows with F() updates.
+    Rows are only created for non-negative deltas.
+    """
+    for (month, status, event_type), values in deltas.items():
+        values = {measure: value for measure, value in values.items() if value}
+        if not values:
+            continue
+
+        rows = RevenueRollup.objects.filter(month=month, status=status, event_type=event_type)
+        increments = {measure: F(measure) + value for measure, value in values.items()}
+        if rows.update(**increments) or any(value < 0 for value in values.values()):
+            continue
+
+        try:
+            with transaction.atomic():
+                RevenueRollup.objects.create(month=month, status=status, event_type=event_type, **values)
+        except IntegrityError:
+            rows.update(**increments)
+
+
+def previous_lead_state(lead):
+    """Stored state of a lead about to be saved, or None for a new lead."""
+    if lead.pk is None:
+        return None
+    return Lead.objects.filter(pk=lead.pk).values(*LEAD_STATE_FIELDS).first()
+
+
+def record_lead_change(lead_id, previous, current):
+    """
+    Move one lead's contribution between buckets. `previous` and `current`
+    are lead state dicts, or None when the lead was created / deleted.
+    Invoice totals are only looked up when the bucket actually changes.
+    """
+    invoiced = paid = ZERO
+    if previous and current and lead_bucket(previous) != lead_bucket(current):
+        invoiced, paid = invoice_totals(lead_id)
+
+    deltas = {}
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is not None:
+            _add(deltas, lead_bucket(state), lead_contribution(state, invoiced, paid), sign)
+    apply_deltas(deltas)
+
+
+def previous_invoice_state(invoice):
+    if invoice.pk is None:
+        return None
+    return Invoice.objects.filter(pk=invoice.pk).values("project_id", "total", "paid_amount").first()
+
+
+def invoice_state(invoice):
+    return {"project_id": invoice.project_id, "total": invoice.total, "paid_amount": invoice.paid_amount}
+
+
+def record_invoice_change(previous, current):
+    """
+    File an invoice write under its lead's bucket. `previous` and `current`
+    are invoice state dicts, or None when the invoice was created / deleted.
+    """
+    if previous == current:
+        return
+
+    states = [(state, sign) for state, sign in ((previous, -1), (current, 1)) if state]
+    leads = {
+        row["project__id"]: row
+        for row in Lead.objects.filter(
+            project__id__in={state["project_id"] for state, _ in states}
+        ).values("project__id", "created_at", "status", "event_type")
+    }
+
+    deltas = {}
+    for state, sign in states:
+        lead = leads.get(state["project_id"])
+        if lead is None:
+            continue
+        values = {"invoiced": Decimal(state["total"] or 0), "paid": Decimal(state["paid_amount"] or 0)}
+        _add(deltas, lead_bucket(lead), values, sign)
+    apply_deltas(deltas)
+
+
+@transaction.atomic
+def move_leads_to_status(leads, status):
+    """
+    queryset.update(status=...) for many leads that keeps the rollups in
+    step, since bulk updates bypass the save signals. Returns the row count.
+    """
+    money = DecimalField(max_digits=14, decimal_places=2)
+    rows = list(
+        leads.exclude(status=status)
+        .values("id", *LEAD_STATE_FIELDS)
+        .annotate(
+            invoiced=Coalesce(Sum("project__invoices__total"), Value(ZERO), output_field=money),
+            paid=Coalesce(Sum("project__invoices__paid_amount"), Value(ZERO), output_field=money),
+        )
+        .order_by()
+    )
+    if not rows:
+        return 0
+
+    deltas = {}
+    for row in rows:
+        _add(deltas, lead_bucket(row), lead_contribution(row, row["invoiced"], row["paid"]), -1)
+        moved = dict(row, status=status)
+        _add(deltas, lead_bucket(moved), lead_contribution(moved, row["invoiced"], row["paid"]), 1)
+
+    moved = Lead.objects.filter(pk__in=[row["id"] for row in rows])
+    updated = moved.update(status=status)
+    apply_deltas(deltas)
+    # Status is part of the lead search document and the notification feed.
+    reindex("lead", moved)
+    invalidate_notifications()
+    return updated
+
+
+# ------------------------
+# Full rebuild
+# ------------------------
+@transaction.atomic
+def rebuild_rollups():
+    """
+    Recount every rollup row with two grouped aggregates (leads, invoices).
+    Returns the number of rows written.
+    """
+    month = TruncMonth("created_at", output_field=DateField())
+    buckets = {}
+
+    lead_rows = (
+        Lead.objects.annotate(month=month)
+        .values("month", "status", "event_type")
+        .annotate(
+            lead_count=Count("id"),
+            quoted=Sum("amount"),
+            accepted=Sum("amount", filter=Q(status=Lead.STATUS_ACCEPTED)),
+            lost=Sum("amount", filter=Q(status=Lead.STATUS_LOST)),
+        )
+        .order_by()
+    )
+    for row in lead_rows:
+        bucket = (row["month"], row["status"], row["event_type"] or "")
+        _add(buckets, bucket, {measure: row[measure] or 0 for measure in MEASURES[:4]}, 1)
+
+    invoice_rows = (
+        Invoice.objects.annotate(month=TruncMonth("project__lead__created_at", output_field=DateField()))
+        .values("month", lead_status=F("project__lead__status"), lead_event_type=F("project__lead__event_type"))
+        .annotate(invoiced=Sum("total"), paid=Sum("paid_amount"))
+        .order_by()
+    )
+    for row in invoice_rows:
+        bucket = (row["month"], row["lead_status"], row["lead_event_type"] or "")
+        _add(buckets, bucket, {"invoiced": row["invoiced"] or 0, "paid": row["paid"] or 0}, 1)
+
+    RevenueRollup.objects.all().delete()
+    RevenueRollup.objects.bulk_create([
+        RevenueRollup(month=month, status=status, event_type=event_type, **values)
+        for (month, status, event_type), values in buckets.items()
+    ], batch_size=500)
+    return len(buckets)
+
+
+# ------------------------
+# Reading
+# ------------------------
+def revenue_totals(rollups=None):
+    """Sum rollup rows (all of them by default) into {measure: total}."""
+    rollups = RevenueRollup.objects.all() if rollups is None else rollups
+    totals = rollups.aggregate(**{measure: Sum(measure) for measure in MEASURES})
+    return {measure: totals[measure] or 0 for measure in MEASURES}
+
+
+def revenue_report(group, start=None, end=None):
+    """
+    Rollup rows summed per `group` (one of REPORT_GROUPS), optionally limited
+    to months in [start, end]. Returns (rows, totals).
+    """
+    if group not in REPORT_GROUPS:
+        raise ValueError(f"Unknown report group '{group}'")
+
+    rollups = RevenueRollup.objects.all()
+    if start:
+        rollups = rollups.filter(month__gte=start)
+    if end:
+        rollups = rollups.filter(month__lte=end)
+
+    rows = list(
+        rollups.values(group)
+        .annotate(**{measure: Sum(measure) for measure in MEASURES})
+        .order_by(group)
+    )
+    return rows, revenue_totals(rollups)
+
+
+def parse_month(value):
+    """'YYYY-MM' -> first day of that month, or None when empty."""
+    if not value:
+        return None
+    year, month = value.split("-")[:2]
+    return date(int(year), int(month), 1)
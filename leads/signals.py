@@ -1,6 +1,14 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from core.notifications import invalidate_notifications
+from core.search import register as register_search
 from .models import Lead
+from .revenue import lead_state, previous_lead_state, record_lead_change
+
+SEARCH_FIELDS = ('name', 'phone', 'email', 'event_type', 'event_place', 'status', 'project_code')
+
+register_search('lead', Lead, SEARCH_FIELDS)
+
 
 @receiver(post_save, sender=Lead)
 def create_project_when_lead_accepted(sender, instance, **kwargs):
@@ -23,3 +31,29 @@ def create_project_when_lead_accepted(sender, instance, **kwargs):
                     }
         )
 
+
+@receiver(pre_save, sender=Lead)
+def remember_lead_revenue(sender, instance, raw=False, **kwargs):
+    instance._revenue_previous = None if raw else previous_lead_state(instance)
+
+
+@receiver(post_save, sender=Lead)
+def update_lead_revenue(sender, instance, raw=False, **kwargs):
+    """
+    Move the lead's amounts between revenue rollup buckets.
+    """
+    if not raw:
+        record_lead_change(instance.pk, getattr(instance, '_revenue_previous', None), lead_state(instance))
+
+
+@receiver(post_delete, sender=Lead)
+def release_lead_revenue(sender, instance, **kwargs):
+    # Cascaded invoices were already subtracted by their own post_delete.
+    record_lead_change(instance.pk, lead_state(instance), None)
+
+
+@receiver(post_save, sender=Lead)
+@receiver(post_delete, sender=Lead)
+def refresh_notifications(sender, instance, **kwargs):
+    """Today's notification feed is built from leads; drop the cached copy."""
+    invalidate_notifications()
@@ -1,3 +1,258 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from accounts.models import User
+from core.maintenance import run_task
+from core.models import CodeSequence
+from core.search import search, search_filter
+from invoices.models import Invoice
+from .conflicts import conflicts_in_range, find_conflicts
+from .models import Lead, RevenueRollup
+from .revenue import MEASURES, move_leads_to_status, rebuild_rollups, revenue_totals
+
+
+class RevenueRollupTests(TestCase):
+
+    def snapshot(self):
+        return sorted(RevenueRollup.objects.values_list("month", "status", "event_type", *MEASURES))
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot()
+        rebuild_rollups()
+        rebuilt = self.snapshot()
+        # A rebuild drops buckets that were emptied incrementally.
+        self.assertEqual([row for row in incremental if row[3]], rebuilt)
+
+    def test_signals_match_full_rebuild(self):
+        wedding = Lead.objects.create(name="Wedding", event_type="Wedding", amount=1000)
+        Lead.objects.create(name="Portrait", event_type="Portrait", amount=200)
+
+        wedding.status = Lead.STATUS_ACCEPTED
+        wedding.save(update_fields=["status"])
+        invoice = Invoice.objects.create(
+            project=wedding.project, invoice_number="INV-R1", subtotal=600, total=600, paid_amount=100,
+        )
+        invoice.paid_amount = 600
+        invoice.save()
+        self.assertMatchesRebuild()
+
+        wedding.event_type = "Reception"
+        wedding.save()
+        self.assertMatchesRebuild()
+
+        wedding.delete()
+        self.assertMatchesRebuild()
+
+        totals = revenue_totals()
+        self.assertEqual((totals["lead_count"], totals["quoted"], totals["invoiced"]), (1, 200, 0))
+
+    def test_bulk_status_move_keeps_rollups(self):
+        Lead.objects.create(name="Stale", amount=300, event_end_date=date.today() - timedelta(days=1))
+        Lead.objects.create(name="Upcoming", amount=500, event_end_date=date.today() + timedelta(days=1))
+
+        moved = move_leads_to_status(Lead.objects.filter(event_end_date__lt=date.today()), Lead.STATUS_LOST)
+
+        self.assertEqual(moved, 1)
+        self.assertEqual(revenue_totals()["lost"], 300)
+        self.assertMatchesRebuild()
+
+
+class ExpirePastLeadsTests(TestCase):
+
+    def test_sweep_runs_in_batches_and_records_rows(self):
+        yesterday = date.today() - timedelta(days=1)
+        for index in range(5):
+            Lead.objects.create(name=f"Stale {index}", event_end_date=yesterday)
+        Lead.objects.create(name="Accepted", status=Lead.STATUS_ACCEPTED, event_end_date=yesterday)
+
+        run = run_task("expire_past_leads", batch_size=2)
+
+        self.assertEqual((run.rows_touched, run.error), (5, ""))
+        self.assertEqual(Lead.objects.filter(status=Lead.STATUS_LOST).count(), 5)
+        self.assertEqual(run_task("expire_past_leads").rows_touched, 0)
+
+    def test_lead_accepted_before_its_batch_is_written_is_kept(self):
+        yesterday = date.today() - timedelta(days=1)
+        leads = [Lead.objects.create(name=f"Stale {index}", event_end_date=yesterday) for index in range(4)]
+
+        def accept_then_move(batch, status):
+            # The booking is accepted after the sweep read this batch's ids.
+            if leads[3].pk in batch.values_list("pk", flat=True):
+                Lead.objects.filter(pk=leads[3].pk).update(status=Lead.STATUS_ACCEPTED)
+            return move_leads_to_status(batch, status)
+
+        with mock.patch("leads.maintenance.move_leads_to_status", side_effect=accept_then_move):
+            run = run_task("expire_past_leads", batch_size=2)
+
+        self.assertEqual(run.rows_touched, 3)
+        leads[3].refresh_from_db()
+        self.assertEqual(leads[3].status, Lead.STATUS_ACCEPTED)
+
+    def test_failed_sweep_records_committed_batches(self):
+        yesterday = date.today() - timedelta(days=1)
+        for index in range(4):
+            Lead.objects.create(name=f"Stale {index}", event_end_date=yesterday)
+
+        calls = []
+
+        def fail_second_batch(batch, status):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("database went away")
+            return move_leads_to_status(batch, status)
+
+        with mock.patch("leads.maintenance.move_leads_to_status", side_effect=fail_second_batch):
+            with self.assertLogs("core.maintenance", "ERROR"):
+                run = run_task("expire_past_leads", batch_size=2)
+
+        self.assertEqual(run.rows_touched, 2)
+        self.assertIn("database went away", run.error)
+        self.assertEqual(Lead.objects.filter(status=Lead.STATUS_LOST).count(), 2)
+
+    def test_dashboard_does_not_write(self):
+        Lead.objects.create(name="Stale", event_end_date=date.today() - timedelta(days=1))
+        self.client.force_login(User.objects.create_user(username="viewer", password="pw"))
+
+        self.client.get("/leads/")
+
+        self.assertFalse(Lead.objects.filter(status=Lead.STATUS_LOST).exists())
+
+
+class ProjectCodeSequenceTests(TransactionTestCase):
+
+    def test_codes_keep_counting_past_padding_width(self):
+        CodeSequence.objects.create(name="project_code", prefix="AK", width=3, last_value=998)
+
+        codes = [Lead.objects.create(name=f"Lead {index}").project_code for index in range(3)]
+
+        self.assertEqual(codes, ["AK999", "AK1000", "AK1001"])
+
+    def test_concurrent_add_lead_allocates_unique_codes(self):
+        User.objects.create_user(username="desk", password="pw")
+        threads, per_thread = 4, 5
+
+        def add_leads(worker):
+            try:
+                client = self.client_class()
+                client.login(username="desk", password="pw")
+                return [
+                    client.post(reverse("leads:add_lead"), {"name": f"Lead {worker}-{index}"}).status_code
+                    for index in range(per_thread)
+                ]
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            statuses = [status for batch in pool.map(add_leads, range(threads)) for status in batch]
+
+        self.assertEqual(statuses, [200] * threads * per_thread)
+        codes = list(Lead.objects.values_list("project_code", flat=True))
+        self.assertEqual(len(codes), threads * per_thread)
+        self.assertEqual(len(set(codes)), len(codes))
+        self.assertEqual(CodeSequence.objects.get(name="project_code").last_value, len(codes))
+
+
+class LeadsListPaginationTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user(username="kanban", password="pw"))
+        for index in range(7):
+            Lead.objects.create(name=f"Lead {index}", amount=100 * (index % 3))
+
+    def test_cursor_pages_cover_column_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {"status": Lead.STATUS_NEW, "sort": "-amount", "limit": 3, "fields": "amount"}
+            if cursor:
+                params["cursor"] = cursor
+            data = self.client.get(reverse("leads:leads_list"), params).json()
+            self.assertEqual(set(data["results"][0]), {"id", "status", "amount"})
+            seen += [row["id"] for row in data["results"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(seen, list(
+            Lead.objects.order_by("-amount", "-id").values_list("id", flat=True)
+        ))
+
+    def test_board_query_count_does_not_grow(self):
+        url = reverse("leads:leads_list")
+        with self.assertNumQueries(7):  # session, user, four columns, counts
+            data = self.client.get(url, {"limit": 2}).json()
+        self.assertEqual(data["counts"][Lead.STATUS_NEW], 7)
+        self.assertEqual(len(data["columns"][Lead.STATUS_NEW]["results"]), 2)
+
+
+class LeadSearchTests(TestCase):
+
+    def setUp(self):
+        self.anita = Lead.objects.create(name="Anita Raman", phone="9840012345", event_place="Chennai")
+        self.arun = Lead.objects.create(name="Arun", event_type="Wedding", event_place="Madurai")
+
+    def matches(self, query):
+        return set(search_filter(Lead.objects.all(), "lead", query).values_list("name", flat=True))
+
+    def test_terms_match_across_fields(self):
+        self.assertEqual(self.matches("chennai 98400"), {"Anita Raman"})
+        self.assertEqual(self.matches("WEDD"), {"Arun"})
+        self.assertEqual(self.matches("ni"), {"Anita Raman"})  # shorter than a trigram
+        self.assertEqual(list(search(Lead.objects.all(), "lead", "madurai")), [self.arun])
+
+    def test_index_follows_saves_deletes_and_bulk_moves(self):
+        self.arun.event_place = "Coimbatore"
+        self.arun.save()
+        self.assertEqual(self.matches("madurai"), set())
+        self.assertEqual(self.matches("coimbatore"), {"Arun"})
+
+        move_leads_to_status(Lead.objects.filter(pk=self.anita.pk), Lead.STATUS_LOST)
+        self.assertEqual(self.matches("lost"), {"Anita Raman"})
+
+        self.anita.delete()
+        self.assertEqual(self.matches("chennai"), set())
+
+
+class BookingConflictTests(TestCase):
+
+    def book(self, name, start, start_session, end=None, end_session=Lead.SESSION_EVENING):
+        return Lead.objects.create(
+            name=name, status=Lead.STATUS_ACCEPTED,
+            event_start_date=start, event_start_session=start_session,
+            event_end_date=end, event_end_session=end_session,
+        )
+
+    def test_multi_day_overlaps_are_found(self):
+        day = date(2026, 11, 20)
+        wedding = self.book("Wedding", day, Lead.SESSION_EVENING, day + timedelta(days=2), Lead.SESSION_MORNING)
+
+        def conflicts(start, session, end=None, end_session=Lead.SESSION_EVENING):
+            return list(find_conflicts(start, session, end, end_session))
+
+        self.assertEqual(conflicts(day + timedelta(days=1), Lead.SESSION_MORNING), [wedding])
+        self.assertEqual(conflicts(day - timedelta(days=1), Lead.SESSION_MORNING, day, Lead.SESSION_EVENING), [wedding])
+        self.assertEqual(conflicts(day, Lead.SESSION_MORNING), [])
+        self.assertEqual(conflicts(day + timedelta(days=2), Lead.SESSION_EVENING), [])
+
+    def test_range_scan_pairs_every_overlap(self):
+        day = date(2026, 12, 1)
+        long_event = self.book("Long", day, Lead.SESSION_MORNING, day + timedelta(days=3))
+        first = self.book("First", day, Lead.SESSION_EVENING)
+        last = self.book("Last", day + timedelta(days=3), Lead.SESSION_MORNING)
+        self.book("Elsewhere", day + timedelta(days=10), Lead.SESSION_MORNING)
+
+        pairs = {
+            (a["id"], b["id"]) for a, b, _, _ in conflicts_in_range(day, day + timedelta(days=30))
+        }
+        self.assertEqual(pairs, {(long_event.id, first.id), (long_event.id, last.id)})
+
+    def test_slots_follow_partial_saves(self):
+        lead = self.book("Moved", date(2026, 10, 1), Lead.SESSION_MORNING)
+        lead.event_start_date = date(2026, 10, 5)
+        lead.save(update_fields=["event_start_date"])
+        self.assertEqual(list(find_conflicts(date(2026, 10, 5), Lead.SESSION_MORNING)), [lead])
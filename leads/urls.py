@@ -11,7 +11,9 @@ urlpatterns = [
     path('delete/', views.delete_lead, name='delete_lead'),
     path('update-status/<int:lead_id>/', views.update_lead_status, name='update_status'),
     path('amounts/', views.lead_amounts, name='lead_amounts'),
+    path('revenue/', views.revenue_report_view, name='revenue_report'),
     path('check-conflict/', views.check_conflict, name='check_conflict'),
+    path('conflicts/', views.booking_conflicts, name='booking_conflicts'),
     # path("search/", views.search_leads, name="search_leads"),
 
 
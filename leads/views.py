@@ -1,34 +1,27 @@
 from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.http import require_POST
-from django.db.models import Sum
+from django.views.decorators.http import require_GET, require_POST
 from datetime import date
 import json
 
+from core.search import search
+from .conflicts import conflicts_in_range, find_conflicts, from_slot, lead_conflicts
+from .listing import filter_leads, parse_fields, parse_limit, parse_sort, status_counts, status_page
 from .models import Lead
+from .revenue import MEASURES, parse_month, revenue_report, revenue_totals
 
 
 # ================== DASHBOARD ==================
 @login_required
 def leads_dashboard(request):
-    today = date.today()
-
-    # AUTO MOVE FOLLOW / NEW → LOST if event is over
-    Lead.objects.filter(
-        status__in=[Lead.STATUS_NEW, Lead.STATUS_FOLLOW],
-        event_end_date__lt=today
-    ).update(status=Lead.STATUS_LOST)
-
+    # Past events are moved to LOST by the expire_past_leads maintenance task.
+    totals = revenue_totals()
     return render(request, 'leads.html', {
-        'total_leads': Lead.objects.count(),
-        'total_amount': float(Lead.objects.aggregate(total=Sum('amount'))['total'] or 0),
-        'accepted_amount': float(
-            Lead.objects.filter(status=Lead.STATUS_ACCEPTED).aggregate(total=Sum('amount'))['total'] or 0
-        ),
-        'lost_amount': float(
-            Lead.objects.filter(status=Lead.STATUS_LOST).aggregate(total=Sum('amount'))['total'] or 0
-        ),
+        'total_leads': totals['lead_count'],
+        'total_amount': float(totals['quoted']),
+        'accepted_amount': float(totals['accepted']),
+        'lost_amount': float(totals['lost']),
         'active_page': 'leads',
         'status_choices': Lead.STATUS_CHOICES,
     })
@@ -37,44 +30,36 @@ def leads_dashboard(request):
 # ================== LIST ==================
 @login_required
 def leads_list(request):
-    query = request.GET.get("q", "").strip()
-
-    leads = Lead.objects.all().order_by("-id")
-
-    if query:
-        leads = leads.filter(
-            Q(name__icontains=query) |
-            Q(phone__icontains=query) |
-            Q(email__icontains=query) |
-            Q(event_type__icontains=query) |
-            Q(event_place__icontains=query) |
-            Q(status__icontains=query)
-        )
-
-    data = {key: [] for key, _ in Lead.STATUS_CHOICES}
-
-    for lead in leads:
-        data[lead.status].append({
-            "id": lead.id,
-            "name": lead.name,
-            "phone": lead.phone or "",
-            "email": lead.email or "",
-            "event_place": lead.event_place or "",
-            "event_type": lead.event_type or "",
-            "amount": float(lead.amount),
-            "advance_amount": float(lead.advance_amount or 0),
-            "remaining_amount": float(lead.amount - (lead.advance_amount or 0)),
-            "followup_date": lead.followup_date.isoformat() if lead.followup_date else "",
-            "event_start_date": lead.event_start_date.isoformat() if lead.event_start_date else "",
-            "event_start_session": lead.event_start_session,
-            "event_end_date": lead.event_end_date.isoformat() if lead.event_end_date else "",
-            "event_end_session": lead.event_end_session,
-            "status": lead.status,
-        })
+    """
+    Kanban columns as JSON, keyset-paginated per status.
+
+    No ?status: first page of every column plus per-column counts.
+    ?status=NEW&cursor=<next_cursor>: the next page of one column.
+    Also ?sort=-id|name|amount|created_at|event_start_date|followup_date,
+    ?limit=, ?fields=id,name,..., ?q=, ?min_amount=, ?max_amount=,
+    ?start_date=, ?end_date=.
+    """
+    try:
+        leads = filter_leads(request.GET)
+        fields = parse_fields(request.GET.get("fields"))
+        sort = parse_sort(request.GET.get("sort"))
+        limit = parse_limit(request.GET.get("limit"))
 
-    return JsonResponse(data)
+        status = request.GET.get("status")
+        if status:
+            if status not in dict(Lead.STATUS_CHOICES):
+                raise ValueError(f"Unknown status '{status}'")
+            page = status_page(leads, status, fields, sort, limit, request.GET.get("cursor"))
+            return JsonResponse({"success": True, "status": status, **page})
 
+        columns = {
+            key: status_page(leads, key, fields, sort, limit)
+            for key, _ in Lead.STATUS_CHOICES
+        }
+    except ValueError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
 
+    return JsonResponse({"success": True, "columns": columns, "counts": status_counts(leads)})
 
 
 # ================== ADD ==================
@@ -164,11 +149,7 @@ def update_lead_status(request, lead_id):
         lead = get_object_or_404(Lead, id=lead_id)
 
         if new_status == Lead.STATUS_ACCEPTED and lead.event_start_date and not override:
-            conflicts = Lead.objects.filter(
-                status=Lead.STATUS_ACCEPTED,
-                event_start_date=lead.event_start_date,
-                event_start_session=lead.event_start_session
-            ).exclude(id=lead.id)
+            conflicts = lead_conflicts(lead)
 
             if conflicts.exists():
                 return JsonResponse({
@@ -189,11 +170,50 @@ def update_lead_status(request, lead_id):
 # ================== AMOUNTS ==================
 @login_required
 def lead_amounts(request):
+    totals = revenue_totals()
+    return JsonResponse({
+        'total_leads': totals['lead_count'],
+        'total_amount': float(totals['quoted']),
+        'accepted': float(totals['accepted']),
+        'lost': float(totals['lost']),
+        'invoiced': float(totals['invoiced']),
+        'paid': float(totals['paid']),
+    })
+
+
+# ================== REVENUE REPORT ==================
+@login_required
+@require_GET
+def revenue_report_view(request):
+    """
+    Precomputed revenue per month, status or event type:
+    ?group=month|status|event_type&from=YYYY-MM&to=YYYY-MM
+    """
+    group = request.GET.get('group', 'month')
+    try:
+        rows, totals = revenue_report(
+            group,
+            start=parse_month(request.GET.get('from')),
+            end=parse_month(request.GET.get('to')),
+        )
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    def serialize(values):
+        return {
+            key: float(value) if key in MEASURES[1:] else value
+            for key, value in values.items()
+        }
+
+    for row in rows:
+        if group == 'month':
+            row['month'] = row['month'].strftime('%Y-%m')
+
     return JsonResponse({
-        'total_leads': Lead.objects.count(),
-        'total_amount': float(Lead.objects.aggregate(total=Sum('amount'))['total'] or 0),
-        'accepted': float(Lead.objects.filter(status=Lead.STATUS_ACCEPTED).aggregate(total=Sum('amount'))['total'] or 0),
-        'lost': float(Lead.objects.filter(status=Lead.STATUS_LOST).aggregate(total=Sum('amount'))['total'] or 0),
+        'success': True,
+        'group': group,
+        'rows': [serialize(row) for row in rows],
+        'totals': serialize(totals),
     })
 
 
@@ -203,22 +223,27 @@ from django.views.decorators.http import require_GET
 
 @require_GET
 def check_conflict(request):
+    """
+    Accepted bookings overlapping ?date=&session= (and optionally
+    ?end_date=&end_session= for multi-day events), excluding ?lead_id=.
+    """
     event_date = request.GET.get("date")
     session = request.GET.get("session")
-    lead_id = request.GET.get("lead_id")   # 👈 ADD THIS LINE
+    lead_id = request.GET.get("lead_id")
+    end_date = request.GET.get("end_date")
 
     if not event_date or not session:
         return JsonResponse({"success": False, "conflicts": []})
 
-    conflicts = Lead.objects.filter(
-        status=Lead.STATUS_ACCEPTED,
-        event_start_date=event_date,
-        event_start_session=session
-    )
-
-    # 👇 ADD THIS BLOCK
-    if lead_id:
-        conflicts = conflicts.exclude(id=lead_id)
+    try:
+        conflicts = find_conflicts(
+            date.fromisoformat(event_date), session,
+            date.fromisoformat(end_date) if end_date else None,
+            request.GET.get("end_session", Lead.SESSION_EVENING),
+            exclude_id=lead_id,
+        )
+    except ValueError:
+        return JsonResponse({"success": False, "conflicts": []}, status=400)
 
     return JsonResponse({
         "success": True,
@@ -228,9 +253,36 @@ def check_conflict(request):
     })
 
 
+# ================== CONFLICTS IN RANGE ==================
+@login_required
+@require_GET
+def booking_conflicts(request):
+    """Every pair of overlapping accepted bookings between ?from= and ?to= (dates)."""
+    try:
+        start = date.fromisoformat(request.GET.get("from", ""))
+        end = date.fromisoformat(request.GET.get("to", ""))
+    except ValueError:
+        return JsonResponse({"success": False, "error": "from and to must be YYYY-MM-DD dates"}, status=400)
+
+    def shared(slot):
+        day, session = from_slot(slot)
+        return {"date": day.isoformat(), "session": session}
+
+    return JsonResponse({
+        "success": True,
+        "conflicts": [
+            {
+                "leads": [{"id": first["id"], "name": first["name"]}, {"id": second["id"], "name": second["name"]}],
+                "from": shared(first_slot),
+                "to": shared(last_slot),
+            }
+            for first, second, first_slot, last_slot in conflicts_in_range(start, end)
+        ],
+    })
+
+
 
 # ================== SEARCH LEADS ==================
-from django.db.models import Q
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 from .models import Lead
@@ -243,14 +295,7 @@ def search_leads(request):
     leads = Lead.objects.all()
 
     if query:
-        leads = leads.filter(
-            Q(name__icontains=query) |
-            Q(phone__icontains=query) |
-            Q(email__icontains=query) |
-            Q(event_type__icontains=query) |
-            Q(event_place__icontains=query) |
-            Q(status__icontains=query)
-        )
+        leads = search(leads, "lead", query)
 
     data = [{
         "id": l.id,
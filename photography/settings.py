@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -85,15 +86,55 @@ AUTH_USER_MODEL = 'accounts.User'
 # DATABASE
 # =========================
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-        'OPTIONS': {
-            'timeout': 20,  # Wait longer before throwing lock error
+# DB_ENGINE=postgresql switches to PostgreSQL, configured with DB_NAME,
+# DB_USER, DB_PASSWORD, DB_HOST and DB_PORT. Point DB_HOST at PgBouncer
+# (transaction pooling) and set DB_PGBOUNCER=1; set DB_REPLICA_HOST to send
+# the read-heavy pages (core.routers.reads_from_replica) to a replica.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'photography'),
+            'USER': os.environ.get('DB_USER', 'photography'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # Persistent connections per gunicorn worker, checked before reuse.
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            # Named cursors do not survive PgBouncer transaction pooling.
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_PGBOUNCER') == '1',
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5)),
+            },
         }
     }
-}
+    if os.environ.get('DB_REPLICA_HOST'):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': os.environ['DB_REPLICA_HOST'],
+            'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                'timeout': 20,  # Wait longer before throwing lock error
+            },
+            # File-backed test DB: in-memory SQLite fails concurrent writers with
+            # "table is locked" instead of waiting, which breaks threaded tests.
+            'TEST': {
+                'NAME': BASE_DIR / 'test_db.sqlite3',
+            },
+        }
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
 
 
 
@@ -136,18 +177,27 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Rendered invoice PDFs (private, so kept outside MEDIA_ROOT)
+INVOICE_PDF_CACHE_DIR = BASE_DIR / 'cache' / 'invoices'
+
 
 # =========================
 # CACHE
 # =========================
 
+# Shared by every worker process, so invalidation (core.cache) is seen everywhere.
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "login-page-config",
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / 'cache' / 'django',
+        "OPTIONS": {"MAX_ENTRIES": 5000},
     }
 }
 
+# Test runs swap in a private in-process cache (core.test_runner), so they
+# never read, bump or wipe the shared one.
+TEST_RUNNER = 'core.test_runner.PrivateCacheTestRunner'
+
 
 # =========================
 # EMAIL
@@ -18,6 +18,7 @@ urlpatterns = [
 
     path('leads/', include('leads.urls')),
     path('projects/', include('projects.urls')),
+    path('', include('core.urls')),
 
     # redirect root to login
     path('', lambda request: redirect('/accounts/login/')),
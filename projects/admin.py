@@ -4,7 +4,10 @@ from .models import Project, ProjectPhoto, PhotoSelection
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ("id", "client_name", "status")
+    list_display = ("id", "client_name", "status", "total_invoiced", "total_paid", "remaining_amount")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_financials()
 
 
 @admin.register(ProjectPhoto)
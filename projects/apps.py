@@ -5,4 +5,6 @@ class ProjectsConfig(AppConfig):
     name = 'projects'
 
     def ready(self):
-        import projects.signals
\ No newline at end of file
+        import projects.signals
+        import projects.jobs
+        import projects.maintenance
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Team availability on half-day slots (see leads.conflicts for the slot
+encoding). Every team assignment is expanded into StaffBooking rows, so
+"is this person free?" is an index lookup on (user, slot) and "who is
+free?" is a range scan on (slot, user).
+"""
+from accounts.models import User
+from leads.conflicts import booking_slots, from_slot, to_slot
+from leads.models import Lead
+
+from .models import Project, StaffBooking
+
+
+def project_slots(project):
+    """
+    Inclusive (first, last) slots a project books, or None when undated.
+    Project dates win over the lead's (they can be edited per project);
+    sessions always come from the lead.
+    """
+    lead = project.lead
+    return booking_slots(
+        project.start_date or lead.event_start_date, lead.event_start_session,
+        project.end_date or lead.event_end_date, lead.event_end_session,
+    )
+
+
+def sync_project_bookings(project_ids):
+    """
+    Make StaffBooking rows match the team and dates of these projects.
+    Only the difference is written. Returns (created, deleted).
+    """
+    projects = (
+        Project.objects.filter(pk__in=project_ids)
+        .select_related("lead")
+        .prefetch_related("team")
+    )
+
+    wanted = set()
+    for project in projects:
+        slots = project_slots(project)
+        if slots is None:
+            continue
+        for member in project.team.all():
+            wanted.update((member.id, slot, project.id) for slot in range(slots[0], slots[1] + 1))
+
+    existing = {
+        (user_id, slot, project_id): pk
+        for pk, user_id, slot, project_id in StaffBooking.objects.filter(
+            project_id__in=project_ids
+        ).values_list("pk", "user_id", "slot", "project_id")
+    }
+
+    stale = [pk for key, pk in existing.items() if key not in wanted]
+    if stale:
+        StaffBooking.objects.filter(pk__in=stale).delete()
+    missing = [
+        StaffBooking(user_id=user_id, slot=slot, project_id=project_id)
+        for user_id, slot, project_id in wanted - existing.keys()
+    ]
+    StaffBooking.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+    return len(missing), len(stale)
+
+
+def range_slots(start, end, start_session=None, end_session=None):
+    """Slots of a date range; it spans whole days unless sessions are given."""
+    return (
+        to_slot(start, start_session or Lead.SESSION_MORNING),
+        to_slot(end, end_session or Lead.SESSION_EVENING),
+    )
+
+
+def user_conflicts(user_id, first, last, exclude_project_id=None):
+    """Other projects booking this user within [first, last]."""
+    bookings = StaffBooking.objects.filter(user_id=user_id, slot__gte=first, slot__lte=last)
+    if exclude_project_id:
+        bookings = bookings.exclude(project_id=exclude_project_id)
+    return Project.objects.filter(pk__in=bookings.values("project_id")).order_by("start_date", "id")
+
+
+def assignment_conflicts(user_id, project):
+    """Projects that clash with assigning this user to `project`."""
+    slots = project_slots(project)
+    if slots is None:
+        return Project.objects.none()
+    return user_conflicts(user_id, *slots, exclude_project_id=project.pk)
+
+
+def free_staff(first, last, role=None):
+    """Users with no booking in [first, last], optionally of one photography_role."""
+    busy = StaffBooking.objects.filter(slot__gte=first, slot__lte=last).values("user_id")
+    users = User.objects.filter(is_active=True).exclude(pk__in=busy)
+    if role:
+        users = users.filter(photography_role=role)
+    return users.order_by("username")
+
+
+def busy_staff(first, last, role=None):
+    """{user_id: [(project_id, first_slot, last_slot)]} for users booked in [first, last]."""
+    bookings = StaffBooking.objects.filter(slot__gte=first, slot__lte=last)
+    if role:
+        bookings = bookings.filter(user__photography_role=role)
+
+    spans = {}
+    for user_id, project_id, slot in bookings.order_by("user_id", "project_id", "slot").values_list(
+        "user_id", "project_id", "slot"
+    ):
+        span = spans.setdefault(user_id, {}).setdefault(project_id, [slot, slot])
+        span[1] = slot
+    return {
+        user_id: [(project_id, span[0], span[1]) for project_id, span in projects.items()]
+        for user_id, projects in spans.items()
+    }
+
+
+def slot_label(slot):
+    day, session = from_slot(slot)
+    return {"date": day.isoformat(), "session": session}
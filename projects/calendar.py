@@ -0,0 +1,212 @@
+"""
+iCalendar feeds of project bookings, per team member or for the studio.
+
+Every change to a project's event bumps Project.calendar_seq from the
+"calendar" sequence, and events that leave a feed leave a
+CalendarTombstone with their own sequence value. The highest value in a
+feed is therefore its version: it is the ETag, and clients that send it
+back as ?sync_token= only receive events changed (or cancelled) since.
+Feeds are streamed event by event.
+"""
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.db.models import Max
+from django.utils import timezone
+
+from core.sequences import next_value
+from .models import CalendarTombstone, Project
+
+
+SEQUENCE = "calendar"
+
+# Project fields that end up in the calendar event.
+CALENDAR_FIELDS = ("code", "client_name", "event_type", "venue", "time", "duration", "start_date", "end_date", "status")
+
+TOKEN_SALT = "projects.calendar"
+STUDIO = "studio"
+
+PRODID = "-//Photography Studio//Project Calendar//EN"
+CHUNK_SIZE = 200
+
+
+# ------------------------
+# Change tracking
+# ------------------------
+def touch_projects(project_ids):
+    """Give these projects' events a new calendar version."""
+    _, _, seq = next_value(SEQUENCE)
+    Project.objects.filter(pk__in=project_ids).update(calendar_seq=seq, calendar_changed_at=timezone.now())
+    return seq
+
+
+def bury(project_id, user_ids=(None,)):
+    """Record that a project's event left the feeds of `user_ids` (None: all feeds)."""
+    _, _, seq = next_value(SEQUENCE)
+    CalendarTombstone.objects.bulk_create([
+        CalendarTombstone(project_id=project_id, user_id=user_id, seq=seq) for user_id in user_ids
+    ])
+    return seq
+
+
+# ------------------------
+# Feed scopes and tokens
+# ------------------------
+def feed_token(user=None):
+    """Stable signed token of a user's feed (or the studio feed) for its URL."""
+    return signing.Signer(salt=TOKEN_SALT).sign(STUDIO if user is None else str(user.pk))
+
+
+def feed_scope(token):
+    """Token -> user id or STUDIO. Raises signing.BadSignature."""
+    value = signing.Signer(salt=TOKEN_SALT).unsign(token)
+    return value if value == STUDIO else int(value)
+
+
+def scope_projects(scope):
+    projects = Project.objects.all()
+    return projects if scope == STUDIO else projects.filter(team=scope)
+
+
+def scope_tombstones(scope):
+    tombstones = CalendarTombstone.objects.all()
+    if scope == STUDIO:
+        return tombstones.filter(user=None)
+    return tombstones.filter(user=None) | tombstones.filter(user_id=scope)
+
+
+def feed_state(scope):
+    """
+    (version, last_modified) of a feed from two aggregates, without
+    touching the events themselves.
+    """
+    projects = scope_projects(scope).aggregate(seq=Max("calendar_seq"), changed=Max("calendar_changed_at"))
+    tombstones = scope_tombstones(scope).aggregate(seq=Max("seq"), changed=Max("removed_at"))
+    version = max(projects["seq"] or 0, tombstones["seq"] or 0)
+    changed = [value for value in (projects["changed"], tombstones["changed"]) if value]
+    return version, max(changed) if changed else None
+
+
+# ------------------------
+# iCalendar output
+# ------------------------
+def escape(value):
+    return (
+        str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets (RFC 5545 3.1)."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts, start = [], 0
+    while start < len(encoded):
+        end = min(start + (75 if not parts else 74), len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # do not split a UTF-8 sequence
+        parts.append(encoded[start:end].decode())
+        start = end
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def utc_stamp(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def event_uid(project_id):
+    return f"project-{project_id}@photography-studio"
+
+
+def event_times(project):
+    """
+    DTSTART / DTEND lines: all-day over the event dates, or from the
+    start time to the end of the last day when a time is set.
+    """
+    last_day = max(project.end_date or project.start_date, project.start_date)
+    if project.time is None:
+        return [
+            f"DTSTART;VALUE=DATE:{project.start_date:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{last_day + timedelta(days=1):%Y%m%d}",
+        ]
+    zone = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(project.start_date, project.time), zone)
+    end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min), zone)
+    return [f"DTSTART:{utc_stamp(start)}", f"DTEND:{utc_stamp(end)}"]
+
+
+def event_lines(project):
+    changed = project.calendar_changed_at or timezone.now()
+    team = [member.get_full_name() or member.username for member in project.team.all()]
+    description = [f"Project {project.code}", f"Status: {project.get_status_display()}"]
+    if project.duration:
+        description.append(f"Duration: {project.duration}")
+    if team:
+        description.append(f"Team: {', '.join(team)}")
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event_uid(project.pk)}",
+        f"DTSTAMP:{utc_stamp(changed)}",
+        f"LAST-MODIFIED:{utc_stamp(changed)}",
+        f"SEQUENCE:{project.calendar_seq}",
+        *event_times(project),
+        f"SUMMARY:{escape(f'{project.client_name} {project.event_type}')}",
+        f"DESCRIPTION:{escape(chr(10).join(description))}",
+    ]
+    if project.venue:
+        lines.append(f"LOCATION:{escape(project.venue)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def cancelled_lines(project_id, seq, stamp):
+    return [
+        "BEGIN:VEVENT",
+        f"UID:{event_uid(project_id)}",
+        f"DTSTAMP:{utc_stamp(stamp)}",
+        f"SEQUENCE:{seq}",
+        "STATUS:CANCELLED",
+        "END:VEVENT",
+    ]
+
+
+def stream_feed(scope, version, since=None):
+    """
+    Yield the feed as folded iCalendar lines. With `since` (a sync token)
+    only events changed after it are sent, plus cancellations for events
+    that left the feed or lost their date.
+    """
+    name = "Studio bookings" if scope == STUDIO else "My bookings"
+    for line in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+                 f"X-WR-CALNAME:{name}", f"X-SYNC-TOKEN:{version}"):
+        yield fold(line)
+
+    projects = scope_projects(scope).prefetch_related("team").order_by("pk")
+    if since is None:
+        projects = projects.filter(start_date__isnull=False)
+    else:
+        projects = projects.filter(calendar_seq__gt=since)
+
+    sent = set()
+    for project in projects.iterator(chunk_size=CHUNK_SIZE):
+        sent.add(project.pk)
+        if project.start_date is None:
+            lines = cancelled_lines(project.pk, project.calendar_seq, project.calendar_changed_at or timezone.now())
+        else:
+            lines = event_lines(project)
+        for line in lines:
+            yield fold(line)
+
+    if since is not None:
+        tombstones = scope_tombstones(scope).filter(seq__gt=since).order_by("seq")
+        for tombstone in tombstones.iterator(chunk_size=CHUNK_SIZE):
+            if tombstone.project_id in sent:
+                continue  # re-added after removal: the live event wins
+            sent.add(tombstone.project_id)
+            for line in cancelled_lines(tombstone.project_id, tombstone.seq, tombstone.removed_at):
+                yield fold(line)
+
+    yield fold("END:VCALENDAR")
@@ -0,0 +1,42 @@
+import hashlib
+from io import BytesIO
+
+from core.jobs import job_handler
+
+from .models import ProjectPhoto
+from .renditions import render_renditions, store_renditions
+
+
+def mark_photo_failed(photo_id, error):
+    ProjectPhoto.objects.filter(pk=photo_id).update(processing_status=ProjectPhoto.PROCESSING_FAILED)
+
+
+@job_handler("photo_ingest", on_failure=mark_photo_failed)
+def ingest_photo(photo_id):
+    """
+    Decode, orient, resize and hash one uploaded photo. Re-running it simply
+    overwrites the renditions, so retries are safe. Returns False when there
+    was nothing to render (photo deleted or without an image).
+    """
+    photo = ProjectPhoto.objects.filter(pk=photo_id).first()
+    if photo is None or not photo.image:
+        return False
+
+    ProjectPhoto.objects.filter(pk=photo_id).update(processing_status=ProjectPhoto.PROCESSING_RUNNING)
+
+    try:
+        with photo.image.open("rb") as source:
+            data = source.read()
+
+        result = render_renditions(BytesIO(data))
+        store_renditions(photo, result)
+    except Exception:
+        # Back to pending while the job waits for its retry.
+        ProjectPhoto.objects.filter(pk=photo_id).update(processing_status=ProjectPhoto.PROCESSING_PENDING)
+        raise
+
+    ProjectPhoto.objects.filter(pk=photo_id).update(
+        sha256=hashlib.sha256(data).hexdigest(),
+        processing_status=ProjectPhoto.PROCESSING_READY,
+    )
+    return True
@@ -0,0 +1,11 @@
+from django.utils import timezone
+
+from core.maintenance import batched, maintenance_task
+from .models import PhotoSelection
+
+
+@maintenance_task("deactivate_expired_selections", interval=15 * 60)
+def deactivate_expired_selections(batch_size):
+    """Close client selection links that are past their expiry date."""
+    expired = PhotoSelection.objects.filter(is_active=True, expires_at__lt=timezone.now())
+    return batched(expired, batch_size, lambda selections: selections.update(is_active=False))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from PIL import Image, UnidentifiedImageError
+
+from projects.jobs import ingest_photo, mark_photo_failed
+from projects.models import ProjectPhoto
+
+
+class Command(BaseCommand):
+    help = "Generate renditions for project photos in this process (see run_jobs for the background path)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, help="Only photos of this project id.")
+        parser.add_argument("--force", action="store_true", help="Regenerate existing renditions.")
+
+    def handle(self, *args, **options):
+        photos = ProjectPhoto.objects.exclude(image="").order_by("id")
+        if options["project"]:
+            photos = photos.filter(project_id=options["project"])
+        if not options["force"]:
+            photos = photos.filter(thumbnail="")
+
+        done = skipped = failed = 0
+        for photo in photos.iterator():
+            try:
+                rendered = ingest_photo(photo.pk)
+            # Pillow reports some corrupt files as SyntaxError.
+            except (OSError, ValueError, SyntaxError, UnidentifiedImageError, Image.DecompressionBombError) as exc:
+                failed += 1
+                mark_photo_failed(photo.pk, str(exc))
+                self.stderr.write(f"Photo {photo.pk}: {exc}")
+                continue
+
+            if rendered:
+                done += 1
+            else:
+                skipped += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated renditions for {done} photo(s), {skipped} skipped, {failed} failed."
+        ))
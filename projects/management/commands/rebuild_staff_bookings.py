@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from projects.availability import sync_project_bookings
+from projects.models import Project, StaffBooking
+
+
+class Command(BaseCommand):
+    help = "Resync StaffBooking rows from project teams and event dates."
+
+    def handle(self, *args, **options):
+        project_ids = set(Project.objects.filter(team__isnull=False).values_list("pk", flat=True))
+        # Projects that lost their whole team still have rows to clear.
+        project_ids.update(StaffBooking.objects.values_list("project_id", flat=True))
+
+        created, deleted = sync_project_bookings(project_ids)
+        self.stdout.write(self.style.SUCCESS(f"Created {created} and deleted {deleted} booking(s)."))
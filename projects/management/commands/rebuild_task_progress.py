@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from projects.progress import rebuild_progress
+
+
+class Command(BaseCommand):
+    help = "Recount stored per-stage and per-keyword task progress counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "project_ids", nargs="*", type=int,
+            help="Only rebuild these projects (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_progress(options["project_ids"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt task progress for {count} project(s)."))
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copy of projects.progress.TRACKED_KEYWORDS.
+TRACKED_KEYWORDS = ("Planning", "Hard Disk", "Pre Wedding", "Main Coverage")
+
+
+def backfill_progress(apps, schema_editor):
+    ProjectTask = apps.get_model('projects', 'ProjectTask')
+    ProjectProgress = apps.get_model('projects', 'ProjectProgress')
+
+    counters = {}
+    for project_id, stage, title, is_completed in ProjectTask.objects.values_list(
+        'project_id', 'stage', 'title', 'is_completed'
+    ).iterator():
+        buckets = [('stage', stage)]
+        buckets += [('keyword', k) for k in TRACKED_KEYWORDS if k.lower() in title.lower()]
+        for kind, key in buckets:
+            completed, total = counters.get((project_id, kind, key), (0, 0))
+            counters[(project_id, kind, key)] = (completed + int(is_completed), total + 1)
+
+    ProjectProgress.objects.bulk_create([
+        ProjectProgress(project_id=project_id, kind=kind, key=key, completed=completed, total=total)
+        for (project_id, kind, key), (completed, total) in counters.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('stage', 'Stage'), ('keyword', 'Keyword')], max_length=10)),
+                ('key', models.CharField(max_length=120)),
+                ('completed', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_counters', to='projects.project')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('project', 'kind', 'key'), name='unique_project_progress_counter')],
+            },
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
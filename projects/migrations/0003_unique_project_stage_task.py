@@ -0,0 +1,72 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:28
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# Frozen copy of projects.progress.TRACKED_KEYWORDS.
+TRACKED_KEYWORDS = ("Planning", "Hard Disk", "Pre Wedding", "Main Coverage")
+
+
+def remove_duplicate_tasks(apps, schema_editor):
+    """
+    Keep one task per (project, stage, title), preferring a completed copy
+    and then the oldest, and recount the progress counters of every project
+    that lost a duplicate.
+    """
+    Project = apps.get_model('projects', 'Project')
+    ProjectTask = apps.get_model('projects', 'ProjectTask')
+    ProjectProgress = apps.get_model('projects', 'ProjectProgress')
+
+    duplicates = (
+        ProjectTask.objects
+        .values('project_id', 'stage', 'title')
+        .annotate(copies=Count('id'))
+        .filter(copies__gt=1)
+    )
+
+    affected = set()
+    for row in duplicates:
+        copies = ProjectTask.objects.filter(
+            project_id=row['project_id'], stage=row['stage'], title=row['title']
+        )
+        keep_id = copies.order_by('-is_completed', 'id').values_list('id', flat=True).first()
+        copies.exclude(id=keep_id).delete()
+        affected.add(row['project_id'])
+
+    for project_id in affected:
+        counters = {}
+        for stage, title, is_completed in ProjectTask.objects.filter(
+            project_id=project_id
+        ).values_list('stage', 'title', 'is_completed'):
+            buckets = [('stage', stage)]
+            buckets += [('keyword', k) for k in TRACKED_KEYWORDS if k.lower() in title.lower()]
+            for bucket in buckets:
+                completed, total = counters.get(bucket, (0, 0))
+                counters[bucket] = (completed + int(is_completed), total + 1)
+
+        ProjectProgress.objects.filter(project_id=project_id).delete()
+        ProjectProgress.objects.bulk_create([
+            ProjectProgress(project_id=project_id, kind=kind, key=key, completed=completed, total=total)
+            for (kind, key), (completed, total) in counters.items()
+        ])
+        stage_counts = [value for (kind, _), value in counters.items() if kind == 'stage']
+        Project.objects.filter(pk=project_id).update(
+            completed_tasks=sum(completed for completed, _ in stage_counts),
+            total_tasks=sum(total for _, total in stage_counts),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_project_progress'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_tasks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='projecttask',
+            constraint=models.UniqueConstraint(fields=('project', 'stage', 'title'), name='unique_project_stage_task'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_unique_project_stage_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectphoto',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectphoto',
+            name='preview',
+            field=models.ImageField(blank=True, upload_to='project_photos/'),
+        ),
+        migrations.AddField(
+            model_name='projectphoto',
+            name='preview_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectphoto',
+            name='preview_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectphoto',
+            name='thumbnail',
+            field=models.ImageField(blank=True, upload_to='project_photos/'),
+        ),
+        migrations.AddField(
+            model_name='projectphoto',
+            name='thumbnail_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectphoto',
+            name='thumbnail_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectphoto',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:33
+
+from django.db import migrations, models
+
+
+def queue_existing_photos(apps, schema_editor):
+    ProjectPhoto = apps.get_model('projects', 'ProjectPhoto')
+    Job = apps.get_model('core', 'Job')
+
+    ProjectPhoto.objects.exclude(thumbnail='').update(processing_status='ready')
+    pending = ProjectPhoto.objects.filter(thumbnail='').exclude(image='').values_list('id', flat=True)
+    Job.objects.bulk_create(
+        [Job(kind='photo_ingest', object_id=photo_id) for photo_id in pending.iterator()],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_job'),
+        ('projects', '0004_photo_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectphoto',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='projectphoto',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.RunPython(queue_existing_photos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_bookings(apps, schema_editor):
+    """Frozen copy of projects.availability.sync_project_bookings for every staffed project."""
+    Project = apps.get_model('projects', 'Project')
+    StaffBooking = apps.get_model('projects', 'StaffBooking')
+
+    def to_slot(day, session):
+        return day.toordinal() * 2 + (1 if session == 'EVE' else 0)
+
+    bookings = []
+    for project in Project.objects.filter(team__isnull=False).distinct().select_related('lead').prefetch_related('team'):
+        lead = project.lead
+        start = project.start_date or lead.event_start_date
+        if not start:
+            continue
+        first = to_slot(start, lead.event_start_session)
+        end = project.end_date or lead.event_end_date
+        last = max(first, to_slot(end, lead.event_end_session)) if end else first
+        for member in project.team.all():
+            bookings.extend(
+                StaffBooking(user_id=member.id, project_id=project.id, slot=slot)
+                for slot in range(first, last + 1)
+            )
+
+    StaffBooking.objects.bulk_create(bookings, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_photo_processing_status'),
+        ('leads', '0009_booking_slots'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffBooking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot', models.PositiveIntegerField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='staff_bookings', to='projects.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['slot', 'user'], name='projects_booking_slot_user')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'slot', 'project'), name='unique_staff_booking')],
+            },
+        ),
+        migrations.RunPython(backfill_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_staff_booking'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['start_date', 'status'], name='projects_session_start'),
+        ),
+    ]
@@ -1,9 +1,35 @@
 import uuid
-from django.db import models
+from decimal import Decimal
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from accounts.models import User
 
 
+class ProjectQuerySet(models.QuerySet):
+    def with_financials(self):
+        """
+        Annotate invoiced_total, paid_total and remaining_total in SQL so the
+        financial properties below cost no extra queries per project.
+        """
+        Invoice = apps.get_model('invoices', 'Invoice')
+        money = models.DecimalField(max_digits=12, decimal_places=2)
+        zero = models.Value(Decimal('0'), output_field=money)
+
+        invoices = Invoice.objects.filter(project=OuterRef('pk')).order_by().values('project')
+        invoiced = invoices.annotate(amount=Sum('total')).values('amount')
+        paid = invoices.annotate(amount=Sum('paid_amount')).values('amount')
+
+        return self.annotate(
+            invoiced_total=Coalesce(Subquery(invoiced, output_field=money), zero),
+            paid_total=Coalesce(Subquery(paid, output_field=money), zero),
+        ).annotate(
+            remaining_total=ExpressionWrapper(F('lead__amount') - F('paid_total'), output_field=money),
+        )
+
+
 class Project(models.Model):
     STATUS_CHOICES = (
         ('to_assign', 'To Be Assigned'),
@@ -44,18 +70,46 @@ class Project(models.Model):
     completed_tasks = models.IntegerField(default=0)
     total_tasks = models.IntegerField(default=0)
 
+    # Bumped from the "calendar" sequence whenever the calendar event changes
+    # (see projects.calendar); feeds use it for ETags and sync tokens.
+    calendar_seq = models.PositiveBigIntegerField(default=0, db_index=True, editable=False)
+    calendar_changed_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Month ranges of the sessions page.
+            models.Index(fields=["start_date", "status"], name="projects_session_start"),
+        ]
+
     def __str__(self):
         return f"{self.client_name} – {self.event_type}"
+
+    objects = ProjectQuerySet.as_manager()
+
+    # Use the with_financials() annotations when present, then prefetched
+    # invoices, and only then an aggregate query.
+    def _invoice_sum(self, field):
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('invoices')
+        if prefetched is not None:
+            return sum((getattr(invoice, field) for invoice in prefetched), Decimal('0'))
+        return self.invoices.aggregate(amount=Sum(field))['amount'] or 0
+
     @property
     def total_invoiced(self):
-        return sum(inv.total for inv in self.invoices.all())
+        if 'invoiced_total' in self.__dict__:
+            return self.invoiced_total
+        return self._invoice_sum('total')
 
     @property
     def total_paid(self):
-        return sum(inv.paid_amount for inv in self.invoices.all())
+        if 'paid_total' in self.__dict__:
+            return self.paid_total
+        return self._invoice_sum('paid_amount')
 
     @property
     def remaining_amount(self):
+        if 'remaining_total' in self.__dict__:
+            return self.remaining_total
         return self.lead.amount - self.total_paid
 
     # ---------- UI HELPERS ----------
@@ -79,17 +133,20 @@ class Project(models.Model):
 
     # ---------- TASK PROGRESS ----------
     def update_task_progress(self):
-        self.completed_tasks = self.tasks.filter(is_completed=True).count()
-        self.total_tasks = self.tasks.count()
-        self.save(update_fields=['completed_tasks', 'total_tasks'])
+        """Full recount of the stored counters; task writes apply deltas instead."""
+        from .progress import rebuild_progress
+        rebuild_progress([self.pk])
+        self.refresh_from_db(fields=['completed_tasks', 'total_tasks'])
 
     def task_progress(self, keyword):
-        qs = self.tasks.filter(title__icontains=keyword)
-        return qs.filter(is_completed=True).count(), qs.count()
+        from .progress import TRACKED_KEYWORDS, keyword_progress, stored_progress
+        if keyword in TRACKED_KEYWORDS:
+            return stored_progress([self.pk], 'keyword').get(self.pk, {}).get(keyword, (0, 0))
+        return keyword_progress([self.pk], [keyword]).get(self.pk, {}).get(keyword, (0, 0))
 
     def stage_progress(self, stage):
-        qs = self.tasks.filter(stage=stage)
-        return qs.filter(is_completed=True).count(), qs.count()
+        from .progress import stored_progress
+        return stored_progress([self.pk], 'stage').get(self.pk, {}).get(stage, (0, 0))
 
     # ---------- AUTOMATION LOGIC ----------
     def auto_update_status(self):
@@ -103,8 +160,12 @@ class Project(models.Model):
         ]
 
         for status_name, stage_name in stage_order:
+            if self.status != status_name:
+                continue
+
             # Check if all tasks in current stage are completed
-            if self.status == status_name and not self.tasks.filter(stage=stage_name, is_completed=False).exists():
+            completed, total = self.stage_progress(stage_name)
+            if completed == total:
                 # Move to next status
                 next_index = stage_order.index((status_name, stage_name)) + 1
                 if next_index < len(stage_order):
@@ -135,38 +196,59 @@ class Project(models.Model):
         return new_status in allowed.get(self.status, [])
 
     # ---------- TASK CREATION ----------
+    def seed_tasks(self, stage):
+        """
+        Create the template checklist for a stage in one bulk insert; titles
+        that already exist are skipped by the (project, stage, title)
+        constraint. Progress counters are recounted once afterwards.
+        """
+        from .task_templates import task_titles
+
+        ProjectTask.objects.bulk_create(
+            [
+                ProjectTask(project=self, stage=stage, title=title)
+                for title in task_titles(stage, self.event_type)
+            ],
+            ignore_conflicts=True,
+        )
+        self.update_task_progress()
+
     def create_preproduction_tasks(self):
-        defaults = [
-            "Planning & Wedding",
-            "Hard Disk",
-            "Pre Wedding Shoot",
-            "Main Coverage",
-            "Equipment Check",
-            "Team Assignment",
-            "Venue Recce",
-        ]
-        for title in defaults:
-            self.tasks.get_or_create(
-                title=title,
-                stage="pre",
-                defaults={"is_completed": False}
-            )
+        self.seed_tasks("pre")
+
     def create_selection_tasks(self):
-        defaults = [
-            "Initial Culling",
-            "Final Culling",
-            "Color Correction",
-            "Preview Gallery Creation"
-        ]
-        for title in defaults:
-            self.tasks.get_or_create(
-                title=title,
-                stage="selection",
-                defaults={"is_completed": False}
-            )
+        self.seed_tasks("selection")
 
 
 # ---------- PROJECT TASK ----------
+class ProjectTaskQuerySet(models.QuerySet):
+    # Writes to these fields move the stored progress counters.
+    PROGRESS_FIELDS = {'project', 'project_id', 'stage', 'title', 'is_completed'}
+
+    def update(self, **kwargs):
+        """
+        Bulk writes (update and bulk_update, which goes through here) recount
+        the counters of every project they touch instead of skipping them.
+        """
+        if not self.PROGRESS_FIELDS & set(kwargs):
+            return super().update(**kwargs)
+
+        from .progress import rebuild_progress
+
+        with transaction.atomic(using=self.db):
+            project_ids = set(self.order_by().values_list('project_id', flat=True))
+            target = kwargs.get('project', kwargs.get('project_id'))
+            if isinstance(target, Project):
+                project_ids.add(target.pk)
+            elif isinstance(target, int):
+                project_ids.add(target)
+
+            rows = super().update(**kwargs)
+            if rows:
+                rebuild_progress(project_ids)
+        return rows
+
+
 class ProjectTask(models.Model):
     STAGE_CHOICES = (
         ('pre', 'Pre Production'),
@@ -183,15 +265,122 @@ class ProjectTask(models.Model):
     stage = models.CharField(max_length=20, choices=STAGE_CHOICES)
     is_completed = models.BooleanField(default=False)
 
+    objects = ProjectTaskQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'stage', 'title'],
+                name='unique_project_stage_task',
+            ),
+        ]
+
     def __str__(self):
         return f"{self.project.client_name} - {self.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {'stage', 'title', 'is_completed'}.issubset(field_names):
+            instance._loaded_state = instance.progress_state()
+        return instance
+
+    def progress_state(self):
+        return (self.stage, self.title, self.is_completed)
+
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        self.project.update_task_progress()
+        from .progress import record_task_change
+
+        with transaction.atomic():
+            # Deltas come from the locked row, not the loaded instance: two
+            # stale copies saving the same toggle must count it once.
+            previous = None
+            if not self._state.adding:
+                previous = ProjectTask.objects.select_for_update().filter(pk=self.pk).values_list(
+                    'stage', 'title', 'is_completed'
+                ).first()
+            super().save(*args, **kwargs)
+
+            current = self.progress_state()
+            completed, total = record_task_change(self.project_id, previous, current)
+        self.project.completed_tasks += completed
+        self.project.total_tasks += total
+        self._loaded_state = current
         self.project.auto_update_status()
 
 
+# ---------- PROGRESS COUNTERS ----------
+class ProjectProgress(models.Model):
+    """
+    Denormalized completed/total task counters per project stage and per
+    tracked title keyword. Maintained by deltas from ProjectTask writes;
+    `manage.py rebuild_task_progress` recounts them.
+    """
+    KIND_CHOICES = (
+        ('stage', 'Stage'),
+        ('keyword', 'Keyword'),
+    )
+
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name="progress_counters"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    key = models.CharField(max_length=120)
+    completed = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'kind', 'key'],
+                name='unique_project_progress_counter',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.kind}:{self.key} {self.completed}/{self.total}"
+
+
+# ---------- STAFF BOOKINGS ----------
+class StaffBooking(models.Model):
+    """
+    One half-day slot a team member is booked for through a project.
+    Derived from Project.team and the event dates by projects.availability.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="bookings")
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="staff_bookings")
+    slot = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            # Also the (user, slot) index behind availability lookups.
+            models.UniqueConstraint(fields=["user", "slot", "project"], name="unique_staff_booking"),
+        ]
+        indexes = [
+            models.Index(fields=["slot", "user"], name="projects_booking_slot_user"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.slot} ({self.project_id})"
+
+
+# ---------- CALENDAR ----------
+class CalendarTombstone(models.Model):
+    """
+    A project event that left a calendar feed: the project was deleted
+    (user is None, every feed) or the user was taken off its team.
+    """
+    project_id = models.PositiveBigIntegerField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True, related_name="+")
+    seq = models.PositiveBigIntegerField(db_index=True)
+    removed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.project_id} removed @ {self.seq}"
+
+
 # ---------- PHOTO SELECTION ----------
 class PhotoSelection(models.Model):
     project = models.OneToOneField(Project, on_delete=models.CASCADE, related_name="selection")
@@ -214,3 +403,37 @@ class ProjectPhoto(models.Model):
     is_selected = models.BooleanField(default=False)
     selection = models.ForeignKey(PhotoSelection, on_delete=models.CASCADE, related_name="photos", null=True, blank=True)
 
+    # Background ingest state (see projects.jobs), polled by the UI.
+    PROCESSING_PENDING = 'pending'
+    PROCESSING_RUNNING = 'processing'
+    PROCESSING_READY = 'ready'
+    PROCESSING_FAILED = 'failed'
+
+    PROCESSING_CHOICES = (
+        (PROCESSING_PENDING, 'Pending'),
+        (PROCESSING_RUNNING, 'Processing'),
+        (PROCESSING_READY, 'Ready'),
+        (PROCESSING_FAILED, 'Failed'),
+    )
+
+    processing_status = models.CharField(max_length=12, choices=PROCESSING_CHOICES, default=PROCESSING_PENDING)
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+
+    # Renditions (see projects.renditions), stored next to the original.
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail = models.ImageField(upload_to="project_photos/", blank=True)
+    thumbnail_width = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail_height = models.PositiveIntegerField(null=True, blank=True)
+    preview = models.ImageField(upload_to="project_photos/", blank=True)
+    preview_width = models.PositiveIntegerField(null=True, blank=True)
+    preview_height = models.PositiveIntegerField(null=True, blank=True)
+
+    @property
+    def thumbnail_url(self):
+        return self.thumbnail.url if self.thumbnail else self.image.url
+
+    @property
+    def preview_url(self):
+        return self.preview.url if self.preview else self.image.url
+
@@ -0,0 +1,215 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Prefetch, Q
+
+from .models import Project, ProjectProgress, ProjectTask
+
+
+# (label shown on cards, keyword matched against task titles)
+PRE_PRODUCTION_PROGRESS = (
+    ("Planning & Wedding", "Planning"),
+    ("Hard Disk", "Hard Disk"),
+    ("Pre Wedding Shoot", "Pre Wedding"),
+    ("Main Coverage", "Main Coverage"),
+)
+
+# Keywords that get stored counters in ProjectProgress.
+TRACKED_KEYWORDS = tuple(keyword for _, keyword in PRE_PRODUCTION_PROGRESS)
+
+
+def percentage(completed, total):
+    if not total:
+        return 0
+    return int((completed / total) * 100)
+
+
+# ------------------------
+# Keyword progress (one grouped aggregate)
+# ------------------------
+def keyword_progress(project_ids, keywords):
+    """
+    Completed/total task counts per project and keyword, computed with a
+    single conditional-aggregate query.
+
+    `project_ids` may be a list or a values("id") queryset (used as a
+    subquery). Returns {project_id: {keyword: (completed, total)}}.
+    """
+    aggregates = {}
+    for index, keyword in enumerate(keywords):
+        matches = Q(title__icontains=keyword)
+        aggregates[f"kw{index}_done"] = Count("id", filter=matches & Q(is_completed=True))
+        aggregates[f"kw{index}_total"] = Count("id", filter=matches)
+
+    rows = (
+        ProjectTask.objects
+        .filter(project_id__in=project_ids)
+        .values("project_id")
+        .annotate(**aggregates)
+        .order_by()
+    )
+
+    progress = {}
+    for row in rows:
+        progress[row["project_id"]] = {
+            keyword: (row[f"kw{index}_done"], row[f"kw{index}_total"])
+            for index, keyword in enumerate(keywords)
+        }
+    return progress
+
+
+# ------------------------
+# Stage progress (one grouped aggregate)
+# ------------------------
+def stage_progress(project_ids):
+    """
+    Completed/total task counts per project and stage.
+    Returns {project_id: {stage: (completed, total)}}.
+    """
+    rows = (
+        ProjectTask.objects
+        .filter(project_id__in=project_ids)
+        .values("project_id", "stage")
+        .annotate(
+            done=Count("id", filter=Q(is_completed=True)),
+            total=Count("id"),
+        )
+        .order_by()
+    )
+
+    progress = {}
+    for row in rows:
+        progress.setdefault(row["project_id"], {})[row["stage"]] = (row["done"], row["total"])
+    return progress
+
+
+# ------------------------
+# Prefetch helpers
+# ------------------------
+def stage_tasks_prefetch(stages, to_attr="stage_task_list"):
+    return Prefetch(
+        "tasks",
+        queryset=ProjectTask.objects.filter(stage__in=stages).order_by("id"),
+        to_attr=to_attr,
+    )
+
+
+def pending_tasks_prefetch(to_attr="pending_tasks"):
+    return Prefetch(
+        "tasks",
+        queryset=ProjectTask.objects.filter(is_completed=False).order_by("id"),
+        to_attr=to_attr,
+    )
+
+
+# ------------------------
+# Stored counters (ProjectProgress)
+# ------------------------
+def task_buckets(stage, title):
+    """Counter buckets a task with this stage/title contributes to."""
+    buckets = [("stage", stage)]
+    lowered = title.lower()
+    buckets += [
+        ("keyword", keyword) for keyword in TRACKED_KEYWORDS
+        if keyword.lower() in lowered
+    ]
+    return buckets
+
+
+def stored_progress(project_ids, kind):
+    """
+    Read stored counters of one kind.
+    Returns {project_id: {key: (completed, total)}}.
+    """
+    rows = ProjectProgress.objects.filter(
+        project_id__in=project_ids, kind=kind
+    ).values_list("project_id", "key", "completed", "total")
+
+    progress = {}
+    for project_id, key, completed, total in rows:
+        progress.setdefault(project_id, {})[key] = (completed, total)
+    return progress
+
+
+def _apply_bucket_delta(project_id, kind, key, completed, total):
+    counters = ProjectProgress.objects.filter(project_id=project_id, kind=kind, key=key)
+    updated = counters.update(completed=F("completed") + completed, total=F("total") + total)
+    if updated or total <= 0:
+        # Never create rows on a decrement: the project may be mid-delete.
+        return
+
+    try:
+        with transaction.atomic():
+            ProjectProgress.objects.create(
+                project_id=project_id, kind=kind, key=key,
+                completed=completed, total=total,
+            )
+    except IntegrityError:
+        counters.update(completed=F("completed") + completed, total=F("total") + total)
+
+
+def record_task_change(project_id, previous, current):
+    """
+    Apply O(1) counter deltas for one task write.
+
+    `previous` and `current` are (stage, title, is_completed) tuples, or None
+    for a task that did not exist before / no longer exists. Returns the
+    (completed, total) delta applied to the project's overall counters.
+    """
+    deltas = {}
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None:
+            continue
+        stage, title, is_completed = state
+        for bucket in task_buckets(stage, title):
+            completed, total = deltas.get(bucket, (0, 0))
+            deltas[bucket] = (completed + sign * int(is_completed), total + sign)
+
+    for (kind, key), (completed, total) in deltas.items():
+        if completed or total:
+            _apply_bucket_delta(project_id, kind, key, completed, total)
+
+    completed = int(current[2] if current else 0) - int(previous[2] if previous else 0)
+    total = (1 if current else 0) - (1 if previous else 0)
+    if completed or total:
+        Project.objects.filter(pk=project_id).update(
+            completed_tasks=F("completed_tasks") + completed,
+            total_tasks=F("total_tasks") + total,
+        )
+    return completed, total
+
+
+@transaction.atomic
+def rebuild_progress(project_ids=None):
+    """
+    Recount stored counters from ProjectTask rows with two grouped aggregates.
+    Pass None to rebuild every project. Returns the number of projects.
+    """
+    projects = Project.objects.all()
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+    scope = projects.values("id")
+
+    stages = stage_progress(scope)
+    keywords = keyword_progress(scope, TRACKED_KEYWORDS)
+
+    counters = []
+    summaries = []
+    for project_id in projects.values_list("id", flat=True):
+        for kind, progress in (("stage", stages), ("keyword", keywords)):
+            for key, (completed, total) in progress.get(project_id, {}).items():
+                if total:
+                    counters.append(ProjectProgress(
+                        project_id=project_id, kind=kind, key=key,
+                        completed=completed, total=total,
+                    ))
+
+        counts = stages.get(project_id, {}).values()
+        summaries.append(Project(
+            id=project_id,
+            completed_tasks=sum(completed for completed, _ in counts),
+            total_tasks=sum(total for _, total in counts),
+        ))
+
+    ProjectProgress.objects.filter(project_id__in=scope).delete()
+    ProjectProgress.objects.bulk_create(counters, batch_size=500)
+    Project.objects.bulk_update(summaries, ["completed_tasks", "total_tasks"], batch_size=500)
+    return len(summaries)
@@ -0,0 +1,100 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+
+# label -> longest-edge box, output format and encoder quality.
+# Override per label in settings.PHOTO_RENDITIONS.
+DEFAULT_RENDITIONS = {
+    "thumbnail": {"size": (480, 480), "format": "WEBP", "quality": 75},
+    "preview": {"size": (1600, 1600), "format": "WEBP", "quality": 82},
+}
+
+EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg", "PNG": "png"}
+
+# EXIF orientations that rotate the image by 90/270 degrees.
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def rendition_specs():
+    specs = {label: dict(spec) for label, spec in DEFAULT_RENDITIONS.items()}
+    for label, spec in getattr(settings, "PHOTO_RENDITIONS", {}).items():
+        specs.setdefault(label, {}).update(spec)
+    return specs
+
+
+def rendition_name(original_name, label, image_format):
+    """Rendition file name stored next to the original upload."""
+    root, _ = os.path.splitext(original_name)
+    return f"{root}_{label}.{EXTENSIONS.get(image_format, image_format.lower())}"
+
+
+def render_renditions(source, specs=None):
+    """
+    Decode `source` (a path or file object) once and encode every rendition.
+
+    Pure Pillow work with no database access, so it can run in a worker
+    process. Returns {"width", "height", "renditions": {label: {"content",
+    "format", "width", "height"}}} where width/height are the oriented
+    dimensions of the original.
+    """
+    specs = specs or rendition_specs()
+    largest = max(max(spec["size"]) for spec in specs.values())
+
+    with Image.open(source) as image:
+        width, height = image.size
+        if image.getexif().get(0x0112) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+
+        # Let the JPEG decoder downscale while decoding.
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+
+        renditions = {}
+        for label, spec in specs.items():
+            image_format = spec.get("format", "WEBP").upper()
+            resized = image.copy()
+            resized.thumbnail(spec["size"], Image.Resampling.LANCZOS)
+            if image_format == "JPEG" and resized.mode not in ("RGB", "L"):
+                resized = resized.convert("RGB")
+
+            buffer = BytesIO()
+            resized.save(buffer, image_format, quality=spec.get("quality", 80), optimize=True)
+            renditions[label] = {
+                "content": buffer.getvalue(),
+                "format": image_format,
+                "width": resized.width,
+                "height": resized.height,
+            }
+
+    return {"width": width, "height": height, "renditions": renditions}
+
+
+def store_renditions(photo, result):
+    """
+    Write rendered files next to the original and record names and
+    dimensions on the ProjectPhoto row (without re-sending post_save).
+    """
+    from .models import ProjectPhoto
+
+    storage = photo.image.storage
+    fields = {"width": result["width"], "height": result["height"]}
+
+    for label, rendition in result["renditions"].items():
+        if not hasattr(photo, label):
+            continue
+        name = rendition_name(photo.image.name, label, rendition["format"])
+        if storage.exists(name):
+            storage.delete(name)
+        fields[label] = storage.save(name, ContentFile(rendition["content"]))
+        fields[f"{label}_width"] = rendition["width"]
+        fields[f"{label}_height"] = rendition["height"]
+
+    ProjectPhoto.objects.filter(pk=photo.pk).update(**fields)
+    for field, value in fields.items():
+        setattr(photo, field, value)
+    return fields
+
@@ -0,0 +1,102 @@
+"""
+Sessions page: active projects bucketed by event month in SQL and served
+a few months at a time. The cursor is the last month already sent
+("YYYY-MM"); months run forward for upcoming sessions and backward for
+past ones, so both tabs open on the months nearest to today.
+"""
+from datetime import date
+from itertools import groupby
+
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+from core.search import search_filter
+from .models import Project
+
+
+SESSION_STATUSES = ("pre_production", "selection", "post_production")
+SESSION_TABS = ("upcoming", "past", "decided")
+
+MONTHS_PER_PAGE = 3
+
+TBD_LABEL = "To Be Decided"
+
+
+def session_projects(tab, search="", today=None):
+    """Active projects of one tab, optionally narrowed by ?search=."""
+    today = today or date.today()
+    projects = Project.objects.filter(status__in=SESSION_STATUSES)
+
+    if tab == "past":
+        projects = projects.filter(start_date__isnull=False, start_date__lt=today)
+    elif tab == "decided":
+        projects = projects.filter(start_date__isnull=True)
+    else:
+        projects = projects.filter(start_date__isnull=False, start_date__gte=today)
+
+    return search_filter(projects, "project", search)
+
+
+def parse_month_cursor(value):
+    """'YYYY-MM' -> first day of that month; None when empty."""
+    if not value:
+        return None
+    try:
+        year, month = value.split("-")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def month_end(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def month_buckets(projects, descending=False, after=None, limit=MONTHS_PER_PAGE):
+    """
+    Up to `limit` [{"month", "count"}] rows after the `after` month, from
+    one grouped query. Returns (buckets, has_more).
+    """
+    months = projects.annotate(month=TruncMonth("start_date")).values("month")
+    if after:
+        months = months.filter(month__lt=after) if descending else months.filter(month__gt=after)
+
+    buckets = list(
+        months.annotate(count=Count("id")).order_by("-month" if descending else "month")[:limit + 1]
+    )
+    return buckets[:limit], len(buckets) > limit
+
+
+def sessions_page(tab, search="", cursor=None, today=None):
+    """
+    One page of the sessions list: {"groups": [{"label", "month", "count",
+    "projects"}], "next_cursor": "YYYY-MM" or None}.
+    """
+    projects = session_projects(tab, search, today)
+
+    if tab == "decided":
+        rows = list(projects.prefetch_related("team").order_by("id"))
+        groups = [{"label": TBD_LABEL, "month": None, "count": len(rows), "projects": rows}] if rows else []
+        return {"groups": groups, "next_cursor": None}
+
+    descending = tab == "past"
+    buckets, has_more = month_buckets(projects, descending, parse_month_cursor(cursor))
+    if not buckets:
+        return {"groups": [], "next_cursor": None}
+
+    first = min(bucket["month"] for bucket in buckets)
+    last = max(bucket["month"] for bucket in buckets)
+    rows = (
+        projects.filter(start_date__gte=first, start_date__lt=month_end(last))
+        .annotate(month=TruncMonth("start_date"))
+        .prefetch_related("team")
+        .order_by("-start_date" if descending else "start_date", "id")
+    )
+
+    counts = {bucket["month"]: bucket["count"] for bucket in buckets}
+    groups = [
+        {"label": month.strftime("%B %Y"), "month": month, "count": counts[month], "projects": list(items)}
+        for month, items in groupby(rows, key=lambda project: project.month)
+    ]
+    # Buckets come in page order, so the last one is where the next page starts.
+    return {"groups": groups, "next_cursor": buckets[-1]["month"].strftime("%Y-%m") if has_more else None}
@@ -1,8 +1,19 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import Project, PhotoSelection, ProjectPhoto
+from leads.models import Lead
+from .availability import sync_project_bookings
+from .calendar import CALENDAR_FIELDS, bury, touch_projects
+from .models import Project, PhotoSelection, ProjectPhoto, ProjectTask, StaffBooking
+from .progress import record_task_change
+from core.jobs import enqueue
+from core.search import register as register_search
 import uuid
 
+SEARCH_FIELDS = ("code", "client_name", "event_type")
+
+register_search("project", Project, SEARCH_FIELDS)
+
 @receiver(post_save, sender=Project)
 def create_assets_on_status_change(sender, instance, created, **kwargs):
     """
@@ -31,4 +42,109 @@ def create_assets_on_status_change(sender, instance, created, **kwargs):
             )
 
         # Attach all project photos to this selection
-        ProjectPhoto.objects.filter(project=instance, selection__isnull=True).update(selection=selection)
\ No newline at end of file
+        ProjectPhoto.objects.filter(project=instance, selection__isnull=True).update(selection=selection)
+
+
+@receiver(post_delete, sender=ProjectTask)
+def release_task_progress(sender, instance, **kwargs):
+    """
+    Decrement the stored progress counters for a deleted task.
+    """
+    previous = getattr(instance, "_loaded_state", None) or instance.progress_state()
+    record_task_change(instance.project_id, previous, None)
+
+
+@receiver(post_save, sender=ProjectPhoto)
+def queue_photo_ingest(sender, instance, created, **kwargs):
+    """
+    Queue background ingest (renditions + hash) for new uploads; the
+    `run_jobs` worker picks it up once the row is committed.
+    """
+    if instance.image and instance.processing_status == ProjectPhoto.PROCESSING_PENDING:
+        transaction.on_commit(lambda: enqueue("photo_ingest", instance.pk))
+
+
+# Fields that move a project's booked slots.
+BOOKING_FIELDS = {"start_date", "end_date"}
+
+
+@receiver(m2m_changed, sender=Project.team.through)
+def sync_team_bookings(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep StaffBooking rows in step with team assignments made from either
+    side (project.team / user.projects).
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        sync_project_bookings([instance.pk])
+    elif action == "post_clear":
+        StaffBooking.objects.filter(user=instance).delete()
+    else:
+        sync_project_bookings(pk_set)
+
+
+@receiver(post_save, sender=Project)
+def sync_project_dates(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields and not BOOKING_FIELDS & set(update_fields)):
+        return
+    sync_project_bookings([instance.pk])
+
+
+@receiver(post_save, sender=Lead)
+def sync_lead_dates(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields and not set(Lead.SLOT_SOURCE_FIELDS) & set(update_fields)):
+        return
+    project_ids = list(Project.objects.filter(lead=instance).values_list("pk", flat=True))
+    if project_ids:
+        sync_project_bookings(project_ids)
+
+
+# ---------- Calendar feed versions ----------
+@receiver(pre_save, sender=Project)
+def remember_calendar_fields(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._calendar_previous = None
+    if raw or instance.pk is None or (update_fields and not set(CALENDAR_FIELDS) & set(update_fields)):
+        return
+    instance._calendar_previous = Project.objects.filter(pk=instance.pk).values(*CALENDAR_FIELDS).first()
+
+
+@receiver(post_save, sender=Project)
+def bump_calendar_version(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_calendar_previous", None)
+    if created or (previous and any(previous[field] != getattr(instance, field) for field in CALENDAR_FIELDS)):
+        instance.calendar_seq = touch_projects([instance.pk])
+
+
+@receiver(m2m_changed, sender=Project.team.through)
+def bump_calendar_team(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Team changes move events in and out of personal feeds: removed members
+    get a tombstone and the project a new version (its attendee list changed).
+    """
+    if action == "pre_clear":
+        related = instance.projects if reverse else instance.team
+        instance._calendar_cleared = set(related.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    changed = pk_set if action != "post_clear" else getattr(instance, "_calendar_cleared", set())
+    if not changed:
+        return
+
+    if action != "post_add":
+        if reverse:
+            for project_id in changed:
+                bury(project_id, [instance.pk])
+        else:
+            bury(instance.pk, changed)
+    touch_projects(changed if reverse else [instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+def bury_calendar_event(sender, instance, **kwargs):
+    bury(instance.pk)
+
@@ -0,0 +1,50 @@
+from django.conf import settings
+
+
+# Default checklist titles per task stage. Keys inside a stage are event
+# types (matched case-insensitively); "default" applies to everything else.
+#
+# Override or extend in settings, e.g.
+#   PROJECT_TASK_TEMPLATES = {"pre": {"Birthday": ["Planning", "Main Coverage"]}}
+DEFAULT_TASK_TEMPLATES = {
+    "pre": {
+        "default": [
+            "Planning & Wedding",
+            "Hard Disk",
+            "Pre Wedding Shoot",
+            "Main Coverage",
+            "Equipment Check",
+            "Team Assignment",
+            "Venue Recce",
+        ],
+    },
+    "selection": {
+        "default": [
+            "Initial Culling",
+            "Final Culling",
+            "Color Correction",
+            "Preview Gallery Creation",
+        ],
+    },
+}
+
+
+def get_task_templates():
+    templates = {stage: dict(by_event) for stage, by_event in DEFAULT_TASK_TEMPLATES.items()}
+    for stage, by_event in getattr(settings, "PROJECT_TASK_TEMPLATES", {}).items():
+        templates.setdefault(stage, {}).update(by_event)
+    return templates
+
+
+def task_titles(stage, event_type=None):
+    """
+    Checklist titles to seed for a stage, picking the event-type specific
+    template when one is registered.
+    """
+    by_event = get_task_templates().get(stage, {})
+    if event_type:
+        wanted = event_type.strip().lower()
+        for name, titles in by_event.items():
+            if name.lower() == wanted:
+                return list(titles)
+    return list(by_event.get("default", []))
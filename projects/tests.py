@@ -1,3 +1,642 @@
-from django.test import TestCase
+import json
+import tempfile
+from datetime import date
+from io import BytesIO, StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from accounts.models import User
+from leads.models import Lead
+from .models import PhotoSelection, Project, ProjectPhoto, ProjectProgress, StaffBooking
+from .calendar import feed_token
+from .progress import rebuild_progress, stored_progress
+from .renditions import render_renditions
+from .task_templates import DEFAULT_TASK_TEMPLATES, task_titles
+
+
+def add_project(code, lead_fields=None, **fields):
+    """A project and its lead; a stage status seeds tasks/selection as usual."""
+    lead = Lead.objects.create(name=code, **(lead_fields or {}))
+    return Project.objects.create(lead=lead, code=code, **{"client_name": code, "event_type": "Wedding", **fields})
+
+
+def post_json(client, url, payload):
+    return client.post(url, json.dumps(payload), content_type="application/json")
+
+
+class ProjectViewQueryCountTests(TestCase):
+    """
+    Board, list and overview must run a constant number of queries no matter
+    how many projects are on screen.
+    """
+
+    STATUSES = ("to_assign", "pre_production", "selection", "post_production", "completed")
+
+    def setUp(self):
+        self.member = User.objects.create_user(username="shooter", password="pw")
+
+    def add_projects(self, count):
+        for _ in range(count):
+            for status in self.STATUSES:
+                lead = Lead.objects.create(name=f"Client {Lead.objects.count()}")
+                project = Project.objects.create(
+                    lead=lead,
+                    code=f"PRJ-{lead.id}",
+                    client_name=lead.name,
+                    event_type="Wedding",
+                    status=status,
+                )
+                project.tasks.create(title="Post Album", stage="post")
+                project.team.add(self.member)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, url):
+        self.add_projects(1)
+        small = self.count_queries(url)
+        self.add_projects(4)
+        large = self.count_queries(url)
+        self.assertEqual(small, large)
+
+    def test_board_query_count_is_constant(self):
+        self.assertConstantQueries(reverse("projects:board"))
+
+    def test_list_query_count_is_constant(self):
+        self.assertConstantQueries(reverse("projects:list"))
+
+    def test_overview_query_count_is_constant(self):
+        self.assertConstantQueries(reverse("projects:overview"))
+
+    def test_list_pre_production_progress(self):
+        self.add_projects(1)
+        project = Project.objects.get(status="pre_production")
+        task = project.tasks.get(title="Hard Disk")
+        task.is_completed = True
+        task.save()
+
+        response = self.client.get(reverse("projects:list"))
+        row = next(
+            p for p in response.context["grouped_projects"]["pre_production"]
+            if p.id == project.id
+        )
+        self.assertIn(("Hard Disk", 1, 1), row.stage_tasks)
+        self.assertEqual(project.task_progress("Hard Disk"), (1, 1))
+
+
+class ProjectProgressCounterTests(TestCase):
+
+    def setUp(self):
+        self.project = add_project("PRJ-C", status="pre_production")
+
+    def snapshot(self):
+        self.project.refresh_from_db()
+        rows = ProjectProgress.objects.filter(project=self.project)
+        return (
+            self.project.completed_tasks,
+            self.project.total_tasks,
+            sorted(rows.values_list("kind", "key", "completed", "total")),
+        )
+
+    def test_deltas_match_full_rebuild(self):
+        task = self.project.tasks.get(title="Hard Disk")
+        task.is_completed = True
+        task.save()
+        self.project.tasks.create(title="Extra Planning Call", stage="pre")
+        self.project.tasks.get(title="Venue Recce").delete()
+
+        incremental = self.snapshot()
+        rebuild_progress([self.project.id])
+        self.assertEqual(incremental, self.snapshot())
+
+        self.assertEqual(self.project.stage_progress("pre"), (1, 7))
+        counters = stored_progress([self.project.id], "keyword")[self.project.id]
+        self.assertEqual(counters["Planning"], (0, 2))
+        self.assertEqual(counters["Hard Disk"], (1, 1))
+
+    def test_toggle_does_not_recount(self):
+        task = self.project.tasks.get(title="Hard Disk")
+        task.is_completed = True
+        with CaptureQueriesContext(connection) as ctx:
+            task.save()
+        self.assertFalse(any("COUNT(" in q["sql"] for q in ctx.captured_queries))
+
+    def test_stale_instance_counts_a_toggle_once(self):
+        first = self.project.tasks.get(title="Hard Disk")
+        stale = self.project.tasks.get(title="Hard Disk")
+        for task in (first, stale):
+            task.is_completed = True
+            task.save()
+
+        incremental = self.snapshot()
+        self.assertEqual(self.project.stage_progress("pre"), (1, 7))
+        rebuild_progress([self.project.id])
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_queryset_update_keeps_counters(self):
+        self.project.tasks.filter(title__icontains="Planning").update(is_completed=True)
+
+        incremental = self.snapshot()
+        self.assertEqual(stored_progress([self.project.id], "keyword")[self.project.id]["Planning"], (1, 1))
+        rebuild_progress([self.project.id])
+        self.assertEqual(incremental, self.snapshot())
+
+
+class TaskTemplateTests(TestCase):
+
+    BIRTHDAY = {"pre": {"birthday": ["Planning", "Main Coverage"]}}
+
+    def titles(self, project):
+        return list(project.tasks.filter(stage="pre").order_by("id").values_list("title", flat=True))
+
+    def test_registry_defaults_and_overrides(self):
+        self.assertEqual(task_titles("pre"), DEFAULT_TASK_TEMPLATES["pre"]["default"])
+        self.assertEqual(task_titles("post"), [])
+        with override_settings(PROJECT_TASK_TEMPLATES=self.BIRTHDAY):
+            self.assertEqual(task_titles("pre", " Birthday "), ["Planning", "Main Coverage"])
+            self.assertEqual(task_titles("pre", "Wedding"), DEFAULT_TASK_TEMPLATES["pre"]["default"])
+            self.assertEqual(task_titles("selection", "Birthday"), DEFAULT_TASK_TEMPLATES["selection"]["default"])
+
+    def test_event_type_template_is_seeded(self):
+        with override_settings(PROJECT_TASK_TEMPLATES=self.BIRTHDAY):
+            project = add_project("PRJ-B", event_type="Birthday", status="pre_production")
+        self.assertEqual(self.titles(project), ["Planning", "Main Coverage"])
+        wedding = add_project("PRJ-W", status="pre_production")
+        self.assertEqual(self.titles(wedding), DEFAULT_TASK_TEMPLATES["pre"]["default"])
+
+    def test_seeding_twice_changes_nothing(self):
+        project = add_project("PRJ-W", status="pre_production")
+        task = project.tasks.get(title="Hard Disk")
+        task.is_completed = True
+        task.save()
+        before = (self.titles(project), stored_progress([project.id], "stage"))
+
+        project.seed_tasks("pre")
+        project.refresh_from_db()
+        self.assertEqual((self.titles(project), stored_progress([project.id], "stage")), before)
+        self.assertEqual((project.completed_tasks, project.total_tasks), (1, 7))
+
+
+class ProjectFinancialsTests(TestCase):
+
+    def test_with_financials_matches_properties(self):
+        from invoices.models import Invoice
+
+        project = add_project("PRJ-F", {"amount": 1000})
+        Invoice.objects.create(project=project, invoice_number="INV-F1", subtotal=300, total=300, paid_amount=100)
+        Invoice.objects.create(project=project, invoice_number="INV-F2", subtotal=200, total=200, paid_amount=150)
+
+        expected = (project.total_invoiced, project.total_paid, project.remaining_amount)
+        self.assertEqual(expected, (500, 250, 750))
+
+        with self.assertNumQueries(1):
+            annotated = Project.objects.with_financials().get(pk=project.pk)
+            self.assertEqual(
+                (annotated.total_invoiced, annotated.total_paid, annotated.remaining_amount),
+                expected,
+            )
+
+        # Project + lead, then the prefetched invoices; no aggregates.
+        with self.assertNumQueries(2):
+            prefetched = Project.objects.select_related("lead").prefetch_related("invoices").get(pk=project.pk)
+            self.assertEqual(
+                (prefetched.total_invoiced, prefetched.total_paid, prefetched.remaining_amount),
+                expected,
+            )
+
+
+def jpeg_bytes(size, orientation=None):
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, "JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+class PhotoRenditionTests(TestCase):
+
+    def setUp(self):
+        self.enterContext(override_settings(MEDIA_ROOT=self.enterContext(tempfile.TemporaryDirectory())))
+        self.project = add_project("PRJ-R")
+
+    def add_photo(self, content, name="photo.jpg"):
+        # The ingest job is queued on commit, which never happens inside TestCase.
+        return ProjectPhoto.objects.create(project=self.project, image=SimpleUploadedFile(name, content))
+
+    def generate(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command("generate_renditions", *args, stdout=out, stderr=err)
+        return out.getvalue()
+
+    def test_renditions_fit_their_boxes(self):
+        result = render_renditions(BytesIO(jpeg_bytes((3200, 2000))))
+        self.assertEqual((result["width"], result["height"]), (3200, 2000))
+
+        thumbnail = result["renditions"]["thumbnail"]
+        self.assertEqual((thumbnail["format"], thumbnail["width"], thumbnail["height"]), ("WEBP", 480, 300))
+        preview = result["renditions"]["preview"]
+        self.assertEqual((preview["width"], preview["height"]), (1600, 1000))
+        with Image.open(BytesIO(preview["content"])) as image:
+            self.assertEqual(image.size, (1600, 1000))
+
+    def test_exif_orientation_is_applied(self):
+        specs = {"thumbnail": {"size": (50, 50), "format": "PNG"}}
+        result = render_renditions(BytesIO(jpeg_bytes((200, 100), orientation=6)), specs)
+        self.assertEqual((result["width"], result["height"]), (100, 200))
+
+        thumbnail = result["renditions"]["thumbnail"]
+        self.assertEqual((thumbnail["width"], thumbnail["height"]), (25, 50))
+
+    def test_command_skips_rendered_photos_unless_forced(self):
+        photo = self.add_photo(jpeg_bytes((800, 600)))
+
+        self.assertIn("for 1 photo(s), 0 skipped, 0 failed", self.generate())
+        photo.refresh_from_db()
+        self.assertEqual(photo.processing_status, ProjectPhoto.PROCESSING_READY)
+        self.assertEqual((photo.thumbnail_width, photo.thumbnail_height), (480, 360))
+        self.assertTrue(photo.thumbnail.storage.exists(photo.thumbnail.name))
+        self.assertEqual(len(photo.sha256), 64)
+
+        self.assertIn("for 0 photo(s)", self.generate())
+        self.assertIn("for 1 photo(s)", self.generate("--force"))
+
+    def test_corrupt_photo_fails_without_stopping_the_batch(self):
+        broken = self.add_photo(b"not an image", name="broken.jpg")
+        good = self.add_photo(jpeg_bytes((100, 100)))
+
+        self.assertIn("for 1 photo(s), 0 skipped, 1 failed", self.generate())
+        broken.refresh_from_db()
+        good.refresh_from_db()
+        self.assertEqual(broken.processing_status, ProjectPhoto.PROCESSING_FAILED)
+        self.assertEqual(good.processing_status, ProjectPhoto.PROCESSING_READY)
+
+
+class PhotoProcessingStatusTests(TestCase):
+
+    def setUp(self):
+        self.project = add_project("PRJ-PS")
+        ProjectPhoto.objects.bulk_create([ProjectPhoto(project=self.project, image="project_photos/ps.jpg")])
+        self.url = reverse("projects:photo_processing_status", args=[self.project.id])
+
+    def fetch_as(self, user):
+        self.client.force_login(user)
+        return self.client.get(self.url)
+
+    def test_team_and_admins_only(self):
+        member = User.objects.create_user(username="member", password="pw")
+        self.project.team.add(member)
+        admin = User.objects.create_user(username="boss", password="pw", is_staff=True)
+        outsider = User.objects.create_user(username="outsider", password="pw")
+
+        self.assertEqual(self.fetch_as(member).json()["counts"]["pending"], 1)
+        self.assertEqual(self.fetch_as(admin).status_code, 200)
+        self.assertEqual(self.fetch_as(outsider).status_code, 403)
+
+
+class StaffAvailabilityTests(TestCase):
+
+    def setUp(self):
+        self.shooter = User.objects.create_user(username="shooter", password="pw", photography_role="photographer")
+        self.spare = User.objects.create_user(username="spare", password="pw", photography_role="photographer")
+        self.client.force_login(User.objects.create_user(username="boss", password="pw", is_staff=True))
+
+    def toggle(self, project, user, **extra):
+        return post_json(
+            self.client, reverse("projects:toggle_project_member"),
+            {"project_id": project.id, "user_id": user.id, **extra},
+        )
+
+    def test_bookings_follow_team_and_dates(self):
+        project = add_project("PRJ-A", {"event_start_date": date(2026, 5, 1), "event_end_date": date(2026, 5, 2)})
+        project.team.add(self.shooter)
+        self.assertEqual(StaffBooking.objects.filter(user=self.shooter).count(), 4)
+
+        project.end_date = date(2026, 5, 1)
+        project.save()
+        self.assertEqual(StaffBooking.objects.filter(user=self.shooter).count(), 2)
+
+        project.team.remove(self.shooter)
+        self.assertFalse(StaffBooking.objects.exists())
+
+    def test_toggle_member_reports_conflicts_until_overridden(self):
+        booked = add_project("PRJ-A", {"event_start_date": date(2026, 5, 1), "event_end_date": date(2026, 5, 2)})
+        booked.team.add(self.shooter)
+        clash = add_project("PRJ-B", {
+            "event_start_date": date(2026, 5, 2), "event_start_session": "EVE", "event_end_date": date(2026, 5, 2),
+        })
+
+        response = self.toggle(clash, self.shooter)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([p["code"] for p in response.json()["conflicts"]], ["PRJ-A"])
+        self.assertFalse(clash.team.exists())
+
+        self.assertEqual(self.toggle(clash, self.shooter, override=True).status_code, 200)
+        self.assertTrue(clash.team.filter(pk=self.shooter.pk).exists())
+
+    def test_availability_lists_free_and_busy_staff(self):
+        project = add_project("PRJ-A", {
+            "event_start_date": date(2026, 5, 1), "event_start_session": "EVE", "event_end_date": date(2026, 5, 1),
+        })
+        project.team.add(self.shooter)
+        url = reverse("projects:staff_availability")
+
+        data = self.client.get(url, {"from": "2026-05-01", "to": "2026-05-01", "role": "photographer"}).json()
+        self.assertEqual([u["username"] for u in data["free"]], ["spare"])
+        self.assertEqual(data["busy"][0]["bookings"][0]["code"], "PRJ-A")
+
+        # The morning is still open.
+        data = self.client.get(url, {"from": "2026-05-01", "to_session": "MOR"}).json()
+        self.assertEqual({u["username"] for u in data["free"]}, {"boss", "shooter", "spare"})
+
+
+class SessionsPageTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user(username="viewer", password="pw"))
+        for month in range(1, 6):
+            for day in (3, 17):
+                lead = Lead.objects.create(name=f"Client {month}-{day}")
+                Project.objects.create(
+                    lead=lead, code=f"PRJ-{month}-{day}", client_name=lead.name,
+                    event_type="Wedding", status="pre_production", start_date=date(2020, month, day),
+                )
+
+    def fetch(self, **params):
+        response = self.client.get(
+            reverse("projects:sessions"), {"type": "past", **params}, HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_past_months_are_served_newest_first_by_cursor(self):
+        first = self.fetch()
+        self.assertIn("May 2020", first["html"])
+        self.assertNotIn("February 2020", first["html"])
+        self.assertEqual(first["next_cursor"], "2020-03")
+
+        second = self.fetch(cursor=first["next_cursor"])
+        self.assertIn("February 2020", second["html"])
+        self.assertIn("January 2020", second["html"])
+        self.assertNotIn("March 2020", second["html"])
+        self.assertIsNone(second["next_cursor"])
+
+    def test_page_query_count_is_constant(self):
+        # session + user, month buckets, projects, team prefetch
+        with self.assertNumQueries(5):
+            self.fetch()
+
+
+class CalendarFeedTests(TestCase):
+
+    def setUp(self):
+        self.member = User.objects.create_user(username="shooter", password="pw")
+        start = date(2026, 6, 1)
+        self.project = add_project("PRJ-CAL", client_name="Asha", venue="Hall 1, Chennai", start_date=start, end_date=start)
+        self.project.team.add(self.member)
+        self.url = reverse("projects:calendar_feed", args=[feed_token(self.member)])
+
+    def fetch(self, **headers):
+        response = self.client.get(self.url, **headers)
+        body = b"".join(response.streaming_content).decode() if response.status_code == 200 else ""
+        return response, body
+
+    def test_feed_lists_assigned_events(self):
+        response, body = self.fetch()
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        self.assertIn("SUMMARY:Asha Wedding", body)
+        self.assertIn("LOCATION:Hall 1\\, Chennai", body)
+        self.assertIn("DTSTART;VALUE=DATE:20260601", body)
+        self.assertNotIn("PRJ-OTHER", body)
+
+    def test_unchanged_feed_is_not_regenerated(self):
+        response, _ = self.fetch()
+        with self.assertNumQueries(3):
+            again, _ = self.fetch(HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        self.project.venue = "Hall 2"
+        self.project.save()
+        self.assertEqual(self.fetch(HTTP_IF_NONE_MATCH=response["ETag"])[0].status_code, 200)
+
+    def test_if_modified_since_revalidates(self):
+        response, _ = self.fetch()
+        again, _ = self.fetch(HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_sync_token_returns_only_changes(self):
+        token = self.fetch()[0]["X-Sync-Token"]
+        other = add_project("PRJ-NEW", start_date=date(2026, 7, 1), end_date=date(2026, 7, 1))
+        other.team.add(self.member)
+        self.project.team.remove(self.member)
+
+        response = self.client.get(self.url, {"sync_token": token})
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual(body.count("BEGIN:VEVENT"), 2)
+        self.assertIn(f"UID:project-{other.pk}@", body)
+        self.assertIn("STATUS:CANCELLED", body)
+        self.assertGreater(int(response["X-Sync-Token"]), int(token))
+
+    def test_bad_token_is_404(self):
+        self.assertEqual(self.client.get(reverse("projects:calendar_feed", args=["nope"])).status_code, 404)
+
+
+class SelectionGalleryTests(TestCase):
+
+    def setUp(self):
+        self.project = add_project("PRJ-G")
+        self.selection = PhotoSelection.objects.create(project=self.project, password="secret")
+        # bulk_create skips the ingest signal; no files are needed for paging.
+        self.photos = ProjectPhoto.objects.bulk_create([
+            ProjectPhoto(project=self.project, selection=self.selection, image=f"project_photos/{n}.jpg")
+            for n in range(5)
+        ])
+        session = self.client.session
+        session["selection_access"] = str(self.selection.token)
+        session.save()
+        self.url = reverse("projects:selection_photos", args=[self.selection.token])
+
+    def page(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pages_follow_the_cursor(self):
+        ids = [photo.id for photo in self.photos]
+
+        first = self.page(limit=2)
+        self.assertEqual([photo["id"] for photo in first["photos"]], ids[:2])
+        self.assertEqual(first["next_cursor"], ids[1])
+
+        second = self.page(limit=2, after=first["next_cursor"])
+        self.assertEqual([photo["id"] for photo in second["photos"]], ids[2:4])
+
+        last = self.page(limit=2, after=second["next_cursor"])
+        self.assertEqual([photo["id"] for photo in last["photos"]], ids[4:])
+        self.assertIsNone(last["next_cursor"])
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(len(self.page()["photos"]), 5)
+        for limit in (0, -5):
+            data = self.page(limit=limit)
+            self.assertEqual(len(data["photos"]), 1)
+            self.assertEqual(data["next_cursor"], self.photos[0].id)
+
+    def test_bad_limit_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {"limit": "many"}).status_code, 400)
+
+    def test_requires_selection_access(self):
+        self.client.session.flush()
+        self.client.cookies.clear()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class ToggleTasksBatchTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user(username="boss", password="pw", is_staff=True))
+        self.first = add_project("PRJ-T1", status="pre_production")
+        self.second = add_project("PRJ-T2", status="pre_production")
+
+    def post(self, payload):
+        return post_json(self.client, reverse("projects:toggle_tasks"), payload)
+
+    def counters(self, project):
+        project.refresh_from_db()
+        return project.completed_tasks, project.total_tasks
+
+    def test_batch_is_one_bulk_update_with_per_project_deltas(self):
+        first_tasks = list(self.first.tasks.order_by("id")[:2])
+        second_task = self.second.tasks.order_by("id").first()
+        payload = {"tasks": [
+            {"task_id": first_tasks[0].id, "completed": True},
+            {"task_id": first_tasks[1].id, "completed": True},
+            {"task_id": second_task.id, "completed": True},
+        ]}
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.post(payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 3)
+        task_updates = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith('UPDATE "projects_projecttask"')
+        ]
+        self.assertEqual(len(task_updates), 1)
+
+        total = self.first.tasks.count()
+        self.assertEqual(self.counters(self.first), (2, total))
+        self.assertEqual(self.counters(self.second), (1, self.second.tasks.count()))
+        self.assertEqual(response.json()["projects"][str(self.first.id)]["completed"], 2)
+
+        # Un-completing one task only moves that project's counters.
+        self.post({"tasks": [{"task_id": first_tasks[0].id, "completed": False}]})
+        self.assertEqual(self.counters(self.first), (1, total))
+        self.assertEqual(self.counters(self.second)[0], 1)
+
+        incremental = (self.counters(self.first), self.counters(self.second))
+        rebuild_progress([self.first.id, self.second.id])
+        self.assertEqual(incremental, (self.counters(self.first), self.counters(self.second)))
+
+    def test_unknown_task_ids_change_nothing(self):
+        task = self.first.tasks.first()
+        response = self.post({"tasks": [
+            {"task_id": task.id, "completed": True},
+            {"task_id": 999999, "completed": True},
+        ]})
+        self.assertEqual(response.status_code, 404)
+        task.refresh_from_db()
+        self.assertFalse(task.is_completed)
+
+    def test_malformed_payloads_are_rejected(self):
+        task = self.first.tasks.first()
+        for payload in (
+            {"tasks": "all"},
+            {"tasks": []},
+            {"tasks": [{"completed": True}]},
+            {"tasks": [{"task_id": "abc", "completed": True}]},
+            {"tasks": [{"task_id": task.id, "completed": "false"}]},
+            {"tasks": [{"task_id": task.id, "completed": 0}]},
+            {"tasks": [{"task_id": task.id}]},
+            [{"task_id": task.id, "completed": True}],
+        ):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, 400)
+        task.refresh_from_db()
+        self.assertFalse(task.is_completed)
+
+
+class SaveClientSelectionTests(TestCase):
+
+    def setUp(self):
+        # The selection stage creates the PhotoSelection and its tasks.
+        self.project = add_project("PRJ-S1", status="selection")
+        self.selection = self.project.selection
+        self.photos = self.add_photos(self.project, 3)
+        # A photo from another client's gallery.
+        self.foreign = self.add_photos(add_project("PRJ-S2", status="selection"), 1)[0]
+
+        session = self.client.session
+        session["selection_access"] = str(self.selection.token)
+        session.save()
+        self.url = reverse("projects:save_client_selection", args=[self.selection.token])
+
+    def add_photos(self, project, count):
+        return ProjectPhoto.objects.bulk_create([
+            ProjectPhoto(project=project, selection=project.selection, image=f"project_photos/{project.code}-{n}.jpg")
+            for n in range(count)
+        ])
+
+    def post(self, payload):
+        return post_json(self.client, self.url, payload)
+
+    def selected(self):
+        return set(ProjectPhoto.objects.filter(is_selected=True).values_list("id", flat=True))
+
+    def test_writes_are_scoped_to_the_selection(self):
+        response = self.post({"added": [self.photos[0].id, self.foreign.id], "autosave": True})
+        self.assertEqual(response.json()["added"], 1)
+        self.assertEqual(self.selected(), {self.photos[0].id})
+
+        # The legacy full list is diffed, and foreign ids are still ignored.
+        self.post({"selected_ids": [self.photos[1].id, self.foreign.id], "autosave": True})
+        self.assertEqual(self.selected(), {self.photos[1].id})
+
+    def test_autosave_does_not_submit(self):
+        response = self.post({"added": [self.photos[0].id], "autosave": True})
+        self.assertFalse(response.json()["submitted"])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, "selection")
+        self.assertFalse(self.project.tasks.filter(stage="selection", is_completed=True).exists())
+
+    def test_submit_advances_the_project(self):
+        response = self.post({"added": [self.photos[0].id]})
+        self.assertTrue(response.json()["submitted"])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, "post_production")
+        self.assertFalse(self.project.tasks.filter(stage="selection", is_completed=False).exists())
+
+    def test_malformed_payloads_are_rejected(self):
+        for payload in (
+            {"added": "123"},
+            {"removed": 5},
+            {"selected_ids": "1,2"},
+            {"added": [True]},
+            {"added": ["x"]},
+            [self.photos[0].id],
+        ):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, 400)
+        self.assertEqual(self.selected(), set())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, "selection")
 
-# Create your tests here.
@@ -6,19 +6,25 @@ app_name = "projects"
 urlpatterns = [
     path("board/", views.projects_board, name="board"),
     path("<int:project_id>/sessions/", views.project_sessions, name="project_sessions"),
+    path("<int:project_id>/photos/status/", views.photo_processing_status, name="photo_processing_status"),
     path("list/", views.projects_list, name="list"),
     path("overview/", views.projects_overview, name="overview"),
+    path("availability/", views.staff_availability, name="staff_availability"),
+    path("calendar/", views.calendar_links, name="calendar_links"),
+    path("calendar/<str:token>.ics", views.calendar_feed, name="calendar_feed"),
 
     # AJAX mutations
     path("toggle-member/", views.toggle_project_member, name="toggle_project_member"),
     path("update-field/", views.update_project_field, name="update_project_field"),
     path("update-status/", views.update_project_status, name="update_project_status"),
     path("toggle-task/", views.toggle_task, name="toggle_task"),
+    path("toggle-tasks/", views.toggle_tasks, name="toggle_tasks"),
     path("projects/filter/", views.projects_filtered_partial, name="projects_filter"),
     
 
     # Client selection (only token version)
     path("selection/<uuid:token>/", views.client_selection, name="client_selection"),
+    path("selection/<uuid:token>/photos/", views.selection_photos, name="selection_photos"),
     path("selection/<uuid:token>/save/", views.save_client_selection, name="save_client_selection"),
 
     # Session management
@@ -1,4 +1,6 @@
-from django.db.models import Q
+from core.search import search_filter
+from .models import Project
+from .progress import PRE_PRODUCTION_PROGRESS, percentage, stored_progress
 
 def filter_projects(request, queryset):
     search = request.GET.get("search")
@@ -9,11 +11,7 @@ def filter_projects(request, queryset):
     task_type = request.GET.get("task_type")
 
     if search:
-        queryset = queryset.filter(
-            Q(code__icontains=search) |
-            Q(client_name__icontains=search) |
-            Q(event_type__icontains=search)
-        )
+        queryset = search_filter(queryset, "project", search)
 
     if status:
         queryset = queryset.filter(status=status)
@@ -31,3 +29,65 @@ def filter_projects(request, queryset):
         queryset = queryset.filter(tasks__title__icontains=task_type)
 
     return queryset.distinct()
+
+
+# ------------------------
+# Kanban board data
+# ------------------------
+BOARD_COLUMNS = (
+    ("to_assign", "To Be Assigned"),
+    ("pre_production", "Pre Production"),
+    ("selection", "Selection"),
+    ("post_production", "Post Production"),
+    ("completed", "Completed"),
+)
+
+BOARD_FIELDS = (
+    "id", "code", "client_name", "event_type",
+    "start_date", "end_date", "status", "selection__token",
+)
+
+
+def build_board(queryset):
+    """
+    Bucket projects into Kanban columns as compact dict rows.
+
+    Uses three queries regardless of project count: the card rows, the team
+    initials and the stored pre-production progress counters.
+    """
+    columns = dict(BOARD_COLUMNS)
+    board = {label: [] for label in columns.values()}
+
+    project_ids = queryset.values("id")
+    progress = stored_progress(
+        queryset.filter(status="pre_production").values("id"), "keyword"
+    )
+
+    team = {}
+    members = (
+        Project.team.through.objects
+        .filter(project_id__in=project_ids)
+        .values_list("project_id", "user__username")
+        .order_by("id")
+    )
+    for project_id, username in members:
+        team.setdefault(project_id, []).append(username)
+
+    for row in queryset.values(*BOARD_FIELDS).order_by("id"):
+        label = columns.get(row["status"])
+        if label is None:
+            continue
+
+        row["selection_token"] = row.pop("selection__token")
+        row["team"] = team.get(row["id"], [])
+
+        if row["status"] == "pre_production":
+            counts = progress.get(row["id"], {})
+            row["pre_tasks"] = [
+                (title, percentage(*counts.get(keyword, (0, 0))))
+                for title, keyword in PRE_PRODUCTION_PROGRESS
+            ]
+
+        board[label].append(row)
+
+    return board
@@ -1,7 +1,11 @@
 from urllib import request
 from django.db import transaction
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse, HttpResponseForbidden
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.core import signing
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model
@@ -11,9 +15,20 @@ from django.db import models
 from .models import Project, ProjectTask
 from accounts.models import User
 from .models import PhotoSelection, ProjectPhoto
+from .utils import build_board
+from .availability import (
+    assignment_conflicts, busy_staff, free_staff, range_slots, slot_label,
+)
+from core.routers import reads_from_replica
+from core.search import search_filter
+from .sessions import SESSION_TABS, sessions_page
+from . import calendar
+from .progress import (
+    PRE_PRODUCTION_PROGRESS, pending_tasks_prefetch, stage_tasks_prefetch,
+    stored_progress,
+)
 import uuid
-from django.db.models import Q
-from collections import defaultdict
+from django.db.models import Count
 from django.shortcuts import render
 from django.utils.timezone import now
 from django.http import JsonResponse
@@ -29,11 +44,7 @@ def apply_project_filters(request, queryset):
     end_date = request.GET.get("end_date")
 
     if search:
-        queryset = queryset.filter(
-            Q(code__icontains=search) |
-            Q(client_name__icontains=search) |
-            Q(event_type__icontains=search)
-        )
+        queryset = search_filter(queryset, "project", search)
 
     if status:
         queryset = queryset.filter(status=status)
@@ -74,61 +85,21 @@ def parse_json_request(request):
         return None, JsonResponse({"success": False, "error": "Invalid JSON"}, status=400)
 
 
-# ------------------------
-# Helper: task progress
-# ------------------------
-def task_progress_percentage(tasks, keyword):
-    category_tasks = [t for t in tasks if keyword.lower() in t.title.lower()]
-    if not category_tasks:
-        return 0
-    completed_count = sum(t.is_completed for t in category_tasks)
-    return int((completed_count / len(category_tasks)) * 100)
-
-
 # ------------------------
 # Projects Board
 # ------------------------
 from django.db.models import Prefetch
 from .models import PhotoSelection
 
+@reads_from_replica
 def projects_board(request):
-    projects = Project.objects.select_related("selection").prefetch_related("tasks", "team")
-    projects = apply_project_filters(request, projects)
-    board = {
-        "To Be Assigned": [],
-        "Pre Production": [],
-        "Selection": [],
-        "Post Production": [],
-        "Completed": [],
-    }
-
-    for project in projects:
-        tasks = project.tasks.all()
-
-        if project.status == "pre_production":
-            project.pre_tasks = [
-                ("Planning & Wedding", task_progress_percentage(tasks, "Planning")),
-                ("Hard Disk", task_progress_percentage(tasks, "Hard Disk")),
-                ("Pre Wedding Shoot", task_progress_percentage(tasks, "Pre Wedding")),
-                ("Main Coverage", task_progress_percentage(tasks, "Main Coverage")),
-            ]
-
-        # Assign to board
-        if project.status == "to_assign":
-            board["To Be Assigned"].append(project)
-        elif project.status == "pre_production":
-            board["Pre Production"].append(project)
-        elif project.status == "selection":
-            board["Selection"].append(project)
-        elif project.status == "post_production":
-            board["Post Production"].append(project)
-        elif project.status == "completed":
-            board["Completed"].append(project)
+    projects = apply_project_filters(request, Project.objects.all())
+    board = build_board(projects)
 
     return render(request, "projects.html", {
     "board": board,
     "to_assign_count": len(board["To Be Assigned"]),
-    "team_members": User.objects.all(),
+    "team_members": User.objects.only("id", "username"),
     "filters": request.GET,
     "active_page": "projects",
 })
@@ -192,12 +163,21 @@ def toggle_project_member(request):
     except User.DoesNotExist:
         return JsonResponse({"success": False, "error": "User does not exist"}, status=404)
 
-    if user in project.team.all():
+    if project.team.filter(pk=user.pk).exists():
         project.team.remove(user)
-    else:
-        project.team.add(user)
+        return JsonResponse({"success": True, "assigned": False})
 
-    return JsonResponse({"success": True})
+    if not data.get("override"):
+        conflicts = assignment_conflicts(user.pk, project)
+        if conflicts.exists():
+            return JsonResponse({
+                "success": False,
+                "conflict": True,
+                "conflicts": list(conflicts.values("id", "code", "client_name", "start_date", "end_date")),
+            }, status=409)
+
+    project.team.add(user)
+    return JsonResponse({"success": True, "assigned": True})
 
 
 @require_POST
@@ -272,6 +252,65 @@ def toggle_task(request):
     })
 
 
+@require_POST
+@admin_required
+@transaction.atomic
+def toggle_tasks(request):
+    """
+    Batch version of toggle_task.
+
+    Expects {"tasks": [{"task_id": 1, "completed": true}, ...]}. Changed tasks
+    are written with one bulk_update, then progress and status automation run
+    once per affected project.
+    """
+    data, error = parse_json_request(request)
+    if error:
+        return error
+
+    items = data.get("tasks") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return JsonResponse({"success": False, "error": "Missing tasks"}, status=400)
+
+    wanted = {}
+    for item in items:
+        task_id = item.get("task_id") if isinstance(item, dict) else None
+        if not task_id:
+            return JsonResponse({"success": False, "error": "Missing task_id"}, status=400)
+        # Only a JSON boolean: bool("false") would complete the task.
+        if not isinstance(item.get("completed"), bool):
+            return JsonResponse({"success": False, "error": "completed must be true or false"}, status=400)
+        try:
+            wanted[int(task_id)] = item["completed"]
+        except (TypeError, ValueError):
+            return JsonResponse({"success": False, "error": "Invalid task_id"}, status=400)
+
+    tasks = list(ProjectTask.objects.filter(id__in=wanted))
+    if len(tasks) != len(wanted):
+        return JsonResponse({"success": False, "error": "Task does not exist"}, status=404)
+
+    changed = []
+    for task in tasks:
+        if task.is_completed != wanted[task.id]:
+            task.is_completed = wanted[task.id]
+            changed.append(task)
+    # bulk_update recounts the touched projects' progress counters.
+    ProjectTask.objects.bulk_update(changed, ["is_completed"])
+
+    project_ids = {task.project_id for task in changed}
+
+    results = {}
+    for project in Project.objects.filter(id__in={task.project_id for task in tasks}):
+        if project.id in project_ids:
+            project.auto_update_status()
+        results[project.id] = {
+            "completed": project.completed_tasks,
+            "total": project.total_tasks,
+            "new_status": project.status,
+        }
+
+    return JsonResponse({"success": True, "updated": len(changed), "projects": results})
+
+
 @require_POST
 @admin_required
 @transaction.atomic
@@ -315,6 +354,88 @@ def update_project_status(request):
 
     else:
         return JsonResponse({"success": False, "error": "Invalid status transition"}, status=400)
+
+
+@login_required
+def staff_availability(request):
+    """
+    Who is free between ?from= and ?to= (dates, inclusive; optional
+    ?from_session= / ?to_session=), optionally for one ?role=.
+    """
+    try:
+        start = datetime.strptime(request.GET["from"], "%Y-%m-%d").date()
+        end = datetime.strptime(request.GET.get("to") or request.GET["from"], "%Y-%m-%d").date()
+    except (KeyError, ValueError):
+        return JsonResponse({"success": False, "error": "from and to must be YYYY-MM-DD dates"}, status=400)
+    if end < start:
+        return JsonResponse({"success": False, "error": "to must not be before from"}, status=400)
+
+    first, last = range_slots(start, end, request.GET.get("from_session"), request.GET.get("to_session"))
+    role = request.GET.get("role") or None
+
+    busy = busy_staff(first, last, role)
+    busy_users = User.objects.filter(pk__in=busy).order_by("username")
+    projects = Project.objects.in_bulk({
+        project_id for spans in busy.values() for project_id, _, _ in spans
+    })
+
+    return JsonResponse({
+        "success": True,
+        "free": list(free_staff(first, last, role).values("id", "username", "photography_role")),
+        "busy": [
+            {
+                "id": user.id,
+                "username": user.username,
+                "photography_role": user.photography_role,
+                "bookings": [
+                    {
+                        "project_id": project_id,
+                        "code": projects[project_id].code,
+                        "from": slot_label(span_first),
+                        "to": slot_label(span_last),
+                    }
+                    for project_id, span_first, span_last in busy[user.id]
+                ],
+            }
+            for user in busy_users
+        ],
+    })
+
+
+@login_required
+def photo_processing_status(request, project_id):
+    """
+    Poll background photo ingest for a project: counts per processing status,
+    plus per-photo state for the ids passed as ?ids=1,2,3. Admins and the
+    project's team only.
+    """
+    project = get_object_or_404(Project, id=project_id)
+    user = request.user
+    if not (user.is_staff or user.is_superuser or project.team.filter(pk=user.pk).exists()):
+        return JsonResponse({"success": False, "error": "Not on this project's team"}, status=403)
+
+    photos = ProjectPhoto.objects.filter(project=project)
+
+    counts = {key: 0 for key, _ in ProjectPhoto.PROCESSING_CHOICES}
+    for status, total in photos.values_list("processing_status").annotate(total=Count("id")).order_by():
+        counts[status] = total
+
+    data = {"success": True, "counts": counts, "total": sum(counts.values())}
+
+    ids = [i for i in request.GET.get("ids", "").split(",") if i.isdigit()]
+    if ids:
+        data["photos"] = [
+            {
+                "id": photo.id,
+                "status": photo.processing_status,
+                "thumbnail": photo.thumbnail.url if photo.thumbnail else None,
+            }
+            for photo in photos.filter(id__in=ids).only("id", "processing_status", "thumbnail")
+        ]
+
+    return JsonResponse(data)
+
+
 from django.views.decorators.http import require_POST
 
 def client_selection(request, token):
@@ -331,180 +452,253 @@ def client_selection(request, token):
         else:
             return JsonResponse({"success": False, "error": "Invalid password"})
 
-    # GET request → normal page render
+    # GET request → page shell; photos are paged in by selection_photos
     return render(request, "client_selection.html", {
-        "photos": selection.photos.all(),
-        "project": selection.project
+        "project": selection.project,
+        "selected_ids": list(selection.photos.filter(is_selected=True).values_list("id", flat=True)),
+        "page_size": GALLERY_PAGE_SIZE,
+    })
+
+
+GALLERY_PAGE_SIZE = 60
+GALLERY_MAX_PAGE_SIZE = 200
+
+
+def has_selection_access(request, selection):
+    return (
+        request.session.get("selection_access") == str(selection.token)
+        or request.user.is_staff
+    )
+
+
+def selection_photos(request, token):
+    """
+    JSON page of gallery photos, keyset-paginated on id.
+    ?after=<last id seen>&limit=<page size>
+    """
+    selection = get_object_or_404(PhotoSelection, token=token)
+
+    if not has_selection_access(request, selection):
+        return JsonResponse({"success": False}, status=403)
+
+    try:
+        after = int(request.GET.get("after") or 0)
+        limit = max(1, min(int(request.GET.get("limit") or GALLERY_PAGE_SIZE), GALLERY_MAX_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Invalid cursor"}, status=400)
+
+    rows = list(
+        selection.photos
+        .filter(id__gt=after)
+        .order_by("id")
+        .values(
+            "id", "image", "width", "height", "is_selected",
+            "thumbnail", "thumbnail_width", "thumbnail_height", "preview",
+        )[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    storage = ProjectPhoto._meta.get_field("image").storage
+    photos = [
+        {
+            "id": row["id"],
+            "thumbnail": storage.url(row["thumbnail"] or row["image"]),
+            "preview": storage.url(row["preview"] or row["image"]),
+            "width": row["thumbnail_width"] or row["width"],
+            "height": row["thumbnail_height"] or row["height"],
+            "is_selected": row["is_selected"],
+        }
+        for row in rows
+    ]
+
+    return JsonResponse({
+        "success": True,
+        "photos": photos,
+        "next_cursor": rows[-1]["id"] if has_more else None,
     })
 
 
+def parse_photo_ids(values):
+    """A JSON list of ids -> set of ints (None -> empty). Raises ValueError."""
+    if values is None:
+        return set()
+    if not isinstance(values, list) or any(isinstance(value, bool) for value in values):
+        raise ValueError("Photo ids must be a list")
+    return {int(value) for value in values}
+
+
 @require_POST
 @transaction.atomic
 def save_client_selection(request, token):
+    """
+    Apply a selection delta: {"added": [...], "removed": [...]}.
+
+    Only rows whose state actually changes are written, scoped to this
+    selection's photos. With "autosave": true the project stays in the
+    selection stage; otherwise the selection is submitted. A legacy
+    {"selected_ids": [...]} payload is diffed against the stored state.
+    """
     selection = get_object_or_404(PhotoSelection, token=token)
 
     if request.session.get("selection_access") != str(token):
         return JsonResponse({"success": False}, status=403)
 
-    data = json.loads(request.body)
-    selected_ids = [int(i) for i in data.get("selected_ids", [])]
+    data, error = parse_json_request(request)
+    if error:
+        return error
+    if not isinstance(data, dict):
+        return JsonResponse({"success": False, "error": "Expected a JSON object"}, status=400)
 
-    # 1️⃣ Reset all photos
-    ProjectPhoto.objects.filter(project=selection.project).update(is_selected=False)
+    photos = ProjectPhoto.objects.filter(selection=selection)
 
-    # 2️⃣ Mark selected photos
-    ProjectPhoto.objects.filter(id__in=selected_ids).update(is_selected=True)
+    try:
+        if "selected_ids" in data:
+            wanted = parse_photo_ids(data["selected_ids"])
+            current = set(photos.filter(is_selected=True).values_list("id", flat=True))
+            added, removed = wanted - current, current - wanted
+        else:
+            added = parse_photo_ids(data.get("added"))
+            removed = parse_photo_ids(data.get("removed")) - added
+    except (TypeError, ValueError):
+        return JsonResponse({"success": False, "error": "Invalid photo ids"}, status=400)
+
+    # 1️⃣ Write only the rows that change
+    added_count = photos.filter(id__in=added, is_selected=False).update(is_selected=True) if added else 0
+    removed_count = photos.filter(id__in=removed, is_selected=True).update(is_selected=False) if removed else 0
+
+    response = {"success": True, "added": added_count, "removed": removed_count, "submitted": False}
+
+    if data.get("autosave"):
+        return JsonResponse(response)
 
     project = selection.project
 
-    # 3️⃣ Mark selection tasks as completed
+    # 2️⃣ Mark selection tasks as completed
     project.tasks.filter(stage="selection").update(is_completed=True)
 
-    # 4️⃣ Move project to post production
+    # 3️⃣ Move project to post production
     project.status = "post_production"
     project.save(update_fields=["status"])
 
-    return JsonResponse({"success": True})
+    response["submitted"] = True
+    return JsonResponse(response)
 
 from collections import OrderedDict
 
-def projects_list(request):
-    projects = Project.objects.prefetch_related("tasks", "team")
-    projects = apply_project_filters(request, projects)
+LIST_STAGES = {"selection": "selection", "post_production": "post"}
 
+
+def group_list_projects(projects):
+    """
+    Group projects for the list view and attach their stage task pills.
+    Runs a constant number of queries: tasks come from one stage-filtered
+    prefetch and pre-production progress from the stored counters.
+    """
     grouped = OrderedDict([
         ("pre_production", []),
         ("selection", []),
         ("post_production", []),
     ])
 
-    for project in projects:
-        tasks = project.tasks.all()
+    projects = projects.filter(status__in=list(grouped)).prefetch_related(
+        stage_tasks_prefetch(list(LIST_STAGES.values())), "team"
+    )
+    progress = stored_progress(
+        projects.filter(status="pre_production").values("id"), "keyword"
+    )
 
+    for project in projects:
         # PRE PRODUCTION
         if project.status == "pre_production":
+            counts = progress.get(project.id, {})
             project.stage_tasks = [
-                ("Planning & Wedding", *project.task_progress("Planning")),
-                ("Hard Disk", *project.task_progress("Hard Disk")),
-                ("Pre Wedding Shoot", *project.task_progress("Pre Wedding")),
-                ("Main Coverage", *project.task_progress("Main Coverage")),
-            ]
-
-        # SELECTION
-        elif project.status == "selection":
-            project.stage_tasks = [
-                (task.title, 1 if task.is_completed else 0, 1)
-                for task in tasks.filter(stage="selection")
+                (title, *counts.get(keyword, (0, 0)))
+                for title, keyword in PRE_PRODUCTION_PROGRESS
             ]
 
-        # POST PRODUCTION
-        elif project.status == "post_production":
+        # SELECTION / POST PRODUCTION
+        else:
+            stage = LIST_STAGES[project.status]
             project.stage_tasks = [
                 (task.title, 1 if task.is_completed else 0, 1)
-                for task in tasks.filter(stage="post")
+                for task in project.stage_task_list
+                if task.stage == stage
             ]
 
-        if project.status in grouped:
-            grouped[project.status].append(project)
-
-    return render(request, "projects_list.html", {
-    "grouped_projects": grouped,
-    "team_members": User.objects.all(),
-    "filters": request.GET,
-    "active_page": "projects",
-})
+        grouped[project.status].append(project)
 
+    return grouped
 
 
-def projects_overview(request):
-    projects = Project.objects.prefetch_related("tasks", "team")
-    projects = apply_project_filters(request, projects)
+def group_overview_projects(projects):
+    """
+    Split projects into internal work and client-pending buckets, using a
+    prefetch of incomplete tasks instead of per-project queries.
+    """
+    projects = projects.prefetch_related(pending_tasks_prefetch(), "team")
 
     pending_internal = []
     awaiting_client = []
 
     for project in projects:
-        pending_tasks = project.tasks.filter(is_completed=False)
-
-        # Example logic:
         # If selection stage → awaiting client
         if project.status == "selection":
             awaiting_client.append(project)
-        else:
-            if pending_tasks.exists():
-                pending_internal.append(project)
+        elif project.pending_tasks:
+            pending_internal.append(project)
+
+    return pending_internal, awaiting_client
+
+
+@reads_from_replica
+def projects_list(request):
+    projects = apply_project_filters(request, Project.objects.all())
+
+    return render(request, "projects_list.html", {
+    "grouped_projects": group_list_projects(projects),
+    "team_members": User.objects.only("id", "username"),
+    "filters": request.GET,
+    "active_page": "projects",
+})
+
 
-        project.pending_tasks = pending_tasks
+
+@reads_from_replica
+def projects_overview(request):
+    projects = apply_project_filters(request, Project.objects.all())
+    pending_internal, awaiting_client = group_overview_projects(projects)
 
     return render(request, "projects_overview.html", {
         "pending_internal": pending_internal,
         "awaiting_client": awaiting_client,
-        "team_members": User.objects.all(),
+        "team_members": User.objects.only("id", "username"),
         "filters": request.GET,
         "active_page": "projects",
     })
 
 from django.template.loader import render_to_string
 
+@reads_from_replica
 def projects_filtered_partial(request):
-    projects = Project.objects.prefetch_related("tasks", "team")
-    projects = apply_project_filters(request, projects)
+    projects = apply_project_filters(request, Project.objects.all())
 
     view_type = request.GET.get("view")
 
     if view_type == "board":
-        # rebuild board structure
-        board = {
-            "To Be Assigned": [],
-            "Pre Production": [],
-            "Selection": [],
-            "Post Production": [],
-            "Completed": [],
-        }
-
-        for project in projects:
-            if project.status == "to_assign":
-                board["To Be Assigned"].append(project)
-            elif project.status == "pre_production":
-                board["Pre Production"].append(project)
-            elif project.status == "selection":
-                board["Selection"].append(project)
-            elif project.status == "post_production":
-                board["Post Production"].append(project)
-            elif project.status == "completed":
-                board["Completed"].append(project)
+        board = build_board(projects)
 
         html = render_to_string("partials/board_content.html", {
             "board": board
         }, request=request)
 
     elif view_type == "list":
-        grouped = {
-            "pre_production": [],
-            "selection": [],
-            "post_production": [],
-        }
-
-        for project in projects:
-            if project.status in grouped:
-                grouped[project.status].append(project)
-
         html = render_to_string("partials/list_content.html", {
-            "grouped_projects": grouped
+            "grouped_projects": group_list_projects(projects)
         }, request=request)
 
     else:  # overview
-        pending_internal = []
-        awaiting_client = []
-
-        for project in projects:
-            pending_tasks = project.tasks.filter(is_completed=False)
-            project.pending_tasks = pending_tasks
-
-            if project.status == "selection":
-                awaiting_client.append(project)
-            elif pending_tasks.exists():
-                pending_internal.append(project)
+        pending_internal, awaiting_client = group_overview_projects(projects)
 
         html = render_to_string("partials/overview_content.html", {
             "pending_internal": pending_internal,
@@ -513,60 +707,30 @@ def projects_filtered_partial(request):
 
     return JsonResponse({"html": html})
 
-from collections import defaultdict
 from django.shortcuts import render
 from django.template.loader import render_to_string
 from django.http import JsonResponse
 from django.utils.timezone import now
-from django.db.models import Q
 from projects.models import Project
 
 
+@reads_from_replica
 def sessions_view(request):
     filter_type = request.GET.get("type", "upcoming")
+    if filter_type not in SESSION_TABS:
+        filter_type = "upcoming"
     search_query = request.GET.get("search", "").strip()
 
-    today = now().date()
-
-    # Show all active session projects
-    projects = Project.objects.filter(
-        status__in=["pre_production", "selection", "post_production"]
-    ).prefetch_related("team")
-
-    # -------- FILTER BY TYPE --------
-    if filter_type == "past":
-        projects = projects.filter(start_date__isnull=False, start_date__lt=today)
-
-    elif filter_type == "decided":
-        projects = projects.filter(start_date__isnull=True)
-
-    else:  # upcoming
-        projects = projects.filter(start_date__isnull=False, start_date__gte=today)
-
-    # -------- SEARCH --------
-    if search_query:
-        projects = projects.filter(
-            Q(client_name__icontains=search_query) |
-            Q(event_type__icontains=search_query) |
-            Q(code__icontains=search_query)
-        )
-
-    projects = projects.order_by("start_date")
-
-    # -------- GROUP BY MONTH --------
-    grouped_sessions = defaultdict(list)
-
-    for project in projects:
-        if project.start_date:
-            month = project.start_date.strftime("%B %Y")
-        else:
-            month = "To Be Decided"
-
-        grouped_sessions[month].append(project)
+    try:
+        page = sessions_page(filter_type, search_query, request.GET.get("cursor"), today=now().date())
+    except ValueError as exc:
+        return JsonResponse({"success": False, "error": str(exc)}, status=400)
 
     context = {
-        "grouped_sessions": dict(grouped_sessions),
+        "session_groups": page["groups"],
+        "next_cursor": page["next_cursor"],
         "active_tab": filter_type,
+        "is_continuation": bool(request.GET.get("cursor")),
     }
 
     # -------- AJAX --------
@@ -576,12 +740,67 @@ def sessions_view(request):
             context,
             request=request
         )
-        return JsonResponse({"html": html})
+        return JsonResponse({"html": html, "next_cursor": page["next_cursor"]})
 
     return render(request, "sessions.html", {
         **context,
         "active_page": "sessions"
     })
+
+
+# ------------------------
+# Calendar feeds
+# ------------------------
+@login_required
+def calendar_links(request):
+    """Subscription URLs of the current user's feed (and the studio feed for admins)."""
+    links = {"personal": request.build_absolute_uri(
+        reverse("projects:calendar_feed", args=[calendar.feed_token(request.user)])
+    )}
+    if request.user.is_staff or request.user.is_superuser:
+        links["studio"] = request.build_absolute_uri(reverse("projects:calendar_feed", args=[calendar.feed_token()]))
+    return JsonResponse({"success": True, **links})
+
+
+def calendar_feed(request, token):
+    """
+    Streamed .ics feed. Unchanged feeds answer 304 from two aggregates;
+    ?sync_token=<X-Sync-Token of a previous response> returns only changes.
+    """
+    try:
+        scope = calendar.feed_scope(token)
+    except signing.BadSignature:
+        raise Http404("Unknown calendar")
+    if scope != calendar.STUDIO and not User.objects.filter(pk=scope, is_active=True).exists():
+        raise Http404("Unknown calendar")
+
+    since = request.GET.get("sync_token")
+    if since:
+        try:
+            since = int(since)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid sync token")
+
+    version, last_modified = calendar.feed_state(scope)
+    etag = f'"{version}-{since}"' if since else f'"{version}"'
+    # Whole seconds, as If-Modified-Since is parsed (like @condition does).
+    last_modified = last_modified and int(last_modified.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = StreamingHttpResponse(
+            calendar.stream_feed(scope, version, since or None),
+            content_type="text/calendar; charset=utf-8",
+        )
+        response["Content-Disposition"] = 'inline; filename="bookings.ics"'
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified)
+    response["X-Sync-Token"] = str(version)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
 from invoices.models import Invoice
 def invoice_list(request):
     invoices = Invoice.objects.all().order_by("-created_at")
@@ -64,10 +64,16 @@ async function checkLeadConflict(form) {
 
   if (!start) return false;
 
-  const res = await fetch(
-    `/leads/check-conflict/?date=${encodeURIComponent(start)}&session=${encodeURIComponent(session)}`,
-    { credentials: "same-origin" }
-  );
+  const params = new URLSearchParams({ date: start, session });
+  const end = form.querySelector('[name="event_end_date"]')?.value;
+  if (end) {
+    params.set("end_date", end);
+    params.set("end_session", sessionMap[form.querySelector('[name="event_end_session"]')?.value] || "EVE");
+  }
+  const leadId = form.querySelector('[name="id"]')?.value;
+  if (leadId) params.set("lead_id", leadId);
+
+  const res = await fetch(`/leads/check-conflict/?${params}`, { credentials: "same-origin" });
 
   if (!res.ok) return false;
 
@@ -212,34 +218,127 @@ function createLeadCard(lead) {
 }
 
 /* ======================================================
-   LOAD LEADS
+   LOAD LEADS (paginated per column)
 ====================================================== */
-function renderBoard(data) {
-  ["NEW", "FOLLOW", "ACCEPTED", "LOST"].forEach(status => {
-    const col = document.getElementById(`cards-${status}`);
-    col.innerHTML = "";
+const STATUSES = ["NEW", "FOLLOW", "ACCEPTED", "LOST"];
+const board = { query: "", cursors: {}, loading: {}, observer: null };
+
+function listParams(extra = {}) {
+  const params = new URLSearchParams(extra);
+  if (board.query) params.set("q", board.query);
+
+  const filters = {
+    min_amount: document.getElementById("minAmount")?.value,
+    max_amount: document.getElementById("maxAmount")?.value,
+    start_date: document.getElementById("startDate")?.value,
+    end_date: document.getElementById("endDate")?.value
+  };
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value) params.set(key, value);
+  });
+  return params;
+}
 
-    data[status].forEach(lead => {
-      autoMoveToLost(lead);
-      col.appendChild(createLeadCard(lead));
-    });
+function appendCards(status, leads) {
+  const col = document.getElementById(`cards-${status}`);
+  leads.forEach(lead => {
+    autoMoveToLost(lead);
+    col.appendChild(createLeadCard(lead));
+  });
+}
+
+function renderBoard(data) {
+  STATUSES.forEach(status => {
+    document.getElementById(`cards-${status}`).innerHTML = "";
+    appendCards(status, data.columns[status].results);
+    board.cursors[status] = data.columns[status].next_cursor;
 
     document.getElementById(`count-${status.toLowerCase()}`).innerText =
-      data[status].length;
+      data.counts[status];
   });
 }
 
-function loadLeads(query = "") {
-  fetch(`/leads/list/?q=${encodeURIComponent(query)}`)
+function loadLeads(query = board.query) {
+  board.query = query;
+  fetch(`/leads/list/?${listParams()}`)
     .then(res => res.json())
     .then(data => {
+      if (!data.success) return;
       renderBoard(data);
       initSortable();
+      initColumnPaging();
       updateAmounts();
-      applyFilters();
+      applyStatusVisibility();
+    });
+}
+
+function loadMore(status) {
+  const cursor = board.cursors[status];
+  if (!cursor || board.loading[status]) return;
+  board.loading[status] = true;
+
+  fetch(`/leads/list/?${listParams({ status, cursor })}`)
+    .then(res => res.json())
+    .then(data => {
+      if (!data.success) return;
+      appendCards(status, data.results);
+      board.cursors[status] = data.next_cursor;
+    })
+    .finally(() => {
+      board.loading[status] = false;
     });
 }
 
+// A sentinel under each column fetches the next page when it scrolls into view.
+function initColumnPaging() {
+  if (board.observer) return;
+
+  board.observer = new IntersectionObserver(entries => {
+    entries.forEach(entry => {
+      if (entry.isIntersecting) loadMore(entry.target.dataset.status);
+    });
+  }, { rootMargin: "400px" });
+
+  STATUSES.forEach(status => {
+    const sentinel = document.createElement("div");
+    sentinel.className = "cards-more";
+    sentinel.dataset.status = status;
+    sentinel.style.height = "1px";
+    document.getElementById(`cards-${status}`).after(sentinel);
+    board.observer.observe(sentinel);
+  });
+}
+
+/* ======================================================
+   AMOUNTS & FILTERS
+====================================================== */
+function updateAmounts() {
+  fetch("/leads/amounts/", { credentials: "same-origin" })
+    .then(res => res.json())
+    .then(data => {
+      const rupees = value => `₹ ${Number(value).toLocaleString("en-IN")}`;
+      document.getElementById("totalLeads").innerText = data.total_leads;
+      document.getElementById("totalAmount").innerText = rupees(data.total_amount);
+      document.getElementById("acceptedAmount").innerText = rupees(data.accepted);
+      document.getElementById("lostAmount").innerText = rupees(data.lost);
+    });
+}
+
+function applyStatusVisibility() {
+  document.querySelectorAll("#filterDropdown input[type='checkbox']").forEach(cb => {
+    const column = document.querySelector(`.column[data-status="${cb.value}"]`);
+    if (column) column.style.display = cb.checked ? "" : "none";
+  });
+}
+
+// Status checkboxes only hide columns; amount and date filters run server-side.
+let filterTimer;
+function applyFilters() {
+  applyStatusVisibility();
+  clearTimeout(filterTimer);
+  filterTimer = setTimeout(() => loadLeads(), 300);
+}
+
 
 /* ======================================================
    AUTO MOVE TO LOST
@@ -462,7 +561,7 @@ document.addEventListener("DOMContentLoaded", function () {
     }
   });
 
-  statusCheckboxes.forEach(cb => cb.addEventListener("change", applyFilters));
+  statusCheckboxes.forEach(cb => cb.addEventListener("change", applyStatusVisibility));
   minAmountInput?.addEventListener("input", applyFilters);
   maxAmountInput?.addEventListener("input", applyFilters);
   startDateInput?.addEventListener("change", applyFilters);
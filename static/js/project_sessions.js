@@ -19,9 +19,11 @@ function getCookie(name) {
 // -----------------------------
 // Safe AJAX Helper
 // -----------------------------
-async function postJSON(url, data) {
+// Pass { keepalive: true } for requests that must outlive the page.
+async function postJSON(url, data, options = {}) {
   try {
     const res = await fetch(url, {
+      ...options,
       method: 'POST',
       headers: {
         'X-CSRFToken': getCookie('csrftoken'),
@@ -30,7 +32,8 @@ async function postJSON(url, data) {
       body: JSON.stringify(data)
     });
 
-    if (!res.ok) {
+    // 409 carries a JSON body (e.g. booking conflicts) for the caller.
+    if (!res.ok && res.status !== 409) {
       throw new Error(`Server error: ${res.status}`);
     }
 
@@ -185,11 +188,27 @@ document.querySelectorAll('.avatar[data-user-id]').forEach(avatar => {
     const projectId = this.dataset.projectId;
     const userId = this.dataset.userId;
 
-    const data = await postJSON("/projects/toggle-member/", {
+    let data = await postJSON("/projects/toggle-member/", {
       project_id: projectId,
       user_id: userId
     });
 
+    if (data.conflict) {
+      const clashes = data.conflicts
+        .map(p => `${p.code} - ${p.client_name} (${p.start_date || "?"} to ${p.end_date || "?"})`)
+        .join("\n");
+      if (confirm(`Already booked on:\n${clashes}\n\nAssign anyway?`)) {
+        data = await postJSON("/projects/toggle-member/", {
+          project_id: projectId,
+          user_id: userId,
+          override: true
+        });
+      } else {
+        this.dataset.processing = "false";
+        return;
+      }
+    }
+
     if (data.success) {
       this.classList.toggle('active');
     } else {
@@ -202,45 +221,67 @@ document.querySelectorAll('.avatar[data-user-id]').forEach(avatar => {
 });
 
 // -----------------------------
-// Toggle Task Completion
+// Toggle Task Completion (batched)
 // -----------------------------
-document.querySelectorAll('.task-toggle').forEach(cb => {
+const pendingTaskToggles = new Map();
+let taskFlushTimer = null;
 
-  cb.addEventListener('change', async function () {
+async function flushTaskToggles({ keepalive = false } = {}) {
+  clearTimeout(taskFlushTimer);
+  taskFlushTimer = null;
+  if (!pendingTaskToggles.size) return;
 
-    if (!validateRequiredFields()) {
-      this.checked = !this.checked;
-      return;
-    }
+  const batch = Array.from(pendingTaskToggles.entries());
+  pendingTaskToggles.clear();
 
-    if (this.dataset.processing === "true") return;
-    this.dataset.processing = "true";
+  const data = await postJSON("/projects/toggle-tasks/", {
+    tasks: batch.map(([taskId, cb]) => ({ task_id: taskId, completed: cb.checked }))
+  }, { keepalive });
 
-    const taskId = this.dataset.taskId;
-    const completed = this.checked;
+  if (data.success) {
 
-    const data = await postJSON("/projects/toggle-task/", {
-      task_id: taskId,
-      completed: completed
-    });
+    const movedToSelection = Object.values(data.projects || {})
+      .some(project => project.new_status === "selection");
 
-    if (data.success) {
+    if (movedToSelection) {
+      alert("All tasks completed! Project moved to Selection.");
+      window.location.href = "/projects/board/";
+    }
 
-      if (data.new_status === "selection") {
-        alert("All tasks completed! Project moved to Selection.");
-        window.location.href = "/projects/board/";
-      }
+  } else {
+    alert("Failed to toggle tasks: " + (data.error || "Unknown error"));
+    batch.forEach(([, cb]) => { cb.checked = !cb.checked; });
+  }
+}
 
-    } else {
-      alert("Failed to toggle task: " + (data.error || "Unknown error"));
-      this.checked = !completed;
+document.querySelectorAll('.task-toggle').forEach(cb => {
+
+  cb.addEventListener('change', function () {
+
+    if (!validateRequiredFields()) {
+      this.checked = !this.checked;
+      return;
     }
 
-    this.dataset.processing = "false";
+    pendingTaskToggles.set(this.dataset.taskId, this);
+
+    clearTimeout(taskFlushTimer);
+    taskFlushTimer = setTimeout(flushTaskToggles, 800);
   });
 
 });
 
+// A plain fetch is cancelled on navigation; keepalive lets the last
+// debounced batch reach the server. pagehide/visibilitychange also fire
+// on mobile and bfcache navigations, where beforeunload does not.
+window.addEventListener('pagehide', () => {
+  flushTaskToggles({ keepalive: true });
+});
+
+document.addEventListener('visibilitychange', () => {
+  if (document.visibilityState === 'hidden') flushTaskToggles({ keepalive: true });
+});
+
 // -----------------------------
 // Update Project Status Manually
 // -----------------------------
@@ -14,10 +14,52 @@ document.addEventListener("DOMContentLoaded", function () {
 
     // For aborting previous fetch requests
     let currentController = null;
+    let currentSearch = searchInput ? searchInput.value.trim() : "";
+
+    // ---------------- NEXT MONTHS (INFINITE SCROLL) ----------------
+    // The list ends with a sentinel carrying the cursor of the next months.
+    const moreObserver = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) loadMore(entry.target);
+        });
+    });
+
+    function observeMore() {
+        const sentinel = container.querySelector(".sessions-more");
+        if (sentinel) moreObserver.observe(sentinel);
+    }
+
+    function loadMore(sentinel) {
+        moreObserver.unobserve(sentinel);
+
+        const params = new URLSearchParams();
+        params.set("type", currentType);
+        if (currentSearch) params.set("search", currentSearch);
+        params.set("cursor", sentinel.dataset.cursor);
+
+        fetch(`/projects/sessions/?${params.toString()}`, {
+            headers: { "X-Requested-With": "XMLHttpRequest" },
+            signal: currentController ? currentController.signal : undefined
+        })
+        .then(res => res.json())
+        .then(data => {
+            sentinel.insertAdjacentHTML("afterend", data.html);
+            sentinel.remove();
+            observeMore();
+        })
+        .catch(error => {
+            if (error.name === "AbortError") return;
+            console.error("Error:", error);
+            moreObserver.observe(sentinel);
+        });
+    }
+
+    observeMore();
 
     // ---------------- LOAD SESSIONS ----------------
     function loadSessions(type = currentType, search = "") {
         currentType = type;
+        currentSearch = search.trim();
 
         // Abort previous fetch
         if (currentController) currentController.abort();
@@ -40,6 +82,7 @@ document.addEventListener("DOMContentLoaded", function () {
         .then(data => {
             container.innerHTML = data.html;
             container.style.opacity = 1;
+            observeMore();
             window.history.pushState({}, "", `?${params.toString()}`);
         })
         .catch(error => {